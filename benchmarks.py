@@ -0,0 +1,543 @@
+import gc
+import os
+import sys
+import time
+import datetime
+import tempfile
+import random
+import resource
+from simulation import Simulation
+from town import Town
+
+
+# Rough performance benchmarks for various parts of the simulation; run this script from
+# the root directory of the repository (like test.py, since the corpora are loaded using
+# relative paths), e.g., 'python benchmarks.py town_construction'. Each benchmark prints
+# its results to stdout.
+
+
+def _prepare_history(n_years, seed):
+    """Return a seeded simulation whose worldgen will simulate the given number of years of its town's history."""
+    random.seed(seed)
+    sim = Simulation()
+    sim.config.date_worldgen_ends = (sim.config.date_worldgen_begins[0] + n_years,) + sim.config.date_worldgen_begins[1:]
+    sim.ordinal_date_that_worldgen_ends = datetime.date(*sim.config.date_worldgen_ends).toordinal()
+    return sim
+
+
+def _simulate_history(n_years, seed):
+    """Return a seeded simulation that has simulated the given number of years of its town's history."""
+    sim = _prepare_history(n_years=n_years, seed=seed)
+    sim.establish_setting()
+    return sim
+
+
+def benchmark_town_construction(n_towns=24):
+    """Time the construction of many towns and report construction time as parcel count grows."""
+    print "Constructing {} towns...".format(n_towns)
+    results = []
+    for seed in xrange(n_towns):
+        random.seed(seed)
+        sim = Simulation()
+        start_time = time.time()
+        town = Town(sim)
+        construction_time = time.time() - start_time
+        # Time the path generation on its own, since it used to dominate town construction
+        start_time = time.time()
+        town.generatePaths()
+        path_generation_time = time.time() - start_time
+        results.append((len(town.parcels), len(town.lots | town.tracts), construction_time, path_generation_time))
+    print '\n{:>10}{:>10}{:>20}{:>20}'.format('parcels', 'lots', 'construction (s)', 'paths (s)')
+    for n_parcels, n_lots, construction_time, path_generation_time in sorted(results):
+        print '{:>10}{:>10}{:>20.4f}{:>20.4f}'.format(n_parcels, n_lots, construction_time, path_generation_time)
+
+
+def benchmark_lot_distances(n_towns=8, n_queries=200000):
+    """Time the building of the lot-distance matrix and the cost of reading distances out of it."""
+    print "Constructing {} towns...".format(n_towns)
+    results = []
+    for seed in xrange(n_towns):
+        random.seed(seed)
+        sim = Simulation()
+        town = Town(sim)
+        start_time = time.time()
+        town._generate_lot_distances()
+        matrix_time = time.time() - start_time
+        lots = list(town.lots | town.tracts)
+        pairs = [(random.choice(lots), random.choice(lots)) for _ in xrange(n_queries)]
+        start_time = time.time()
+        for lot1, lot2 in pairs:
+            town.distance_between(lot1, lot2)
+        query_time = time.time() - start_time
+        start_time = time.time()
+        for lot in lots:
+            town.distances_from(lot, lots)
+        row_time = time.time() - start_time
+        results.append((len(lots), matrix_time, query_time * 1e6 / n_queries, row_time * 1e6 / len(lots)))
+    print '\n{:>10}{:>20}{:>20}{:>25}'.format('lots', 'matrix (s)', 'per query (us)', 'per distances_from (us)')
+    for n_lots, matrix_time, query_time, row_time in sorted(results):
+        print '{:>10}{:>20.4f}{:>20.3f}{:>25.3f}'.format(n_lots, matrix_time, query_time, row_time)
+
+
+def benchmark_town_scaling(scales=(1, 4, 16), n_towns=3):
+    """Time town generation at increasing scales and report the memory taken by its distance matrices.
+
+    Scales are run in increasing order, so the peak resident set size reported for each one is
+    (roughly) the memory high-water mark of generating a town of that scale.
+    """
+    print '{:>8}{:>10}{:>10}{:>20}{:>20}{:>20}'.format(
+        'scale', 'parcels', 'lots', 'generation (s)', 'matrices (MB)', 'peak RSS (MB)'
+    )
+    for scale in scales:
+        for seed in xrange(n_towns):
+            random.seed(seed)
+            sim = Simulation()
+            sim.config.town_scale = scale
+            start_time = time.time()
+            town = Town(sim)
+            generation_time = time.time() - start_time
+            matrix_bytes = town.lot_distances.itemsize * len(town.lot_distances)
+            matrix_bytes += sum(row.itemsize * len(row) for row in town.parcel_distances)
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KB on Linux
+            print '{:>8}{:>10}{:>10}{:>20.4f}{:>20.2f}{:>20.1f}'.format(
+                scale, len(town.parcels), len(town.lots | town.tracts), generation_time,
+                matrix_bytes / 1024.0 / 1024.0, peak_rss
+            )
+            del town, sim
+
+
+def benchmark_checkpoint(n_years=140, seed=0):
+    """Simulate a town's history and then time saving it to, and loading it from, a checkpoint file."""
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    filename = os.path.join(tempfile.mkdtemp(), 'checkpoint')
+    start_time = time.time()
+    sim.save_checkpoint(filename)
+    save_time = time.time() - start_time
+    start_time = time.time()
+    Simulation.load_checkpoint(filename)
+    load_time = time.time() - start_time
+    size_in_mb = os.path.getsize(filename) / 1024.0 / 1024.0
+    os.remove(filename)
+    print '\n{:>10}{:>12}{:>12}{:>12}{:>12}{:>16}'.format(
+        'years', 'residents', 'events', 'save (s)', 'load (s)', 'file size (MB)'
+    )
+    print '{:>10}{:>12}{:>12}{:>12.3f}{:>12.3f}{:>16.2f}'.format(
+        n_years, len(sim.town.residents), len(sim.events), save_time, load_time, size_in_mb
+    )
+
+
+def benchmark_worldgen_scheduling(n_years=60, n_seeds=4):
+    """Compare worldgen wall time (and outcomes) with and without skipping unsimulated timesteps.
+
+    Since worldgen time varies greatly with how populous a town happens to become, this also reports
+    the time spent outside of simulated timesteps, which is what skipping unsimulated timesteps targets
+    (note that this includes the two seconds or so that Simulation.establish_setting() spends sleeping).
+    """
+    results = {}
+    for skip_unsimulated_timesteps in (False, True):
+        for seed in xrange(n_seeds):
+            sim = _prepare_history(n_years=n_years, seed=seed)
+            sim.config.skip_unsimulated_timesteps = skip_unsimulated_timesteps
+            time_spent_simulating_timesteps = [0.0]
+
+            def timed_simulate_timestep(simulate_timestep=sim._simulate_timestep):
+                timestep_start_time = time.time()
+                simulate_timestep()
+                time_spent_simulating_timesteps[0] += time.time() - timestep_start_time
+            sim._simulate_timestep = timed_simulate_timestep
+            start_time = time.time()
+            sim.establish_setting()
+            worldgen_time = time.time() - start_time
+            results.setdefault(skip_unsimulated_timesteps, []).append(
+                (worldgen_time, worldgen_time - time_spent_simulating_timesteps[0], sim.n_simulated_timesteps,
+                 len(sim.town.residents), len(sim.town.companies), len(sim.events))
+            )
+    print '\n{:>14}{:>16}{:>18}{:>16}{:>12}{:>12}{:>10}'.format(
+        'skipping', 'worldgen (s)', 'bookkeeping (s)', 'simulated ts', 'residents', 'companies', 'events'
+    )
+    row_format = '{:>14}{:>16.2f}{:>18.2f}{:>16.1f}{:>12.1f}{:>12.1f}{:>10.1f}'
+    for skip_unsimulated_timesteps in (False, True):
+        for result in results[skip_unsimulated_timesteps]:
+            print row_format.format(str(skip_unsimulated_timesteps), *result)
+    for skip_unsimulated_timesteps in (False, True):
+        means = [sum(column) / float(n_seeds) for column in zip(*results[skip_unsimulated_timesteps])]
+        print row_format.format('{} (mean)'.format(skip_unsimulated_timesteps), *means)
+
+
+def benchmark_salience_memory(n_years=140, seed=0):
+    """Simulate a town's history and report the memory taken by everyone's salience values."""
+    sim = _prepare_history(n_years=n_years, seed=seed)
+    start_time = time.time()
+    sim.establish_setting()
+    worldgen_time = time.time() - start_time
+    people = sim.town.all_time_residents
+    n_ever_employed = sum(1 for person in people if person.occupations)
+    n_entries = sum(len(person.salience_of_other_people) for person in people)
+    # Count each dictionary and the float objects it holds (keys are people, who exist regardless)
+    salience_bytes = sum(
+        sys.getsizeof(person.salience_of_other_people) +
+        sum(sys.getsizeof(value) for value in person.salience_of_other_people.itervalues())
+        for person in people
+    )
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KB on Linux
+    print '\n{:>8}{:>10}{:>16}{:>16}{:>18}{:>16}{:>16}'.format(
+        'years', 'people', 'ever employed', 'entries', 'entries/person', 'saliences (MB)', 'peak RSS (MB)'
+    )
+    print '{:>8}{:>10}{:>16}{:>16}{:>18.1f}{:>16.2f}{:>16.1f}'.format(
+        n_years, len(people), n_ever_employed, n_entries, n_entries / float(len(people)),
+        salience_bytes / 1024.0 / 1024.0, peak_rss
+    )
+    print 'Worldgen took {:.1f}s'.format(worldgen_time)
+
+
+def benchmark_progress_relationship(n_years=20, n_calls=200000, seed=0):
+    """Simulate a town's history and then time calls to Relationship.progress_relationship()."""
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    # Since progressing a relationship may turn it into a friendship or enmity, always look up the
+    # owner's current relationship with the subject (which costs only a dictionary lookup)
+    pairs = [
+        (person, subject) for person in sim.town.residents if person.location
+        for subject in person.relationships if subject.location
+    ]
+    calls = [random.choice(pairs) for _ in xrange(n_calls)]
+    start_time = time.time()
+    for owner, subject in calls:
+        owner.relationships[subject].progress_relationship(missing_days_to_account_for=1)
+    elapsed_time = time.time() - start_time
+    print '\n{:>16}{:>12}{:>12}{:>16}'.format('relationships', 'calls', 'time (s)', 'calls per sec')
+    print '{:>16}{:>12}{:>12.3f}{:>16.0f}'.format(len(pairs), n_calls, elapsed_time, n_calls / elapsed_time)
+
+
+def benchmark_socializing(school_sizes=(25, 50, 100, 200, 400, 800), n_timesteps=10, n_years=60, seed=0):
+    """Time the choosing of whom to interact with, per timestep, as the number of people at a school grows.
+
+    Since towns don't get nearly populous enough for this on their own, the school is filled with people
+    generated from nothing (who don't live in the town). This compares the sampling done now by
+    Person.socialize() against deciding on every other person there, as it used to do, and reports the
+    mean number of people chosen by each, which should agree.
+    """
+    from person import PersonExNihilo
+    from occupation import Cashier
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    school = sim.town.businesses_of_type('School')[0]
+    people = []
+    print '\n{:>12}{:>20}{:>20}{:>18}{:>18}'.format(
+        'school size', 'all pairs (ms/ts)', 'sampling (ms/ts)', 'chosen (pairs)', 'chosen (sampled)'
+    )
+    for school_size in school_sizes:
+        while len(people) < school_size:
+            person = PersonExNihilo(sim=sim, job_opportunity_impetus=Cashier, spouse_already_generated=None)
+            person.location = school
+            people.append(person)
+        people_here_now = people[:school_size]
+        n_chosen_by_all_pairs = n_chosen_by_sampling = 0
+        start_time = time.time()
+        for _ in xrange(n_timesteps):
+            for person in people_here_now:
+                for other_person in people_here_now:
+                    if person._decide_to_instigate_social_interaction(other_person=other_person):
+                        n_chosen_by_all_pairs += 1
+        all_pairs_time = time.time() - start_time
+        start_time = time.time()
+        for _ in xrange(n_timesteps):
+            for person in people_here_now:
+                n_chosen_by_sampling += len(
+                    person._sample_people_to_instigate_social_interaction_with(people_here_now=people_here_now)
+                )
+        sampling_time = time.time() - start_time
+        n_person_timesteps = float(n_timesteps * school_size)
+        print '{:>12}{:>20.3f}{:>20.3f}{:>18.2f}{:>18.2f}'.format(
+            school_size, all_pairs_time * 1000 / n_timesteps, sampling_time * 1000 / n_timesteps,
+            n_chosen_by_all_pairs / n_person_timesteps, n_chosen_by_sampling / n_person_timesteps
+        )
+
+
+def benchmark_person_memory(n_years=140, seed=0):
+    """Simulate a town's history and report the memory taken by Person objects themselves.
+
+    This counts each person object and its attribute dictionary (if it has one), the sets, lists, and
+    dictionaries held directly in its attributes (but not the objects those hold), and, separately,
+    the containers making up the sim's genealogy (from which everyone's family members are derived).
+    """
+    from person import Person
+    sim = _prepare_history(n_years=n_years, seed=seed)
+    start_time = time.time()
+    sim.establish_setting()
+    worldgen_time = time.time() - start_time
+    # Include everyone ever generated (e.g., the families of people who came to town), not just residents
+    people = [obj for obj in gc.get_objects() if isinstance(obj, Person)]
+    counted = set()
+    object_bytes = container_bytes = 0
+    for person in people:
+        object_bytes += sys.getsizeof(person)
+        attributes = dict(getattr(person, '__dict__', {}))
+        if hasattr(person, '__dict__'):
+            object_bytes += sys.getsizeof(person.__dict__)
+        for klass in type(person).__mro__:
+            for attribute in klass.__dict__.get('__slots__', ()):
+                if hasattr(person, attribute):
+                    attributes[attribute] = getattr(person, attribute)
+        for value in attributes.itervalues():
+            if type(value) in (set, frozenset, list, dict) and id(value) not in counted:
+                counted.add(id(value))
+                container_bytes += sys.getsizeof(value)
+    genealogy = sim.genealogy
+    genealogy_bytes = 0
+    for index in (genealogy.children, genealogy.biological_children, genealogy.spouses):
+        genealogy_bytes += sys.getsizeof(index) + sum(sys.getsizeof(value) for value in index.itervalues())
+    for memo in genealogy.memo.itervalues():
+        genealogy_bytes += sys.getsizeof(memo)
+        for memoized_kin in memo.itervalues():
+            genealogy_bytes += sys.getsizeof(memoized_kin)
+            genealogy_bytes += sum(sys.getsizeof(kin) for kin in memoized_kin.itervalues())
+    n_people = float(len(people))
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KB on Linux
+    print '\n{:>8}{:>10}{:>14}{:>18}{:>16}{:>16}{:>16}'.format(
+        'years', 'people', 'object (B)', 'containers (B)', 'genealogy (B)', 'total (B)', 'peak RSS (MB)'
+    )
+    print '{:>8}{:>10}{:>14.0f}{:>18.0f}{:>16.0f}{:>16.0f}{:>16.1f}'.format(
+        n_years, len(people), object_bytes / n_people, container_bytes / n_people, genealogy_bytes / n_people,
+        (object_bytes + container_bytes + genealogy_bytes) / n_people, peak_rss
+    )
+    print 'Worldgen took {:.1f}s'.format(worldgen_time)
+
+
+def benchmark_births(n_years=140, seed=0):
+    """Simulate a town's history and report the time taken by births, against the size of newborns' families.
+
+    Besides the total time per birth, this reports the time spent on familial bookkeeping, i.e., in
+    determining the newborn's family members and having them take note of the newborn.
+    """
+    import life_event
+    from person import Person
+    sim = _prepare_history(n_years=n_years, seed=seed)
+    births = []  # (Size of the newborn's extended family, total time, familial-bookkeeping time) tuples
+    familial_time = [0.0]
+    birth_init = life_event.Birth.__init__
+    familial_methods = ('_init_familial_attributes', '_init_update_familial_attributes_of_family_members')
+    original_familial_methods = {name: Person.__dict__[name] for name in familial_methods}
+
+    def timed(method):
+        def timed_method(person):
+            method_start_time = time.time()
+            method(person)
+            familial_time[0] += time.time() - method_start_time
+        return timed_method
+
+    def timed_birth_init(birth, *args, **kwargs):
+        familial_time[0] = 0.0
+        birth_start_time = time.time()
+        birth_init(birth, *args, **kwargs)
+        births.append((len(birth.subject.extended_family), time.time() - birth_start_time, familial_time[0]))
+    life_event.Birth.__init__ = timed_birth_init
+    for name, method in original_familial_methods.iteritems():
+        setattr(Person, name, timed(method))
+    try:
+        sim.establish_setting()
+    finally:
+        life_event.Birth.__init__ = birth_init
+        for name, method in original_familial_methods.iteritems():
+            setattr(Person, name, method)
+    print '\n{:>24}{:>10}{:>20}{:>22}'.format('extended family size', 'births', 'per birth (ms)', 'familial (ms)')
+    for low, high in ((0, 10), (10, 20), (20, 40), (40, 80), (80, sys.maxint)):
+        bin_births = [birth for birth in births if low <= birth[0] < high]
+        if bin_births:
+            print '{:>24}{:>10}{:>20.3f}{:>22.3f}'.format(
+                '{}-{}'.format(low, high - 1) if high != sys.maxint else '{}+'.format(low), len(bin_births),
+                sum(birth[1] for birth in bin_births) * 1000 / len(bin_births),
+                sum(birth[2] for birth in bin_births) * 1000 / len(bin_births)
+            )
+    print '{:>24}{:>10}{:>20.3f}{:>22.3f}'.format(
+        'all', len(births), sum(birth[1] for birth in births) * 1000 / max(1, len(births)),
+        sum(birth[2] for birth in births) * 1000 / max(1, len(births))
+    )
+
+
+def benchmark_relations(n_years=100, n_home_seekers=20, seed=0):
+    """Simulate a town's history and time the classification of people's relations to one another.
+
+    This times two workloads: classifying every resident's relation to every person who has ever
+    lived in the town (as the exporters do), and having residents rate every vacant home and lot
+    in the town (which classifies their relatives' relations to them for each one).
+    """
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    residents = sorted(sim.town.residents, key=lambda resident: resident.id)
+    all_time_residents = list(sim.town.all_time_residents)
+    start_time = time.time()
+    n_related_pairs = 0
+    for resident in residents:
+        for other in all_time_residents:
+            if resident.relation_to_me(other):
+                n_related_pairs += 1
+    all_pairs_time = time.time() - start_time
+    home_seekers = random.sample(residents, min(n_home_seekers, len(residents)))
+    start_time = time.time()
+    for home_seeker in home_seekers:
+        home_seeker._rate_all_vacant_homes_and_vacant_lots()
+    rating_time = time.time() - start_time
+    n_vacancies = len(sim.town.vacant_homes) + len(sim.town.vacant_lots)
+    print '\n{:>12}{:>14}{:>16}{:>18}{:>22}'.format(
+        'residents', 'pairs', 'related pairs', 'all pairs (s)', 'per pair (us)'
+    )
+    n_pairs = len(residents) * len(all_time_residents)
+    print '{:>12}{:>14}{:>16}{:>18.3f}{:>22.2f}'.format(
+        len(residents), n_pairs, n_related_pairs, all_pairs_time, all_pairs_time * 1e6 / max(1, n_pairs)
+    )
+    print '\n{:>16}{:>16}{:>18}{:>22}'.format('home seekers', 'vacancies', 'rating (s)', 'per seeker (ms)')
+    print '{:>16}{:>16}{:>18.3f}{:>22.2f}'.format(
+        len(home_seekers), n_vacancies, rating_time, rating_time * 1000 / max(1, len(home_seekers))
+    )
+
+
+def benchmark_whereabouts_memory(n_years=(20, 40, 80), seed=0):
+    """Simulate towns' histories and report the memory taken by everyone's recorded whereabouts per simulated year.
+
+    This counts the sim's whereabouts log (its columns, its inverse location index, and its mappings
+    from IDs to people and locations) and each person's Whereabouts object, including its rows.
+    """
+    from person import Person
+    print '\n{:>8}{:>12}{:>16}{:>18}{:>20}'.format('years', 'rows', 'bytes per row', 'MB per year', 'record (us/row)')
+    for years in n_years:
+        sim = _prepare_history(n_years=years, seed=seed)
+        record = sim.whereabouts_log.record
+        recording_time = [0.0]
+
+        def timed_record(person, occasion):
+            record_start_time = time.time()
+            record(person=person, occasion=occasion)
+            recording_time[0] += time.time() - record_start_time
+        sim.whereabouts_log.record = timed_record
+        sim.establish_setting()
+        del sim.whereabouts_log.record
+        log = sim.whereabouts_log
+        n_bytes = sum(
+            sys.getsizeof(column) for column in (log.timesteps, log.person_ids, log.location_ids, log.occasion_codes)
+        )
+        n_bytes += sys.getsizeof(log.location_rows) + sum(sys.getsizeof(rows) for rows in log.location_rows.itervalues())
+        n_bytes += sys.getsizeof(log.people) + sys.getsizeof(log.locations)
+        for person in (obj for obj in gc.get_objects() if isinstance(obj, Person)):
+            whereabouts = person.whereabouts
+            n_bytes += sys.getsizeof(whereabouts) + sys.getsizeof(whereabouts.__dict__) + sys.getsizeof(whereabouts.rows)
+        n_rows = len(log.timesteps)
+        print '{:>8}{:>12}{:>16.1f}{:>18.2f}{:>20.2f}'.format(
+            years, n_rows, n_bytes / float(max(1, n_rows)), n_bytes / 1048576.0 / years,
+            recording_time[0] * 1e6 / max(1, n_rows)
+        )
+
+
+def benchmark_job_candidates(n_years=100, n_rounds=20, seed=0):
+    """Simulate a town's history and time the assembly of job candidates for every kind of occupation.
+
+    This also reports how many kinds of occupation have preconditions that the job market checks
+    once per group of applicants of the same sex (see JobMarket.candidates()), after making sure
+    that doing so gives the same answer as checking every applicant in the town.
+    """
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    company = min(sim.town.companies, key=lambda c: c.id)
+    occupation_classes = sorted(
+        (occupation_class for occupation_class in sim.config.job_levels if occupation_class),
+        key=lambda occupation_class: occupation_class.__name__
+    )
+    checked_per_group = [
+        occupation_class for occupation_class in occupation_classes
+        if occupation_class in sim.config.occupations_whose_preconditions_depend_only_on_sex_and_year
+    ]
+    for occupation_class in checked_per_group:
+        is_employable = sim.config.employable_as_a[occupation_class]
+        for people in sim.town.job_market.buckets.itervalues():
+            if len({bool(is_employable(applicant=person)) for person in people}) > 1:
+                raise AssertionError(
+                    "Preconditions for {} depend on more than sex and year".format(occupation_class.__name__)
+                )
+    n_candidates = 0
+    start_time = time.time()
+    for _ in xrange(n_rounds):
+        for occupation_class in occupation_classes:
+            n_candidates += len(company._assemble_job_candidates(occupation_of_need=occupation_class))
+    assembly_time = time.time() - start_time
+    n_assemblies = n_rounds * len(occupation_classes)
+    print '\n{:>12}{:>12}{:>14}{:>22}{:>24}{:>20}'.format(
+        'residents', 'employees', 'assemblies', 'candidates (mean)', 'per assembly (ms)', 'checked per group'
+    )
+    print '{:>12}{:>12}{:>14}{:>22.1f}{:>24.3f}{:>20}'.format(
+        len(sim.town.residents), sum(len(c.employees) for c in sim.town.companies), n_assemblies,
+        n_candidates / float(n_assemblies), assembly_time * 1000 / n_assemblies,
+        '{}/{}'.format(len(checked_per_group), len(occupation_classes))
+    )
+
+
+def benchmark_job_candidate_rating(n_years=100, n_rounds=20, seed=0):
+    """Simulate a town's history and time every company's rating of everyone in the workforce as job candidates."""
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    companies = sorted(sim.town.companies, key=lambda c: c.id)
+    candidates = sorted((p for p in sim.town.residents if p.in_the_workforce), key=lambda p: p.id)
+    start_time = time.time()
+    for _ in xrange(n_rounds):
+        for company in companies:
+            company.rate_job_candidates(candidates=candidates)
+    rating_time = time.time() - start_time
+    n_ratings = n_rounds * len(companies)
+    print '\n{:>12}{:>14}{:>26}{:>26}'.format(
+        'companies', 'candidates', 'per hire (ms)', 'per candidate (us)'
+    )
+    print '{:>12}{:>14}{:>26.3f}{:>26.2f}'.format(
+        len(companies), len(candidates), rating_time * 1000 / n_ratings,
+        rating_time * 1e6 / max(1, n_ratings * len(candidates))
+    )
+
+
+def benchmark_job_seeking(n_years=100, n_rounds=20, seed=0):
+    """Simulate a town's history and time job seekers' scoring by all companies for their supplemental positions."""
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    # Score everyone in the workforce, not just the unemployed, to get a meaningful sample
+    job_seekers = sorted((p for p in sim.town.residents if p.in_the_workforce), key=lambda p: p.id)
+    n_vacancies = sum(
+        len(company.supplemental_vacancies[shift]) for company in sim.town.companies for shift in ('day', 'night')
+    )
+    n_scores = 0
+    start_time = time.time()
+    for _ in xrange(n_rounds):
+        for job_seeker in job_seekers:
+            n_scores += len(job_seeker._get_scored_as_job_candidate_by_all_companies())
+    scoring_time = time.time() - start_time
+    n_scorings = n_rounds * len(job_seekers)
+    print '\n{:>12}{:>12}{:>12}{:>20}{:>22}'.format(
+        'companies', 'vacancies', 'seekers', 'scores (mean)', 'per seeker (ms)'
+    )
+    print '{:>12}{:>12}{:>12}{:>20.1f}{:>22.3f}'.format(
+        len(sim.town.companies), n_vacancies, len(job_seekers), n_scores / float(max(1, n_scorings)),
+        scoring_time * 1000 / max(1, n_scorings)
+    )
+
+
+def benchmark_hiring_chains(n_years=100, seed=0):
+    """Simulate a town's history and report on the hiring chains that played out in it."""
+    sim = _simulate_history(n_years=n_years, seed=seed)
+    print '\n' + sim.hiring_stats.report()
+
+
+BENCHMARKS = {
+    'town_construction': benchmark_town_construction,
+    'lot_distances': benchmark_lot_distances,
+    'town_scaling': benchmark_town_scaling,
+    'checkpoint': benchmark_checkpoint,
+    'worldgen_scheduling': benchmark_worldgen_scheduling,
+    'salience_memory': benchmark_salience_memory,
+    'progress_relationship': benchmark_progress_relationship,
+    'socializing': benchmark_socializing,
+    'person_memory': benchmark_person_memory,
+    'births': benchmark_births,
+    'relations': benchmark_relations,
+    'whereabouts_memory': benchmark_whereabouts_memory,
+    'job_candidates': benchmark_job_candidates,
+    'job_candidate_rating': benchmark_job_candidate_rating,
+    'job_seeking': benchmark_job_seeking,
+    'hiring_chains': benchmark_hiring_chains,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or sorted(BENCHMARKS)
+    for name in names:
+        print '\n== {} =='.format(name)
+        BENCHMARKS[name]()
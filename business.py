@@ -27,7 +27,7 @@ class Business(object):
         # 'Services' is a tuple specifying the services offered by this business, given its type
         self.services = config.services_provided_by_business_of_type[self.__class__]
         self.town = owner.sim.town
-        self.town.companies.add(self)
+        self.town.add_company(self)
         self.founded = self.town.sim.year
         if self.town.vacant_lots or self.__class__ in config.companies_that_get_established_on_tracts:
             self.lot = self._init_choose_vacant_lot()
@@ -36,8 +36,8 @@ class Business(object):
             # Acquire a lot currently occupied by a home, demolish the home,
             # and then construct this company's building on that lot
             acquired_lot = self._init_acquire_currently_occupied_lot()
-            if self.town.businesses_of_type('ConstructionFirm'):
-                demolition_company = random.choice(self.town.businesses_of_type('ConstructionFirm'))
+            if self.town.businesses_of_type(ConstructionFirm):
+                demolition_company = random.choice(self.town.businesses_of_type(ConstructionFirm))
             else:
                 demolition_company = None
             demolition_preceding_construction_of_this_business = Demolition(
@@ -45,10 +45,17 @@ class Business(object):
             )
             self.lot = acquired_lot
         self.lot.building = self
+        self.town.update_vacancy_of_lot(lot=self.lot)
         # First, hire employees -- this is done first because the first-ever business, a
         # construction firm started by the town founder, will need to hire the town's
         # first architect before it can construct its own building
         self.employees = set()
+        self.personnel = set()  # The people who hold the positions in self.employees (which are Occupation objects)
+        # Map people to how many of this company's personnel are in their immediate and extended
+        # families, respectively; these are kept up to date by add_to_personnel(), remove_from_personnel(),
+        # and JobMarket.count_personnel_in_families()
+        self.personnel_in_immediate_families = {}
+        self.personnel_in_extended_families = {}
         self.former_employees = set()
         self.former_owners = []
         if self.__class__ in config.public_company_types:  # Hospital, police station, fire station, etc.
@@ -65,6 +72,8 @@ class Business(object):
             'day': list(config.initial_job_vacancies[self.__class__]['supplemental day']),
             'night': list(config.initial_job_vacancies[self.__class__]['supplemental night'])
         }
+        for shift in ('day', 'night'):
+            self.town.update_supplemental_vacancies(company=self, shift=shift)
         if self.__class__ not in config.companies_that_get_established_on_tracts:
             # Try to find an architect -- if you can't, you'll have to build it yourself
             architect = owner.contract_person_of_certain_occupation(occupation_in_question=Architect)
@@ -84,8 +93,9 @@ class Business(object):
         self.block = self.lot.block
         # Choose a name for this business
         self.name = None
-        while not self.name or any(c for c in self.town.companies if c is not self and c.name == self.name):
+        while not self.name or self.town.companies_by_name.get(self.name, self) is not self:
             self._init_get_named()
+        self.town.index_company_name(company=self)
         # Set miscellaneous attributes
         self.people_here_now = set()
         self.demolition = None  # Potentially gets set by event.Demolition.__init__()
@@ -108,6 +118,7 @@ class Business(object):
         if owner.occupation:
             owner.occupation.terminate(reason=hiring)
         owner.occupation = new_position
+        self.town.job_market.update(person=owner)
         # Lastly, if the person was hired from outside the town, have them move to it
         if owner.town is not self.town:
             owner.move_into_the_town(hiring_that_instigated_move=hiring)
@@ -436,7 +447,7 @@ class Business(object):
          a restaurant nearby where people work); for ApartmentComplex, this is overridden
          to return the employees that work there and also the people that live there.
          """
-        return set([employee.person for employee in self.employees])
+        return set(self.personnel)
 
     @property
     def working_right_now(self):
@@ -475,8 +486,9 @@ class Business(object):
             ).person
         else:
             job_candidates_in_town = self._assemble_job_candidates(occupation_of_need=occupation_of_need)
+            self.town.job_market.chain.candidates_scored.append(len(job_candidates_in_town))
             if job_candidates_in_town:
-                candidate_scores = self._rate_all_job_candidates(candidates=job_candidates_in_town)
+                candidate_scores = self.rate_job_candidates(candidates=job_candidates_in_town)
                 selected_candidate = self._select_candidate(candidate_scores=candidate_scores)
             else:
                 selected_candidate = self._find_candidate_from_outside_the_town(occupation_of_need=occupation_of_need)
@@ -485,6 +497,12 @@ class Business(object):
     def hire(self, occupation_of_need, shift, to_replace=None,
              fills_supplemental_job_vacancy=False, selected_candidate=None, hired_as_a_favor=False):
         """Hire the given selected candidate."""
+        # Unless this hiring is a link in a hiring chain that is already in progress, it sets one off
+        # (if the person hired has a job already, which will go vacant); the vacancies that open up
+        # along the way are filled once this hiring is done
+        job_market = self.town.job_market
+        starts_hiring_chain = job_market.start_hiring_chain(company=self, reason=None)
+        job_market.chain.hires += 1
         # If no candidate has yet been selected, scour the job market to find one
         if not selected_candidate:
             selected_candidate = self._find_candidate(occupation_of_need=occupation_of_need)
@@ -503,8 +521,8 @@ class Business(object):
         # Now instantiate a Hiring object to hold data about the hiring
         hiring = Hiring(subject=selected_candidate, company=self, occupation=new_position)
         # Now terminate the person's former occupation, if any (which may cause
-        # a hiring chain and this person's former position goes vacant and is filled,
-        # and so forth); this has to happen after the new occupation is instantiated, or
+        # a hiring chain, as this person's former position goes vacant and is filled
+        # once this hiring is done, and so forth); this has to happen after the new occupation is instantiated, or
         # else they may be hired to fill their own vacated position, which will cause problems
         # [Actually, this currently wouldn't happen, because lateral job movement is not
         # possible given how companies assemble job candidates, but it still makes more sense
@@ -517,6 +535,7 @@ class Business(object):
         # person was just hired for, triggering endless recursion as the company tries to
         # fill this vacancy in a Sisyphean nightmare)
         selected_candidate.occupation = new_position
+        self.town.job_market.update(person=selected_candidate)
         # If this is a law firm and the new hire is a lawyer, change the name
         # of this firm to include the new lawyer's name
         if self.__class__ == "LawFirm" and new_position == Lawyer:
@@ -525,6 +544,7 @@ class Business(object):
         # config.py), then remove an instance of this position from that list
         if fills_supplemental_job_vacancy:
             self.supplemental_vacancies[shift].remove(occupation_of_need)
+            self.town.update_supplemental_vacancies(company=self, shift=shift)
             # This position doesn't have to be refilled immediately if terminated, so
             # attribute to it that it is supplemental
             selected_candidate.occupation.supplemental = True
@@ -540,6 +560,8 @@ class Business(object):
         # Lastly, if the person was hired from outside the town, have them move to it
         if selected_candidate.town is not self.town:
             selected_candidate.move_into_the_town(hiring_that_instigated_move=hiring)
+        if starts_hiring_chain:
+            job_market.complete_hiring_chain()
 
     @staticmethod
     def _select_candidate(candidate_scores):
@@ -562,35 +584,79 @@ class Business(object):
         candidate = PersonExNihilo(
             sim=self.town.sim, job_opportunity_impetus=occupation_of_need, spouse_already_generated=None
         )
+        self.town.job_market.chain.imports += 1
         return candidate
 
-    def _rate_all_job_candidates(self, candidates):
-        """Rate all job candidates."""
+    def add_to_personnel(self, person):
+        """Add someone who has taken a position here to this company's personnel, if they aren't already among it."""
+        if person not in self.personnel:
+            self.personnel.add(person)
+            self.town.job_market.count_employee_in_families(company=self, employee=person, change=1)
+
+    def remove_from_personnel(self, person):
+        """Remove someone who no longer holds any position here from this company's personnel."""
+        self.personnel.remove(person)
+        self.town.job_market.count_employee_in_families(company=self, employee=person, change=-1)
+
+    def rate_job_candidates(self, candidates):
+        """Rate a group of job candidates, returning a dictionary mapping them to their scores.
+
+        This gives the same scores as calling rate_job_candidate() for each candidate, but the sets
+        of people that the scores depend on are gathered once for the whole group.
+        """
+        decision_maker = self.owner.person if self.owner else self.town.mayor
+        personnel_in_immediate_families = self.personnel_in_immediate_families
+        personnel_in_extended_families = self.personnel_in_extended_families
+        rate = self._rate_job_candidate
+        ties = (
+            self.personnel, decision_maker.immediate_family, decision_maker.extended_family,
+            decision_maker.friends, decision_maker.acquaintances, decision_maker.enemies
+        )
+        config = self.town.sim.config
         scores = {}
         for candidate in candidates:
-            scores[candidate] = self.rate_job_candidate(person=candidate)
+            scores[candidate] = rate(
+                candidate, config, ties, candidate in personnel_in_immediate_families,
+                candidate in personnel_in_extended_families
+            )
         return scores
 
     def rate_job_candidate(self, person):
         """Rate a job candidate, given an open position and owner biases."""
-        config = self.town.sim.config
         decision_maker = self.owner.person if self.owner else self.town.mayor
+        ties = (
+            self.personnel, decision_maker.immediate_family, decision_maker.extended_family,
+            decision_maker.friends, decision_maker.acquaintances, decision_maker.enemies
+        )
+        return self._rate_job_candidate(
+            person, self.town.sim.config, ties, person in self.personnel_in_immediate_families,
+            person in self.personnel_in_extended_families
+        )
+
+    @staticmethod
+    def _rate_job_candidate(person, config, ties, immediate_family_of_an_employee, extended_family_of_an_employee):
+        """Rate a job candidate, given the company's ties to them and whether they are family of an employee.
+
+        @param ties: A tuple of the sets of the company's employees and its decision maker's immediate
+                     family, extended family, friends, acquaintances, and enemies.
+        """
+        personnel, immediate_family, extended_family, friends, acquaintances, enemies = ties
         score = 0.0
-        if person in self.employees:
+        if person in personnel:
             score += config.preference_to_hire_from_within_company
-        if person in decision_maker.immediate_family:
+        if person in immediate_family:
             score += config.preference_to_hire_immediate_family
-        elif person in decision_maker.extended_family:
+        elif person in extended_family:
             score += config.preference_to_hire_extended_family
-        if person.immediate_family & self.employees:
+        if immediate_family_of_an_employee:
             score += config.preference_to_hire_immediate_family_of_an_employee
-        elif person.extended_family & self.employees:
+        elif extended_family_of_an_employee:
             score += config.preference_to_hire_extended_family_of_an_employee
-        if person in decision_maker.friends:
+        if person in friends:
             score += config.preference_to_hire_friend
-        elif person in decision_maker.acquaintances:
+        elif person in acquaintances:
             score += config.preference_to_hire_acquaintance
-        if person in decision_maker.enemies:
+        if person in enemies:
             score += config.dispreference_to_hire_enemy
         if person.occupation:
             score *= person.occupation.level
@@ -600,24 +666,11 @@ class Business(object):
 
     def _assemble_job_candidates(self, occupation_of_need):
         """Assemble a group of job candidates for an open position."""
-        candidates = set()
-        # Consider people that already work in this town -- this will subsume
-        # reasoning over people that could be promoted from within this company
-        for company in self.town.companies:
-            for position in company.employees:
-                person_is_qualified = self.check_if_person_is_qualified_for_the_position(
-                    candidate=position.person, occupation_of_need=occupation_of_need
-                )
-                if person_is_qualified:
-                    candidates.add(position.person)
-        # Consider unemployed (mostly young) people if they are qualified
-        for person in self.town.unemployed:
-            person_is_qualified = self.check_if_person_is_qualified_for_the_position(
-                candidate=person, occupation_of_need=occupation_of_need
-            )
-            if person_is_qualified:
-                candidates.add(person)
-        return candidates
+        # Consider people that already work in this town -- this will subsume reasoning over
+        # people that could be promoted from within this company -- as well as unemployed (mostly
+        # young) people, if they are qualified; the town's job market indexes these people by
+        # what qualification depends on, so that only those who may be qualified get considered
+        return self.town.job_market.candidates(occupation_of_need=occupation_of_need)
 
     def check_if_person_is_qualified_for_the_position(self, candidate, occupation_of_need):
         """Check if the job candidate is qualified for the position you are hiring for."""
@@ -1155,6 +1208,7 @@ class LawFirm(Business):
 
     def rename_due_to_lawyer_change(self):
         """Rename this company due to the hiring of a new lawyer."""
+        former_name = getattr(self, 'name', None)  # Not yet set if this firm is hiring its initial employees
         partners = [e for e in self.employees if e.__class__ is Lawyer]
         if len(partners) > 1:
             partners_str = "{} & {}".format(
@@ -1172,6 +1226,8 @@ class LawFirm(Business):
             # The only lawyer working here retired or departed the town -- the
             # business will shut down shortly and this will be its final name
             pass
+        if former_name and self.name != former_name:
+            self.town.index_company_name(company=self, former_name=former_name)
 
     @property
     def filed_divorces(self):
@@ -53,7 +53,10 @@ def list_attributes(entity):
 		year_i_moved_here
 		years_i_lived_here
 	"""
-	for attribute in sorted(vars(entity).keys()):  # Prints them out in alphabetical order
+	attributes = set(getattr(entity, '__dict__', ()))
+	for klass in type(entity).__mro__:  # Entities like Person objects keep their attributes in slots
+		attributes |= {slot for slot in klass.__dict__.get('__slots__', ()) if hasattr(entity, slot)}
+	for attribute in sorted(attributes):  # Prints them out in alphabetical order
 		print attribute
 
 
@@ -0,0 +1,290 @@
+import gc
+import zlib
+import array
+import types
+import random
+import cPickle
+import importlib
+from config import Config
+
+
+# Checkpoints are written in a format comprising a header line (which names the format version) and
+# then a compressed pickle of id-referenced records; bump the version whenever the encoding changes
+CHECKPOINT_HEADER = 'talktown-checkpoint'
+CHECKPOINT_FORMAT_VERSION = 1
+# Values of these types are written as is; everything else gets encoded
+PRIMITIVE_TYPES = (type(None), bool, int, long, float, str, unicode)
+# Objects of classes that subclass these types are written along with their underlying value
+SUBCLASSABLE_PRIMITIVE_TYPES = (str, unicode, float, int, long)
+# Tags for the encodings of collections (dictionaries are tagged 'd')
+COLLECTION_TAGS = {tuple: 't', list: 'l', set: 's', frozenset: 'f'}
+DECODED_COLLECTION_TYPES = {tag: collection_type for collection_type, tag in COLLECTION_TAGS.iteritems()}
+# Values of any type not listed here are objects that get written as records of their own
+NON_OBJECT_TYPES = frozenset(
+    PRIMITIVE_TYPES + tuple(COLLECTION_TAGS) +
+    (dict, array.array, Config, type, types.ClassType, types.FunctionType, types.MethodType, types.ModuleType)
+)
+
+
+def save(sim, filename):
+    """Write the complete state of a simulation to a checkpoint file.
+
+    Rather than pickling the object graph directly (which recurses through the dense web of
+    references between people, relationships, occupations, businesses, lots, and events), every
+    object reachable from the simulation is written exactly once, as a record whose references to
+    other objects are indices into the list of records. The checkpoint also captures the state of
+    the random number generator, any counters kept as class attributes (e.g., Lot.counter), and
+    config parameters with simple values, so that a loaded simulation picks up where this one was.
+    """
+    # Building the hundreds of thousands of small lists and tuples that make up the records
+    # would otherwise trigger many needless (and progressively slower) garbage collections
+    gc.disable()
+    try:
+        writer = _CheckpointWriter(sim=sim)
+        checkpoint = writer.write()
+    finally:
+        gc.enable()
+    with open(filename, 'wb') as f:
+        f.write('{} {}\n'.format(CHECKPOINT_HEADER, CHECKPOINT_FORMAT_VERSION))
+        # The encoded checkpoint is a tree (shared objects having been replaced by record numbers),
+        # so the pickler can skip the costly bookkeeping it does to preserve shared references
+        pickler = cPickle.Pickler(cPickle.HIGHEST_PROTOCOL)
+        pickler.fast = True
+        pickler.dump(checkpoint)
+        f.write(zlib.compress(pickler.getvalue(), 1))
+
+
+def load(filename):
+    """Rebuild a simulation from a checkpoint file written by save(), and return it.
+
+    This also restores the state of the random number generator, so that simulating onward
+    from the loaded simulation draws the same random numbers as the original would have. Note,
+    however, that sets and dictionaries of objects iterate in an order that depends on where
+    those objects reside in memory, so the two may still diverge wherever the simulation's
+    behavior depends on that order (just as two runs with the same seed may).
+    """
+    with open(filename, 'rb') as f:
+        header = f.readline().split()
+        assert header[0] == CHECKPOINT_HEADER, "{} is not a simulation checkpoint.".format(filename)
+        assert int(header[1]) == CHECKPOINT_FORMAT_VERSION, (
+            "{} was written in checkpoint format version {}, but this is version {}.".format(
+                filename, header[1], CHECKPOINT_FORMAT_VERSION
+            )
+        )
+        gc.disable()  # See the note in save()
+        try:
+            checkpoint = cPickle.loads(zlib.decompress(f.read()))
+            reader = _CheckpointReader(checkpoint=checkpoint)
+            sim = reader.read()
+        finally:
+            gc.enable()
+    return sim
+
+
+class _CheckpointWriter(object):
+    """Encodes a simulation's object graph as a flat list of id-referenced records.
+
+    Each record is a tuple (class number, builtin value, shape number, encoded attribute values),
+    where a shape is a tuple of attribute names shared by every record with those attributes.
+    Primitives and tuples of primitives are encoded as is, a reference to another object as a
+    one-element list holding its record number, and anything else as a list whose first element
+    is a tag indicating how to decode it; the many collections that hold nothing but references
+    to objects (e.g., a person's family sets) are encoded as bare lists of record numbers.
+    """
+
+    def __init__(self, sim):
+        """Initialize a _CheckpointWriter object."""
+        self.sim = sim
+        self.objects = []  # Index in this list is an object's record number
+        self.record_numbers = {}  # Maps id(object) to record number
+        self.classes = []
+        self.class_numbers = {}
+        self.shapes = []
+        self.shape_numbers = {}
+        self.sorted_shapes = {}  # Maps tuples of attribute names to the same, sorted (to share shapes)
+        self.slots = {}  # Maps classes to the names of their slots (if any), for objects using __slots__
+
+    def write(self):
+        """Return a picklable checkpoint of this writer's simulation."""
+        self._reference(self.sim)  # The simulation will thus be record 0
+        records = []
+        encode = self._encode
+        primitive_types = frozenset(PRIMITIVE_TYPES)
+        # Note: self.objects grows as records reference objects not yet encountered
+        i = 0
+        while i < len(self.objects):
+            obj = self.objects[i]
+            shape, values = self._get_state(obj)
+            shape_number = self.shape_numbers.get(shape)
+            if shape_number is None:
+                shape_number = self.shape_numbers[shape] = len(self.shapes)
+                self.shapes.append(shape)
+            records.append(
+                (self._class_number(obj.__class__), self._builtin_value(obj), shape_number,
+                 [value if type(value) in primitive_types else encode(value) for value in values])
+            )
+            i += 1
+        class_counters = {}
+        for cls in self.classes:
+            for klass in cls.__mro__:
+                if 'counter' in klass.__dict__:
+                    class_counters[(klass.__module__, klass.__name__)] = klass.counter
+        config_parameters = {
+            parameter: value for parameter, value in self.sim.config.__dict__.iteritems() if _is_plain(value)
+        }
+        checkpoint = {
+            'classes': [(cls.__module__, cls.__name__) for cls in self.classes],
+            'shapes': self.shapes,
+            'records': records,
+            'class_counters': class_counters,
+            'config_parameters': config_parameters,
+            'random_state': random.getstate(),
+        }
+        return checkpoint
+
+    def _reference(self, obj):
+        """Return the record number for the given object, assigning one if necessary."""
+        record_number = self.record_numbers.get(id(obj))
+        if record_number is None:
+            record_number = self.record_numbers[id(obj)] = len(self.objects)
+            self.objects.append(obj)
+        return record_number
+
+    def _class_number(self, cls):
+        """Return the index of the given class in the checkpoint's listing of classes."""
+        class_number = self.class_numbers.get(cls)
+        if class_number is None:
+            class_number = self.class_numbers[cls] = len(self.classes)
+            self.classes.append(cls)
+        return class_number
+
+    @staticmethod
+    def _builtin_value(obj):
+        """Return the underlying value of an object whose class subclasses a builtin type, else None.
+
+        Such classes include Name and the facial features (str) and personality features (float).
+        """
+        for builtin_type in SUBCLASSABLE_PRIMITIVE_TYPES:
+            if isinstance(obj, builtin_type):
+                return builtin_type(obj)
+        return None
+
+    def _get_state(self, obj):
+        """Return a tuple of the names of the given object's attributes, and a list of their values."""
+        slots = self.slots.get(obj.__class__)
+        if slots is None:
+            slots = self.slots[obj.__class__] = [
+                attribute for klass in obj.__class__.__mro__ for attribute in klass.__dict__.get('__slots__', ())
+                if attribute not in ('__dict__', '__weakref__')
+            ]
+        state = getattr(obj, '__dict__', {})
+        if slots:
+            state = dict(state)
+            for attribute in slots:
+                if hasattr(obj, attribute):
+                    state[attribute] = getattr(obj, attribute)
+        attributes = tuple(state)
+        shape = self.sorted_shapes.get(attributes)
+        if shape is None:
+            shape = self.sorted_shapes[attributes] = tuple(sorted(attributes))
+        return shape, [state[attribute] for attribute in shape]
+
+    def _encode(self, value):
+        """Encode a value, with references to other objects encoded as record numbers."""
+        value_type = type(value)
+        if value_type in PRIMITIVE_TYPES:
+            return value
+        elif value_type in COLLECTION_TAGS:
+            if value_type is tuple and _is_plain(value):
+                return value
+            return [COLLECTION_TAGS[value_type]] + self._encode_collection(value)
+        elif value_type is dict:
+            return ['d'] + self._encode_collection(value.keys()) + self._encode_collection(value.values())
+        elif value_type is array.array:
+            return ['a', value.typecode, value.tostring()]
+        elif value_type is Config:
+            return ['g']
+        elif value_type in (type, types.ClassType):
+            return ['c', self._class_number(value)]
+        elif value_type in (types.FunctionType, types.MethodType, types.ModuleType):
+            raise ValueError("Cannot write {} to a checkpoint.".format(value))
+        return [self._reference(value)]
+
+    def _encode_collection(self, values):
+        """Encode the elements of a collection, as either a list of record numbers or of encoded values.
+
+        Returns a two-element list whose first element indicates which encoding was used.
+        """
+        if all(type(value) not in NON_OBJECT_TYPES for value in values):
+            return [True, [self._reference(value) for value in values]]
+        return [False, [self._encode(value) for value in values]]
+
+
+class _CheckpointReader(object):
+    """Rebuilds a simulation's object graph from the records of a checkpoint."""
+
+    def __init__(self, checkpoint):
+        """Initialize a _CheckpointReader object."""
+        self.checkpoint = checkpoint
+        self.classes = [getattr(importlib.import_module(module), name) for module, name in checkpoint['classes']]
+        self.objects = []
+        self.config = Config()
+        self.config.__dict__.update(checkpoint['config_parameters'])
+
+    def read(self):
+        """Rebuild and return the simulation."""
+        records = self.checkpoint['records']
+        shapes = self.checkpoint['shapes']
+        # First instantiate every object (bypassing their __init__() methods), so that their
+        # attributes can then reference one another regardless of record order
+        for class_number, builtin_value, _, _ in records:
+            cls = self.classes[class_number]
+            if builtin_value is None:
+                self.objects.append(object.__new__(cls))
+            else:
+                self.objects.append(type(builtin_value).__new__(cls, builtin_value))
+        for obj, (_, _, shape_number, values) in zip(self.objects, records):
+            if hasattr(obj, '__dict__'):
+                obj.__dict__.update(zip(shapes[shape_number], [self._decode(value) for value in values]))
+            else:
+                for attribute, value in zip(shapes[shape_number], values):
+                    setattr(obj, attribute, self._decode(value))
+        for (module, name), counter in self.checkpoint['class_counters'].iteritems():
+            setattr(getattr(importlib.import_module(module), name), 'counter', counter)
+        random.setstate(self.checkpoint['random_state'])
+        return self.objects[0]
+
+    def _decode(self, value):
+        """Decode a value encoded by _CheckpointWriter._encode()."""
+        if type(value) is not list:
+            return value
+        tag = value[0]
+        if type(tag) is int:
+            return self.objects[tag]
+        elif tag == 'd':
+            return dict(zip(self._decode_collection(value[1], value[2]), self._decode_collection(value[3], value[4])))
+        elif tag in DECODED_COLLECTION_TYPES:
+            return DECODED_COLLECTION_TYPES[tag](self._decode_collection(value[1], value[2]))
+        elif tag == 'a':
+            decoded = array.array(value[1])
+            decoded.fromstring(value[2])
+            return decoded
+        elif tag == 'g':
+            return self.config
+        elif tag == 'c':
+            return self.classes[value[1]]
+        raise ValueError("Unknown tag in checkpoint: {}".format(tag))
+
+    def _decode_collection(self, all_references, values):
+        """Decode the elements of a collection encoded by _CheckpointWriter._encode_collection()."""
+        if all_references:
+            objects = self.objects
+            return [objects[record_number] for record_number in values]
+        return [self._decode(value) for value in values]
+
+
+def _is_plain(value):
+    """Return whether the given value is a primitive or a (nested) tuple of primitives."""
+    if type(value) in PRIMITIVE_TYPES:
+        return True
+    return type(value) is tuple and all(_is_plain(v) for v in value)
@@ -30,6 +30,11 @@ class BasicConfig(object):
     # have two timesteps -- day, night -- and this parameter specifies how many will actually be simulated)
     number_of_timesteps_to_simulate_a_year = 10.0  # Setting for Bad News: 3.6
     chance_of_a_timestep_being_simulated = number_of_timesteps_to_simulate_a_year / (365 * 2.0)  # Do not alter
+    # Whether to jump directly from one simulated timestep to the next, by drawing the number of timesteps
+    # until the next simulated one from the corresponding geometric distribution; the bookkeeping for the
+    # timesteps in between (birthdays, births, and businesses opening and closing) gets scheduled up front
+    # and executed in bulk, rather than being rolled for on every timestep (see Simulation.simulate())
+    skip_unsimulated_timesteps = True
     # -- LEVERS FOR ADJUSTING POPULATIONS --
     # The primary driver of population growth is new businesses, which may cause new people
     # to enter the simulation to begin working there, or at the least may prevent unemployed
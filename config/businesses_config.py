@@ -808,3 +808,16 @@ class BusinessesConfig(object):
         Owner: lambda applicant: applicant.male if applicant.sim.year < 1977 else True,
         Mayor: lambda applicant: applicant.male if applicant.sim.year < 1977 else True,
     }
+    # Occupations whose preconditions (above) depend only on an applicant's sex and the current year,
+    # which lets job markets check them once for a whole group of applicants of the same sex (this
+    # must be kept in sync with employable_as_a; leaving an occupation out is always safe)
+    occupations_whose_preconditions_depend_only_on_sex_and_year = {
+        Apprentice, Cashier, Janitor, Builder, HotelMaid, Waiter, Secretary, Laborer, Groundskeeper,
+        Whitewasher, Bottler, Bricklayer, Cook, Dishwasher, Busboy, Stocker, Seamstress, Farmhand, Miner,
+        Painter, BankTeller, Grocer, Bartender, Concierge, DaycareProvider, Landlord, Baker, Cooper,
+        Barkeeper, Milkman, Plasterer, Barber, Butcher, Firefighter, PoliceOfficer, Carpenter, TaxiDriver,
+        BusDriver, Blacksmith, Woodworker, Stonecutter, Dressmaker, Distiller, Plumber, Joiner, Innkeeper,
+        Nurse, Farmer, Shoemaker, Brewer, TattooArtist, Puddler, Clothier, Teacher, Tailor, Molder, Turner,
+        Quarryman, Proprietor, Manager, Druggist, InsuranceAgent, Jeweler, Realtor, Mortician, Pharmacist,
+        Professor, Owner, Mayor,
+    }
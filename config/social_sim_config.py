@@ -104,6 +104,10 @@ class SocialSimConfig(object):
     # (whichever is appropriate, of course) object will get instantiated
     charge_threshold_friendship = 15.0
     charge_threshold_enmity = -10.0
+    # Whether to keep the numeric attributes of relationships in a columnar store (of parallel arrays),
+    # which saves memory in large towns and progresses all of a timestep's interactions in one batch;
+    # see relationship_store.py
+    use_columnar_relationship_store = False
     # Thresholds for liking or disliking people
     charge_threshold_for_liking_someone = 10
     charge_threshold_for_disliking_someone = -8
@@ -1,5 +1,16 @@
 class TownGenerationDetailsConfig(object):
     """Configuration parameters related to details of the generated towns."""
+    # Layout of the town; the default scale of 1 yields the classic 9x9 grid of city blocks,
+    # and the scale multiplies the area of the town (it must be a power of 4, since each
+    # quadrupling doubles the width of the grid, whose size must remain a power of two)
+    town_scale = 1
+    town_grid_size = lambda town_scale: int(round(16 * town_scale ** 0.5))
+    town_n_loci = lambda town_scale: 3 * town_scale  # Population centers around which blocks get subdivided
+    town_n_quadtree_samples = lambda town_scale: 32 * town_scale
+    # If this is set to a directory, generated town plans will be cached there (keyed by the
+    # random seed and the layout parameters above), and later simulations with the same seed
+    # and layout parameters will load the cached town plan rather than generating it anew
+    town_layout_cache_directory = None
     # Naming the town
     chance_town_gets_named_for_a_settler = 0.3  # Town settlers are the characters who found the town
     # Naming streets in the town
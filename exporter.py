@@ -25,6 +25,9 @@ with open(filename, 'w') as outfile:
         "places": [],
         "lots": [],
     }
+    # People who are salient to everyone in town due to their job levels, beyond those whom a
+    # given character holds salient for personal reasons
+    people_salient_for_job_level = {p for p in sim.town.all_time_residents if p.job_level_salience}
     for character in sorted(sim.town.all_time_residents, key=lambda c: c.id):
         character_data = {
             "id": character.id,
@@ -135,8 +138,8 @@ with open(filename, 'w') as outfile:
                 }
             ),
             "saliences": {
-                subject.id: int(round(character.salience_of_other_people[subject] if subject is not character else 999))
-                for subject in character.salience_of_other_people
+                subject.id: int(round(character.salience_of(subject) if subject is not character else 999))
+                for subject in people_salient_for_job_level.union(character.salience_of_other_people)
             },
             "whereTheyMet": (
                 {subject.id: character.relationships[subject].where_they_met.id for subject in character.relationships}
@@ -154,7 +157,8 @@ with open(filename, 'w') as outfile:
                 subject.id: character.relationships[subject].total_interactions for subject in character.relationships
             },
             "mostSalientRelationship": {
-                subject.id: character.relation_to_me(person=subject) for subject in character.town.all_time_residents
+                subject.id: relation for subject, relation in
+                character.relations_to_me(people=character.town.all_time_residents).iteritems()
             },
             "friends": [friend.id for friend in character.friends],
             "enemies": [enemy.id for enemy in character.enemies],
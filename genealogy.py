@@ -0,0 +1,403 @@
+class Genealogy(object):
+    """A genealogical graph of everyone born in a simulation, for answering kinship queries.
+
+    Only the edges of the graph are kept: each person's legal and biological parents (which
+    people hold themselves, as .mother, .father, .biological_mother, and .biological_father),
+    indices from parents to their children, and marriages that haven't ended in divorce. All
+    other kin -- siblings, cousins, ancestors, extended family, and so forth -- are found by
+    traversing these edges as needed, and are memoized and kept current as the graph changes:
+    a birth adds the newborn to the memoized sets of their kin, and a marriage or divorce has
+    the couple's kin found anew. People expose these as read-only attributes, e.g., person.cousins;
+    see KINSHIP_ATTRIBUTES.
+    """
+
+    def __init__(self):
+        """Initialize a Genealogy object."""
+        self.children = {}  # Maps people to their (legal) children
+        self.biological_children = {}  # Maps people to their biological children
+        self.spouses = {}  # Maps people to everyone they've married and not divorced (living or not)
+        # Maps people to dictionaries mapping relations to memoized sets of people, with separate
+        # memos for kinship through legal and biological parentage (the latter keyed by True)
+        self.memo = {False: {}, True: {}}
+
+    def add_birth(self, person):
+        """Add edges from a newborn's parents to them."""
+        for parent in person.parents:
+            self.children.setdefault(parent, set()).add(person)
+        for parent in (person.biological_mother, person.biological_father):
+            if parent:
+                self.biological_children.setdefault(parent, set()).add(person)
+        for biological in (False, True):
+            if self.memo[biological]:  # Biological kinship in particular is rarely queried
+                self._add_to_memoized_kin(person, biological=biological)
+
+    def _add_to_memoized_kin(self, newborn, biological):
+        """Memoize a newborn's kin and add the newborn to every memoized set of kin that should now include them."""
+        # A birth only ever adds the newborn to people's sets of kin, and only to the sets of those
+        # people who are themselves the newborn's kin (or, for extended families, the spouses of such
+        # people); since the newborn's kin are found through their parents' relatives, whose sets of
+        # kin never include the newborn, we can find them first and then add the newborn to their sets
+        memo = self.memo[biological]
+        relatives = self._relatives
+        parents = set(self._parents(newborn, biological))
+        grandparents, greatgrandparents, siblings, aunts_and_uncles, cousins = set(), set(), set(), set(), set()
+        for parent in parents:
+            grandparents |= relatives('parents', parent, biological)
+            greatgrandparents |= relatives('grandparents', parent, biological)
+            siblings |= relatives('kids', parent, biological)
+            aunts_and_uncles |= relatives('siblings', parent, biological)
+            cousins |= relatives('nephews', parent, biological) | relatives('nieces', parent, biological)
+        siblings.discard(newborn)
+        nephews_and_nieces = set()
+        for sibling in siblings:
+            nephews_and_nieces |= relatives('kids', sibling, biological)
+        # Newborns have no children or spouses, which leaves their extended family as their blood
+        # extended family
+        immediate_family = parents | grandparents | siblings
+        immediate_family.discard(newborn)
+        extended_family = immediate_family | greatgrandparents | aunts_and_uncles | nephews_and_nieces | cousins
+        extended_family.discard(newborn)
+        memo[newborn] = {
+            'parents': parents, 'grandparents': grandparents, 'greatgrandparents': greatgrandparents,
+            'siblings': siblings, 'immediate_family': immediate_family,
+            'blood_extended_family': extended_family, 'extended_family': set(extended_family),
+        }
+        male = newborn.male
+        full_siblings = {
+            sibling for sibling in siblings if len(parents) == 2 and self._parents(sibling, biological) == parents
+        }
+        for kin, relations in (
+            (parents, ('kids', 'sons' if male else 'daughters')),
+            (grandparents, ('grandchildren', 'grandsons' if male else 'granddaughters')),
+            (greatgrandparents, ('greatgrandchildren', 'greatgrandsons' if male else 'greatgranddaughters')),
+            (siblings, ('siblings', 'brothers' if male else 'sisters')),
+            (full_siblings, ('full_siblings', 'full_brothers' if male else 'full_sisters')),
+            (siblings - full_siblings, ('half_siblings', 'half_brothers' if male else 'half_sisters')),
+            (aunts_and_uncles, ('nephews' if male else 'nieces',)),
+            (nephews_and_nieces, ('uncles' if male else 'aunts',)),
+            (cousins, ('cousins',)),
+            (immediate_family, ('immediate_family',)),
+            (extended_family, ('blood_extended_family', 'extended_family')),
+        ):
+            for relative in kin:
+                memoized_kin = memo.get(relative)
+                if memoized_kin:
+                    for relation in relations:
+                        if relation in memoized_kin:
+                            memoized_kin[relation].add(newborn)
+        if not biological:
+            for relative in extended_family:
+                for spouse in self.spouses.get(relative, ()):
+                    memoized_kin = memo.get(spouse)
+                    if memoized_kin and 'extended_family' in memoized_kin:
+                        memoized_kin['extended_family'].add(newborn)
+
+    def add_marriage(self, spouse1, spouse2):
+        """Add an edge between two newlyweds."""
+        self.spouses.setdefault(spouse1, set()).add(spouse2)
+        self.spouses.setdefault(spouse2, set()).add(spouse1)
+        self._forget_marriage(spouse1, spouse2)
+
+    def remove_marriage(self, spouse1, spouse2):
+        """Remove the edge between two divorcees."""
+        self._forget_marriage(spouse1, spouse2)
+        self.spouses[spouse1].discard(spouse2)
+        self.spouses[spouse2].discard(spouse1)
+
+    def people_whose_families_change_with_marriage(self, spouse1, spouse2):
+        """Return everyone whose family changes when the given couple marries or divorces."""
+        # Besides the couple themselves, this includes their other spouses (e.g., a widower's late
+        # wife), whose extended families include those of the couple
+        return self.spouses.get(spouse1, set()) | self.spouses.get(spouse2, set()) | {spouse1, spouse2}
+
+    def _forget_marriage(self, spouse1, spouse2):
+        """Forget the memoized kin of everyone whose family changes when the given couple marries or divorces."""
+        # Biological kinship doesn't consider marriages, so only the legal memo is affected
+        memo = self.memo[False]
+        for person in self.people_whose_families_change_with_marriage(spouse1, spouse2):
+            memo.pop(person, None)
+
+    def people_whose_extended_families_include(self, person):
+        """Return the set of people who count the given person among their extended family."""
+        # Blood extended families are symmetric, but a person's extended family also includes their
+        # spouses' blood extended families, so this includes the spouses of the person's blood kin
+        blood_extended_family = self._relatives('blood_extended_family', person, False)
+        people = set(blood_extended_family)
+        spouses = self.spouses
+        for relative in blood_extended_family:
+            people |= spouses.get(relative, set())
+        people.discard(person)
+        return people
+
+    def kin(self, person, attribute):
+        """Return the set of kin named by one of the attributes in KINSHIP_ATTRIBUTES (e.g., 'bio_cousins')."""
+        relation, biological = KINSHIP_ATTRIBUTES[attribute]
+        return self._relatives(relation=relation, person=person, biological=biological)
+
+    def _relatives(self, relation, person, biological):
+        """Return a (memoized) set of the people who are related to a person in the given way.
+
+        Memoized sets are kept current as the graph changes, and so must not be modified by callers.
+        """
+        if relation in UNMEMOIZED_RELATIONS:
+            return getattr(self, '_' + relation)(person, biological)
+        try:
+            memo = self.memo[biological][person]
+        except KeyError:
+            memo = self.memo[biological][person] = {}
+        try:
+            return memo[relation]
+        except KeyError:
+            relatives = set(getattr(self, '_' + relation)(person, biological))
+            memo[relation] = relatives
+            return relatives
+
+    def _union(self, relation, people, biological):
+        """Return the union of the sets of people related in the given way to each of the given people."""
+        union = set()
+        for person in people:
+            union |= self._relatives(relation=relation, person=person, biological=biological)
+        return union
+
+    def _parents(self, person, biological):
+        """Return this person's parents."""
+        if biological:
+            return {parent for parent in (person.biological_mother, person.biological_father) if parent}
+        return person.parents
+
+    def _kids(self, person, biological):
+        """Return this person's children."""
+        return (self.biological_children if biological else self.children).get(person, ())
+
+    def _sons(self, person, biological):
+        """Return this person's sons."""
+        return {kid for kid in self._relatives('kids', person, biological) if kid.male}
+
+    def _daughters(self, person, biological):
+        """Return this person's daughters."""
+        return {kid for kid in self._relatives('kids', person, biological) if kid.female}
+
+    def _siblings(self, person, biological):
+        """Return this person's full and half siblings."""
+        return self._union('kids', self._relatives('parents', person, biological), biological) - {person}
+
+    def _full_siblings(self, person, biological):
+        """Return this person's full siblings."""
+        parents = list(self._relatives('parents', person, biological))
+        if len(parents) < 2:
+            return ()
+        return (
+            self._relatives('kids', parents[0], biological) & self._relatives('kids', parents[1], biological)
+        ) - {person}
+
+    def _half_siblings(self, person, biological):
+        """Return this person's half siblings."""
+        return self._relatives('siblings', person, biological) - self._relatives('full_siblings', person, biological)
+
+    def _brothers(self, person, biological):
+        """Return this person's full and half brothers."""
+        return {sibling for sibling in self._relatives('siblings', person, biological) if sibling.male}
+
+    def _full_brothers(self, person, biological):
+        """Return this person's full brothers."""
+        return {sibling for sibling in self._relatives('full_siblings', person, biological) if sibling.male}
+
+    def _half_brothers(self, person, biological):
+        """Return this person's half brothers."""
+        return {sibling for sibling in self._relatives('half_siblings', person, biological) if sibling.male}
+
+    def _sisters(self, person, biological):
+        """Return this person's full and half sisters."""
+        return {sibling for sibling in self._relatives('siblings', person, biological) if sibling.female}
+
+    def _full_sisters(self, person, biological):
+        """Return this person's full sisters."""
+        return {sibling for sibling in self._relatives('full_siblings', person, biological) if sibling.female}
+
+    def _half_sisters(self, person, biological):
+        """Return this person's half sisters."""
+        return {sibling for sibling in self._relatives('half_siblings', person, biological) if sibling.female}
+
+    def _grandparents(self, person, biological):
+        """Return this person's grandparents."""
+        return self._union('parents', self._relatives('parents', person, biological), biological)
+
+    def _greatgrandparents(self, person, biological):
+        """Return this person's great-grandparents."""
+        return self._union('grandparents', self._relatives('parents', person, biological), biological)
+
+    def _grandchildren(self, person, biological):
+        """Return this person's grandchildren."""
+        return self._union('kids', self._relatives('kids', person, biological), biological)
+
+    def _grandsons(self, person, biological):
+        """Return this person's grandsons."""
+        return self._union('sons', self._relatives('kids', person, biological), biological)
+
+    def _granddaughters(self, person, biological):
+        """Return this person's granddaughters."""
+        return self._union('daughters', self._relatives('kids', person, biological), biological)
+
+    def _greatgrandchildren(self, person, biological):
+        """Return this person's great-grandchildren."""
+        return self._union('grandchildren', self._relatives('kids', person, biological), biological)
+
+    def _greatgrandsons(self, person, biological):
+        """Return this person's great-grandsons."""
+        return self._union('grandsons', self._relatives('kids', person, biological), biological)
+
+    def _greatgranddaughters(self, person, biological):
+        """Return this person's great-granddaughters."""
+        return self._union('granddaughters', self._relatives('kids', person, biological), biological)
+
+    def _uncles(self, person, biological):
+        """Return this person's uncles (i.e., their parents' brothers)."""
+        return self._union('brothers', self._relatives('parents', person, biological), biological)
+
+    def _aunts(self, person, biological):
+        """Return this person's aunts (i.e., their parents' sisters)."""
+        return self._union('sisters', self._relatives('parents', person, biological), biological)
+
+    def _nephews(self, person, biological):
+        """Return this person's nephews (i.e., their siblings' sons)."""
+        return self._union('sons', self._relatives('siblings', person, biological), biological)
+
+    def _nieces(self, person, biological):
+        """Return this person's nieces (i.e., their siblings' daughters)."""
+        return self._union('daughters', self._relatives('siblings', person, biological), biological)
+
+    def _cousins(self, person, biological):
+        """Return this person's first cousins (i.e., their parents' nieces and nephews)."""
+        parents = self._relatives('parents', person, biological)
+        return self._union('nephews', parents, biological) | self._union('nieces', parents, biological)
+
+    def _ancestors(self, person, biological):
+        """Return this person's ancestors."""
+        return self._lineage(person, step=self._parents, biological=biological)
+
+    def _descendants(self, person, biological):
+        """Return this person's descendants."""
+        return self._lineage(person, step=self._kids, biological=biological)
+
+    @staticmethod
+    def _lineage(person, step, biological):
+        """Return everyone reached from this person by repeatedly taking the given step (e.g., to parents)."""
+        lineage = set()
+        frontier = [person]
+        while frontier:
+            for relative in step(frontier.pop(), biological):
+                if relative not in lineage:
+                    lineage.add(relative)
+                    frontier.append(relative)
+        return lineage
+
+    def _immediate_family(self, person, biological):
+        """Return this person's immediate family: grandparents, parents, siblings, children,
+        grandchildren, and (unless considering biological family only) spouses.
+        """
+        immediate_family = set(self._relatives('parents', person, biological))
+        for relation in ('grandparents', 'siblings', 'kids', 'grandchildren'):
+            immediate_family |= self._relatives(relation, person, biological)
+        if not biological:
+            immediate_family |= self.spouses.get(person, set())
+        return immediate_family - {person}
+
+    def _blood_extended_family(self, person, biological):
+        """Return this person's extended family, excluding that of their spouses."""
+        extended_family = set(self._relatives('immediate_family', person, biological))
+        for relation in (
+            'greatgrandparents', 'greatgrandchildren', 'uncles', 'aunts', 'nephews', 'nieces', 'cousins'
+        ):
+            extended_family |= self._relatives(relation, person, biological)
+        return extended_family - {person}
+
+    def _extended_family(self, person, biological):
+        """Return this person's extended family, which (unless considering biological family only)
+        includes their spouses' extended families.
+        """
+        extended_family = set(self._relatives('blood_extended_family', person, biological))
+        if not biological:
+            for spouse in self.spouses.get(person, ()):
+                extended_family |= self._relatives('blood_extended_family', spouse, biological)
+        return extended_family - {person}
+
+
+# Relations that are found anew whenever they're queried rather than memoized, since they're queried
+# rarely (at most once per birth) and are unbounded: a birth would add the newborn to the memoized
+# descendants of arbitrarily many people
+UNMEMOIZED_RELATIONS = {'ancestors', 'descendants'}
+
+# The attributes of people that are kinship queries on a Genealogy, mapped to the relations they query and
+# whether they consider biological (rather than legal) parentage
+KINSHIP_ATTRIBUTES = {
+    'ancestors': ('ancestors', True),
+    'descendants': ('descendants', True),
+    'immediate_family': ('immediate_family', False),
+    'extended_family': ('extended_family', False),
+    'greatgrandparents': ('greatgrandparents', False),
+    'grandparents': ('grandparents', False),
+    'aunts': ('aunts', False),
+    'uncles': ('uncles', False),
+    'siblings': ('siblings', False),
+    'full_siblings': ('full_siblings', False),
+    'half_siblings': ('half_siblings', False),
+    'brothers': ('brothers', False),
+    'full_brothers': ('full_brothers', False),
+    'half_brothers': ('half_brothers', False),
+    'sisters': ('sisters', False),
+    'full_sisters': ('full_sisters', False),
+    'half_sisters': ('half_sisters', False),
+    'cousins': ('cousins', False),
+    'kids': ('kids', False),
+    'sons': ('sons', False),
+    'daughters': ('daughters', False),
+    'nephews': ('nephews', False),
+    'nieces': ('nieces', False),
+    'grandchildren': ('grandchildren', False),
+    'grandsons': ('grandsons', False),
+    'granddaughters': ('granddaughters', False),
+    'greatgrandchildren': ('greatgrandchildren', False),
+    'greatgrandsons': ('greatgrandsons', False),
+    'greatgranddaughters': ('greatgranddaughters', False),
+    'bio_parents': ('parents', True),
+    'bio_grandparents': ('grandparents', True),
+    'bio_siblings': ('siblings', True),
+    'bio_full_siblings': ('full_siblings', True),
+    'bio_half_siblings': ('half_siblings', True),
+    'bio_brothers': ('brothers', True),
+    'bio_full_brothers': ('full_brothers', True),
+    'bio_half_brothers': ('half_brothers', True),
+    'bio_sisters': ('sisters', True),
+    'bio_full_sisters': ('full_sisters', True),
+    'bio_half_sisters': ('half_sisters', True),
+    'bio_immediate_family': ('immediate_family', True),
+    'bio_greatgrandparents': ('greatgrandparents', True),
+    'bio_uncles': ('uncles', True),
+    'bio_aunts': ('aunts', True),
+    'bio_cousins': ('cousins', True),
+    'bio_nephews': ('nephews', True),
+    'bio_nieces': ('nieces', True),
+    'bio_ancestors': ('ancestors', True),
+    'bio_extended_family': ('extended_family', True),
+}
+
+
+class Kin(object):
+    """A descriptor for a person's attribute that is a kinship query on their simulation's Genealogy."""
+
+    def __init__(self, attribute):
+        """Initialize a Kin object."""
+        self.attribute = attribute
+        self.relation, self.biological = KINSHIP_ATTRIBUTES[attribute]
+
+    def __get__(self, person, person_class):
+        """Return the (memoized) set of the given person's kin of this kind, which must not be modified."""
+        if person is None:
+            return self
+        genealogy = person.sim.genealogy
+        # Skip past Genealogy._relatives() when the set is already memoized, since some of these
+        # attributes are read in the simulation's hottest loops
+        try:
+            return genealogy.memo[self.biological][person][self.relation]
+        except KeyError:
+            return genealogy._relatives(relation=self.relation, person=person, biological=self.biological)
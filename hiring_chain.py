@@ -0,0 +1,123 @@
+class HiringChain(object):
+    """A chain of hirings set off by a single hiring or termination.
+
+    When a company hires someone who already has a job, that person's former position goes vacant
+    and must be filled, which may require hiring someone else away from their job, and so forth.
+    Instead of each hiring recursively setting off the next one, the vacancies that open up along
+    the way are posted to the town's job market and filled in turn by JobMarket.complete_hiring_chain(),
+    and this object tallies what happened along the way.
+    """
+
+    def __init__(self, company, reason):
+        """Initialize a HiringChain object.
+
+        @param company: The company whose hiring or termination set off this chain.
+        @param reason: The reason for the termination that set off this chain (e.g., a Death), or
+                       None if it was set off by a hiring.
+        """
+        self.company = company
+        self.reason = reason
+        self.hires = 0
+        # The number of people scored as candidates for each hiring in this chain that involved scoring
+        # candidates (which hirings of apprentices and of preselected candidates do not)
+        self.candidates_scored = []
+        # The number of people generated from outside the town (PersonExNihilo) to fill positions in this chain
+        self.imports = 0
+
+
+class HiringStats(object):
+    """Statistics about all the hiring chains that have played out over the course of a simulation.
+
+    These are meant to reveal hiring storms, i.e., long chains of hirings that may import many
+    people into the town, and the businesses that set them off.
+    """
+
+    def __init__(self):
+        """Initialize a HiringStats object."""
+        self.chains = 0
+        self.hires = 0
+        self.imports = 0
+        # Histograms, as dictionaries mapping values to the number of times they occurred
+        self.chain_lengths = {}
+        self.candidates_scored_per_hire = {}
+        self.imports_per_chain = {}
+        # Maps companies to [number of chains they set off, total hires in them, total imports in
+        # them, length of the longest one] lists
+        self.companies = {}
+        # Maps the kinds of reasons that set off chains (e.g., 'Death') to the number of chains they set off
+        self.reasons = {}
+        self.longest_chain = None
+
+    def record(self, chain):
+        """Record a completed hiring chain."""
+        if not chain.hires:
+            # No vacancy actually needed filling (e.g., the company went out of business)
+            return
+        self.chains += 1
+        self.hires += chain.hires
+        self.imports += chain.imports
+        self.chain_lengths[chain.hires] = self.chain_lengths.get(chain.hires, 0) + 1
+        for n_candidates in chain.candidates_scored:
+            self.candidates_scored_per_hire[n_candidates] = self.candidates_scored_per_hire.get(n_candidates, 0) + 1
+        self.imports_per_chain[chain.imports] = self.imports_per_chain.get(chain.imports, 0) + 1
+        try:
+            company_stats = self.companies[chain.company]
+        except KeyError:
+            company_stats = self.companies[chain.company] = [0, 0, 0, 0]
+        company_stats[0] += 1
+        company_stats[1] += chain.hires
+        company_stats[2] += chain.imports
+        company_stats[3] = max(company_stats[3], chain.hires)
+        reason = chain.reason.__class__.__name__ if chain.reason else 'Hiring'
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        if not self.longest_chain or chain.hires > self.longest_chain.hires:
+            self.longest_chain = chain
+
+    def storms(self, n=10):
+        """Return the n companies whose chains have entailed the most hirings, as (company, stats) tuples.
+
+        The stats are [number of chains set off, total hires in them, total imports in them, length
+        of the longest one] lists.
+        """
+        return sorted(self.companies.iteritems(), key=lambda (company, stats): (-stats[1], company.id))[:n]
+
+    def report(self, n=10):
+        """Return a printable summary of these statistics."""
+        lines = ["{} hiring chains, entailing {} hires and {} people imported from outside the town".format(
+            self.chains, self.hires, self.imports
+        )]
+        lines.append("Chain length:  {}".format(self._format_histogram(self.chain_lengths)))
+        lines.append("Imports per chain:  {}".format(self._format_histogram(self.imports_per_chain)))
+        lines.append("Candidates scored per hire:  {}".format(
+            self._format_histogram(self._binned(self.candidates_scored_per_hire))
+        ))
+        lines.append("Chains set off by:  {}".format(
+            ', '.join('{} {}'.format(reason, count) for reason, count in sorted(self.reasons.iteritems()))
+        ))
+        lines.append("Businesses setting off the most hirings (chains, hires, imports, longest chain):")
+        for company, (chains, hires, imports, longest) in self.storms(n=n):
+            lines.append("\t{} ({}):  {}, {}, {}, {}".format(
+                company.name, company.__class__.__name__, chains, hires, imports, longest
+            ))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _binned(histogram):
+        """Return a version of a histogram whose values are binned into ranges of powers of two."""
+        binned = {}
+        for value, count in histogram.iteritems():
+            lower_bound = 1
+            while lower_bound * 2 <= value:
+                lower_bound *= 2
+            bin_label = value if value < 2 else (lower_bound, lower_bound * 2 - 1)
+            binned[bin_label] = binned.get(bin_label, 0) + count
+        return binned
+
+    @staticmethod
+    def _format_histogram(histogram):
+        """Return a string representation of a histogram."""
+        entries = []
+        for value, count in sorted(histogram.iteritems()):
+            label = '{}-{}'.format(*value) if isinstance(value, tuple) else str(value)
+            entries.append('{}: {}'.format(label, count))
+        return ', '.join(entries)
@@ -0,0 +1,168 @@
+from hiring_chain import HiringChain
+
+
+class JobMarket(object):
+    """An index of the people in a town who may be candidates for job openings there.
+
+    Business._assemble_job_candidates() used to check every employee of every company in town,
+    as well as every unemployed resident, for whether they were qualified for a position. Instead,
+    the town's job market keeps these people bucketed by the things that qualification depends on,
+    namely their current job level, whether they are a college graduate, and their sex, so that
+    assembling candidates only touches the buckets of people who may be qualified.
+
+    The index is kept up to date by calls to update() whenever any of these things changes for
+    someone, or when they start or stop being a candidate at all (i.e., upon hirings, terminations,
+    graduations, birthdays on which people enter the workforce, and people moving into or leaving
+    the town).
+
+    The job market also carries out hiring chains: vacancies that open up during a chain are posted
+    here and filled one after another, rather than by each hiring recursively setting off the next.
+    """
+
+    def __init__(self, town):
+        """Initialize a JobMarket object."""
+        self.town = town
+        # Maps (job level, male, college graduate) tuples to the sets of people with those
+        # attributes who are candidates for job openings; the job level of someone who doesn't
+        # currently have an occupation is 0
+        self.buckets = {}
+        self.standing = {}  # Maps people in the index to their current buckets' keys
+        # Unemployed residents who are in the workforce but not retired (see Town.unemployed)
+        self.unemployed = set()
+        # The hiring chain in progress, if any, and the vacancies that have opened up during it
+        # that have yet to be filled, as (company, occupation class, shift, former occupation) tuples
+        self.chain = None
+        self.vacancies = []
+
+    def update(self, person):
+        """Update this person's standing on the job market."""
+        town = self.town
+        # People are candidates if they work for a company in town (even if they are momentarily
+        # between their former occupation and one they're being hired to) or if they are unemployed
+        # residents who are in the workforce and not retired
+        unemployed = (
+            not person.occupation and not person.retired and person.in_the_workforce and person in town.residents
+        )
+        employed = any(o for o in person.occupations if o.terminus is None and o.company.town is town)
+        if unemployed:
+            self.unemployed.add(person)
+        else:
+            self.unemployed.discard(person)
+        old_key = self.standing.get(person)
+        if employed or unemployed:
+            new_key = (person.occupation.level if person.occupation else 0, person.male, person.college_graduate)
+        else:
+            new_key = None
+        if new_key != old_key:
+            if old_key:
+                self.buckets[old_key].discard(person)
+                del self.standing[person]
+            if new_key:
+                self.buckets.setdefault(new_key, set()).add(person)
+                self.standing[person] = new_key
+
+    def count_employee_in_families(self, company, employee, change):
+        """Adjust a company's counts of its personnel in people's families for an employee joining or leaving it."""
+        # Immediate families are symmetric, but extended families aren't (see
+        # Genealogy.people_whose_extended_families_include())
+        for counts, people in (
+            (company.personnel_in_immediate_families, employee.immediate_family),
+            (
+                company.personnel_in_extended_families,
+                employee.sim.genealogy.people_whose_extended_families_include(employee)
+            ),
+        ):
+            for person in people:
+                self._tally(counts, person, change)
+
+    def count_personnel_in_families(self, people, change):
+        """Adjust every company's counts of its personnel in the families of the given people.
+
+        This is called with a change of 1 for a newborn, and with changes of -1 and 1 for the people
+        whose families a marriage or divorce changes, before and after that change is made.
+        """
+        for person in people:
+            for counts_attribute, relatives in (
+                ('personnel_in_immediate_families', person.immediate_family),
+                ('personnel_in_extended_families', person.extended_family),
+            ):
+                for relative in relatives:
+                    for company in {o.company for o in relative.occupations if o.terminus is None}:
+                        self._tally(getattr(company, counts_attribute), person, change)
+
+    @staticmethod
+    def _tally(counts, person, change):
+        """Adjust a count of a person in a dictionary of counts, dropping people whose counts fall to zero."""
+        count = counts.get(person, 0) + change
+        if count:
+            counts[person] = count
+        else:
+            del counts[person]
+
+    def candidates(self, occupation_of_need):
+        """Return the set of people who are qualified for a job opening in the given occupation.
+
+        This returns exactly the people who Business.check_if_person_is_qualified_for_the_position()
+        would deem qualified, among those who work in this town or are unemployed residents.
+        """
+        config = self.town.sim.config
+        level_of_this_position = config.job_levels[occupation_of_need]
+        college_degree_required = occupation_of_need in config.occupations_requiring_college_degree
+        is_employable = config.employable_as_a[occupation_of_need]
+        only_sex_and_year_matter = (
+            occupation_of_need in config.occupations_whose_preconditions_depend_only_on_sex_and_year
+        )
+        candidates = set()
+        for (job_level, male, college_graduate), people in self.buckets.iteritems():
+            if not people:
+                continue
+            # People may not take jobs at the same level or lower than the ones they have now
+            if job_level and job_level >= level_of_this_position:
+                continue
+            if college_degree_required and not college_graduate:
+                continue
+            if only_sex_and_year_matter:
+                # Everyone in this bucket is the same sex, so check the preconditions for just one of them
+                if not is_employable(applicant=next(iter(people))):
+                    continue
+                people_meeting_preconditions = people
+            else:
+                people_meeting_preconditions = (person for person in people if is_employable(applicant=person))
+            if job_level:
+                # Make sure they have been at their current job for at least a year
+                candidates.update(
+                    person for person in people_meeting_preconditions if person.occupation.years_experience >= 1
+                )
+            else:
+                candidates.update(people_meeting_preconditions)
+        return candidates
+
+    def start_hiring_chain(self, company, reason):
+        """Start a hiring chain, unless one is already in progress, and return whether one was started.
+
+        Whoever starts a chain must call complete_hiring_chain() once they are done with their own
+        hiring or termination; a hiring or termination that happens while a chain is already in
+        progress is simply a link in that chain.
+
+        @param company: The company whose hiring or termination is setting off the chain.
+        @param reason: The reason for the termination that is setting off the chain, or None if
+                       it is being set off by a hiring.
+        """
+        if self.chain:
+            return False
+        self.chain = HiringChain(company=company, reason=reason)
+        return True
+
+    def post_vacancy(self, company, occupation_of_need, shift, to_replace):
+        """Post a vacancy that has opened up during the hiring chain in progress."""
+        self.vacancies.append((company, occupation_of_need, shift, to_replace))
+
+    def complete_hiring_chain(self):
+        """Fill vacancies until the hiring chain in progress has played out, and then record it."""
+        vacancies = self.vacancies
+        while vacancies:
+            company, occupation_of_need, shift, to_replace = vacancies.pop()
+            if not company.out_of_business:
+                company.hire(occupation_of_need=occupation_of_need, shift=shift, to_replace=to_replace)
+        self.town.sim.hiring_stats.record(chain=self.chain)
+        self.chain = None
@@ -340,8 +340,7 @@ class BusinessClosure(Event):
         business.closed = self.year
         for employee in list(business.employees):
             LayOff(subject=employee.person, company=business, occupation=employee)
-        self.town.companies.remove(business)
-        self.town.former_companies.add(business)
+        self.town.remove_company(business)
         # Demolish the building -- TODO reify buildings separately from companies
         if self.town.businesses_of_type('ConstructionFirm'):
             demolition_company = random.choice(self.town.businesses_of_type('ConstructionFirm'))
@@ -373,6 +372,7 @@ class Death(Event):
         self.next_of_kin = subject.next_of_kin
         subject.town.residents.remove(subject)
         subject.town.deceased.add(subject)
+        subject.town.job_market.update(person=subject)
         self._update_attributes_of_deceased_and_spouse()  # Must come before self.subject.go_to()
         self._vacate_job_position_of_the_deceased()
         if mortician:
@@ -393,6 +393,7 @@ class Death(Event):
         # Update attributes of this person's home
         subject.home.residents.remove(subject)
         subject.home.former_residents.add(subject)
+        subject.town.update_vacancy_of_home(home=subject.home)
         if subject in subject.home.owners:
             subject.home.owners.remove(subject)
             if subject.home.residents and not subject.home.owners:
@@ -409,6 +410,7 @@ class Death(Event):
     def _update_attributes_of_deceased_and_spouse(self):
         config = self.subject.sim.config
         self.subject.alive = False
+        self.subject.sim.relation_cache.forget_kinship()
         if self.subject.marriage:
             self.widow = widow = self.subject.spouse
             widow.marriage.terminus = self
@@ -451,16 +453,19 @@ class Demolition(Event):
         building.demolition = self
         building.lot.building = None
         building.lot.former_buildings.append(building)
+        self.town.update_vacancy_of_lot(lot=building.lot)
         # If this is a dwelling place, have its now-displaced residents find new housing
         if building.__class__.__name__ is 'House':
             self.town.dwelling_places.remove(building)
             self.town.former_dwelling_places.add(building)
+            self.town.update_vacancy_of_home(home=building)
             if building.residents:
                 self._have_the_now_displaced_residents_move(house_or_apartment_unit=building)
         if building.__class__.__name__ is 'ApartmentComplex':
             for unit in building.units:
                 self.town.dwelling_places.remove(unit)
                 self.town.former_dwelling_places.add(unit)
+                self.town.update_vacancy_of_home(home=unit)
                 if unit.residents:
                     self._have_the_now_displaced_residents_move(house_or_apartment_unit=unit)
 
@@ -497,11 +502,13 @@ class Departure(Event):
         self.subject = subject
         subject.town.residents.remove(subject)
         subject.town.departed.add(subject)
+        subject.town.job_market.update(person=subject)
         subject.departure = self
         self._vacate_job_position_of_the_departed()
         self.subject.go_to(destination=None)
         self.subject.home.residents.remove(self.subject)
         self.subject.home.former_residents.add(self.subject)
+        self.subject.town.update_vacancy_of_home(home=self.subject.home)
         # Update .neighbor attributes for subject and for their now former neighbors
         self._update_neighbor_attributes()
 
@@ -530,6 +537,7 @@ class Departure(Event):
             )
         # Set the departed's .neighbors attribute to the empty set
         self.subject.neighbors = set()
+        subject.sim.relation_cache.forget_social_ties()
 
     def __str__(self):
         """Return string representation."""
@@ -585,17 +593,15 @@ class Divorce(Event):
         spouse2.significant_other = None
         spouse1.divorces.append(self)
         spouse2.divorces.append(self)
-        spouse1.immediate_family.remove(spouse2)
-        spouse2.immediate_family.remove(spouse1)
-        # Revert each back to their own extended families
-        spouse1.extended_family = (
-            spouse1.greatgrandparents | spouse1.immediate_family | spouse1.uncles | spouse1.aunts |
-            spouse1.cousins | spouse1.nieces | spouse1.nephews
-        )
-        spouse2.extended_family = (
-            spouse2.greatgrandparents | spouse2.immediate_family | spouse2.uncles | spouse2.aunts |
-            spouse2.cousins | spouse2.nieces | spouse2.nephews
-        )
+        # This reverts each back to their own immediate and extended families
+        genealogy, job_market = spouse1.sim.genealogy, spouse1.sim.town.job_market
+        people_whose_families_change = genealogy.people_whose_families_change_with_marriage(spouse1, spouse2)
+        job_market.count_personnel_in_families(people=people_whose_families_change, change=-1)
+        genealogy.remove_marriage(spouse1, spouse2)
+        job_market.count_personnel_in_families(people=people_whose_families_change, change=1)
+        spouse1.sim.relation_cache.forget_kinship()
+        spouse1.contractor_scores.clear()
+        spouse2.contractor_scores.clear()
         self._have_divorcees_fall_out_of_love(divorcees=self.subjects, config=config)
         # Update salience values
         salience_change = (
@@ -613,10 +619,6 @@ class Divorce(Event):
             spouse1.relationships[spouse2].raw_spark = (
                 config.new_raw_spark_value_for_divorcee_who_has_fallen_out_of_love
             )
-            spouse1.relationships[spouse2].spark = config.function_to_normalize_raw_spark(
-                n_simulated_timesteps=spouse1.sim.n_simulated_timesteps,
-                raw_spark=spouse1.relationships[spouse2].raw_spark
-            )
             if spouse2 is spouse1.love_interest:
                 new_love_interest = max(spouse1.relationships, key=lambda r: spouse1.relationships[r].spark)
                 if spouse1.relationships[new_love_interest] > 0:
@@ -626,10 +628,6 @@ class Divorce(Event):
             spouse2.relationships[spouse1].raw_spark = (
                 config.new_raw_spark_value_for_divorcee_who_has_fallen_out_of_love
             )
-            spouse2.relationships[spouse1].spark = config.function_to_normalize_raw_spark(
-                n_simulated_timesteps=spouse2.sim.n_simulated_timesteps,
-                raw_spark=spouse2.relationships[spouse1].raw_spark
-            )
             if spouse1 is spouse2.love_interest:
                 new_love_interest = max(spouse2.relationships, key=lambda r: spouse2.relationships[r].spark)
                 if spouse2.relationships[new_love_interest] > 0:
@@ -890,10 +888,15 @@ class Marriage(Event):
         spouse2.spouse = spouse1
         spouse1.significant_other = spouse2
         spouse2.significant_other = spouse1
-        spouse1.immediate_family.add(spouse2)
-        spouse2.immediate_family.add(spouse1)
-        spouse1.extended_family |= spouse2.extended_family  # TODO THIS IS NOT TOTALLY ACCURATE
-        spouse2.extended_family |= spouse1.extended_family
+        # This adds each to the other's immediate family, and each's extended family to the other's
+        genealogy, job_market = spouse1.sim.genealogy, spouse1.sim.town.job_market
+        people_whose_families_change = genealogy.people_whose_families_change_with_marriage(spouse1, spouse2)
+        job_market.count_personnel_in_families(people=people_whose_families_change, change=-1)
+        genealogy.add_marriage(spouse1, spouse2)
+        job_market.count_personnel_in_families(people=people_whose_families_change, change=1)
+        spouse1.sim.relation_cache.forget_kinship()
+        spouse1.contractor_scores.clear()
+        spouse2.contractor_scores.clear()
         self._cease_grieving_of_former_spouses(newlyweds=self.subjects)
         # Update salience values
         salience_change = (
@@ -1025,13 +1028,16 @@ class Move(Event):
             if person.home:
                 person.home.residents.remove(person)
                 person.home.former_residents.add(person)
+                person.sim.town.update_vacancy_of_home(home=person.home)
             # Move into new home
             person.home = new_home
             new_home.residents.add(person)
+            person.sim.town.update_vacancy_of_home(home=new_home)
             person.moves.append(self)
             # Add yourself to town residents, if you moved from outside the town
             person.town = person.sim.town
             person.sim.town.residents.add(person)
+            person.town.job_market.update(person=person)
             # Go to your new home
             person.go_to(destination=new_home, occasion='home')
         # Update .neighbor attributes for subjects, as well as their new and now former neighbors
@@ -1092,6 +1098,7 @@ class Move(Event):
                 mover.update_salience_of(entity=new_neighbor, change=salience_change_for_new_neighbor)
                 new_neighbor.neighbors.add(mover)
                 new_neighbor.update_salience_of(entity=mover, change=salience_change_for_new_neighbor)
+        self.subjects[0].sim.relation_cache.forget_social_ties()
 
     def __str__(self):
         """Return string representation."""
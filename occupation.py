@@ -16,12 +16,15 @@ class Occupation(object):
         self.company = company
         self.shift = shift
         self.company.employees.add(self)
+        self.company.add_to_personnel(person)
+        self.company.town.occupations_of_type.setdefault(self.__class__, set()).add(self)
         self.start_date = person.sim.year
         self.hiring = None  # event.Hiring object holding data about the hiring; gets set by that object's __init__()
         self.end_date = None  # Changed by self.terminate
         self.terminus = None  # Changed by self.terminate
         self.preceded_by = None  # Employee that preceded this one in its occupation -- gets set by Business.hire()
         self.succeeded_by = None  # Employee that succeeded this one in its occupation -- gets set by Business.hire()
+        self.company.town.job_market.update(person=person)
         self.supplemental = False  # Whether this position must be immediately refilled if terminated -- Business.hire()
         self.hired_as_favor = False  # Whether this position must ever be refilled if terminated -- Business.hire()
         self.vocation = self._init_generate_vocation_string()
@@ -34,6 +37,7 @@ class Occupation(object):
         person.coworkers = {employee.person for employee in self.company.employees} - {person}
         for coworker in person.coworkers:
             coworker.coworkers.add(person)
+        person.sim.relation_cache.forget_social_ties()
         # Update relevant salience values for this person and their new coworkers
         salience_change_for_new_coworker = (
             self.person.sim.config.salience_increment_from_relationship_change['coworker']
@@ -46,8 +50,7 @@ class Occupation(object):
         boost_in_salience_for_this_job_level = self.person.sim.config.salience_job_level_boost(
             job_level=self.level
         )
-        for resident in company.town.residents:
-            resident.update_salience_of(entity=self.person, change=boost_in_salience_for_this_job_level)
+        self.person.job_level_salience += boost_in_salience_for_this_job_level
         # Update all relationships this person has to reflect the new job-level difference
         # between this person and the respective other person
         for other_person in self.person.relationships:
@@ -94,7 +97,12 @@ class Occupation(object):
         self.end_date = self.person.sim.year
         self.terminus = reason
         self.company.employees.remove(self)
+        # This person may momentarily hold another position at this company (i.e., if this is an
+        # in-house promotion), in which case they remain among its personnel
+        if not any(employee.person is self.person for employee in self.company.employees):
+            self.company.remove_from_personnel(self.person)
         self.company.former_employees.add(self)
+        self.company.town.occupations_of_type[self.__class__].remove(self)
         if self is self.company.owner:
             self.company.former_owners.append(self)
         # If this isn't an in-house promotion, update a bunch of attributes
@@ -103,6 +111,7 @@ class Occupation(object):
             # Update the .coworkers attribute of the person's now former coworkers
             for employee in self.company.employees:
                 employee.person.coworkers.remove(self.person)
+            self.person.sim.relation_cache.forget_social_ties()
             # Update the .former_coworkers attribute of everyone involved to reflect this change
             for employee in self.company.employees:
                 self.person.former_coworkers.add(employee.person)
@@ -133,11 +142,19 @@ class Occupation(object):
         if not self.company.out_of_business:
             position_that_is_now_vacant = self.__class__
             if not self.supplemental:
-                self.company.hire(
-                    occupation_of_need=position_that_is_now_vacant, shift=self.shift, to_replace=self
+                # If this termination isn't itself part of a hiring chain, it sets one off; otherwise,
+                # the vacancy will be filled once the hiring that this termination is part of is done
+                job_market = self.company.town.job_market
+                starts_hiring_chain = job_market.start_hiring_chain(company=self.company, reason=reason)
+                job_market.post_vacancy(
+                    company=self.company, occupation_of_need=position_that_is_now_vacant, shift=self.shift,
+                    to_replace=self
                 )
+                if starts_hiring_chain:
+                    job_market.complete_hiring_chain()
             elif not self.hired_as_favor:
                 self.company.supplemental_vacancies[self.shift].append(position_that_is_now_vacant)
+                self.company.town.update_supplemental_vacancies(company=self.company, shift=self.shift)
         # If the person hasn't already been hired to a new position, set their occupation
         # attribute to None
         if self.person.occupation is self:
@@ -145,17 +162,17 @@ class Occupation(object):
         # If this person is retiring, set their .coworkers to the empty set
         if reason.__class__.__name__ == "Retirement":
             self.person.coworkers = set()
+            self.person.sim.relation_cache.forget_social_ties()
         else:
             # If they're not retiring, decrement their salience to everyone else
             # commensurate to the job level of this position
             change_in_salience_for_this_job_level = self.person.sim.config.salience_job_level_boost(
                 job_level=self.level
             )
-            for resident in self.company.town.residents:
-                # Note the minus sign here
-                resident.update_salience_of(
-                    entity=self.person, change=-change_in_salience_for_this_job_level
-                )
+            self.person.job_level_salience = max(
+                0.0, self.person.job_level_salience - change_in_salience_for_this_job_level
+            )
+        self.company.town.job_market.update(person=self.person)
         # Finally, if this was a Lawyer position, have the law firm rename itself to
         # no longer include this person's name
         if self.__class__ is Lawyer:
@@ -1,5 +1,7 @@
 import random
 import heapq
+import operator
+import itertools
 from corpora import Names
 import life_event
 from name import Name
@@ -10,12 +12,32 @@ from mind import Mind
 from routine import Routine
 from whereabouts import Whereabouts
 from relationship import Acquaintance
+from utils import sample_geometric
+from genealogy import KINSHIP_ATTRIBUTES, Kin
 import face
 
 
 class Person(object):
     """A person living in a procedurally generated American small town."""
 
+    # People are numerous and long-lived (even the dead and departed remain referenced), so their
+    # attributes are kept in slots, rather than in a dictionary for each person
+    __slots__ = (
+        'sim', 'id', 'type', 'birth', 'town', 'biological_mother', 'mother', 'biological_father', 'father',
+        'parents', 'birth_year', 'birthday', 'age', 'adult', 'in_the_workforce', 'male', 'female', 'tag', 'alive',
+        'death_year', 'gravestone', 'home', 'infertile', 'attracted_to_men', 'attracted_to_women', 'face',
+        'personality', 'mind', 'routine', 'whereabouts', 'first_name', 'middle_name', 'last_name', 'suffix',
+        'maiden_name', 'named_for', 'spouse', 'widowed', 'relationships', 'sexual_partners', 'acquaintances',
+        'friends', 'enemies', 'neighbors', 'former_neighbors', 'coworkers', 'former_coworkers', 'best_friend',
+        'worst_enemy', 'love_interest', 'significant_other', 'charge_of_best_friend', 'charge_of_worst_enemy',
+        'spark_of_love_interest', 'talked_to_this_year', 'befriended_this_year', 'salience_of_other_people',
+        'job_level_salience', 'pregnant', 'impregnated_by', 'conception_year', 'conception_date', 'due_date',
+        'adoption', 'marriage', 'marriages', 'divorces', 'adoptions', 'moves', 'lay_offs', 'name_changes',
+        'building_commissions', 'home_purchases', 'retirement', 'departure', 'death', 'money', 'occupation',
+        'occupations', 'former_contractors', 'contractor_scores', 'retired', 'college_graduate', 'grieving',
+        'chance_of_remarrying', 'location', 'all_belief_facets', 'wedding_ring_on_finger', 'player',
+    )
+
     def __init__(self, sim, birth):
         """Initialize a Person object."""
         # Set location and sim instance
@@ -85,57 +107,9 @@ class Person(object):
         self.suffix = None
         self.maiden_name = None
         self.named_for = (None, None)  # From whom first and middle name originate, respectively
-        # Prepare familial attributes that get populated by self.init_familial_attributes()
-        self.ancestors = set()  # Biological only
-        self.descendants = set()  # Biological only
-        self.immediate_family = set()
-        self.extended_family = set()
-        self.greatgrandparents = set()
-        self.grandparents = set()
-        self.aunts = set()
-        self.uncles = set()
-        self.siblings = set()
-        self.full_siblings = set()
-        self.half_siblings = set()
-        self.brothers = set()
-        self.full_brothers = set()
-        self.half_brothers = set()
-        self.sisters = set()
-        self.full_sisters = set()
-        self.half_sisters = set()
-        self.cousins = set()
-        self.kids = set()
-        self.sons = set()
-        self.daughters = set()
-        self.nephews = set()
-        self.nieces = set()
-        self.grandchildren = set()
-        self.grandsons = set()
-        self.granddaughters = set()
-        self.greatgrandchildren = set()
-        self.greatgrandsons = set()
-        self.greatgranddaughters = set()
-        self.bio_parents = set()
-        self.bio_grandparents = set()
-        self.bio_siblings = set()
-        self.bio_full_siblings = set()
-        self.bio_half_siblings = set()
-        self.bio_brothers = set()
-        self.bio_full_brothers = set()
-        self.bio_half_brothers = set()
-        self.bio_sisters = set()
-        self.bio_full_sisters = set()
-        self.bio_half_sisters = set()
-        self.bio_immediate_family = set()
-        self.bio_greatgrandparents = set()
-        self.bio_uncles = set()
-        self.bio_aunts = set()
-        self.bio_cousins = set()
-        self.bio_nephews = set()
-        self.bio_nieces = set()
-        self.bio_ancestors = set()
-        self.bio_extended_family = set()
-        # Set familial attributes; update those of family members
+        # Note: family members other than parents (e.g., self.cousins) aren't attributes stored on this
+        # person, but are rather derived from the sim's genealogy as they are read (see genealogy.py)
+        # Add this person to the genealogy, and have their family members take note of them
         self._init_familial_attributes()
         self._init_update_familial_attributes_of_family_members()
         # Prepare attributes representing this person's romantic relationships
@@ -160,7 +134,11 @@ class Person(object):
         self.spark_of_love_interest = 0.0
         self.talked_to_this_year = set()
         self.befriended_this_year = set()
-        self.salience_of_other_people = {}  # Maps potentially every other person to their salience to this person
+        # Salience of other people to this person is the sum of a sparse, per-person term (due to family,
+        # neighbors, coworkers, interactions, and so forth) and the other person's town-wide salience due
+        # to their job level; see Person.salience_of()
+        self.salience_of_other_people = {}  # Maps people to the per-person term of their salience to this person
+        self.job_level_salience = 0.0  # This person's salience to everyone in town due to their job level
         self._init_salience_values()
         # Prepare attributes pertaining to pregnancy
         self.pregnant = False
@@ -187,6 +165,9 @@ class Person(object):
         self.occupation = None
         self.occupations = []
         self.former_contractors = set()
+        # Maps potential contractors to this person's preference, for social reasons, to contract
+        # them; this gets cleared whenever this person's family or social sets change
+        self.contractor_scores = {}
         self.retired = False
         # Prepare attributes pertaining to education
         self.college_graduate = False
@@ -259,146 +240,25 @@ class Person(object):
         return attracted_to_men, attracted_to_women
 
     def _init_familial_attributes(self):
-        """Populate lists representing this person's family members."""
-        self._init_immediate_family()
-        self._init_biological_immediate_family()
-        self._init_extended_family()
-        self._init_biological_extended_family()
-
-    def _init_immediate_family(self):
-        """Populate lists representing this person's (legal) immediate family."""
-        self.grandparents = self.father.parents | self.mother.parents
-        self.siblings = self.father.kids | self.mother.kids
-        self.full_siblings = self.father.kids & self.mother.kids
-        self.half_siblings = self.father.kids ^ self.mother.kids
-        self.brothers = self.father.sons | self.mother.sons
-        self.full_brothers = self.father.sons & self.mother.sons
-        self.half_brothers = self.father.sons ^ self.mother.sons
-        self.sisters = self.father.daughters | self.mother.daughters
-        self.full_sisters = self.father.daughters & self.mother.daughters
-        self.half_sisters = self.father.daughters ^ self.mother.daughters
-        self.immediate_family = self.grandparents | self.parents | self.siblings
-
-    def _init_biological_immediate_family(self):
-        """Populate lists representing this person's immediate."""
-        self.bio_parents = {self.biological_mother, self.biological_father}
-        self.bio_grandparents = self.biological_father.parents | self.biological_mother.parents
-        self.bio_siblings = self.biological_father.kids | self.biological_mother.kids
-        self.bio_full_siblings = self.biological_father.kids & self.biological_mother.kids
-        self.bio_half_siblings = self.biological_father.kids ^ self.biological_mother.kids
-        self.bio_brothers = self.biological_father.sons | self.biological_mother.sons
-        self.bio_full_brothers = self.biological_father.sons & self.biological_mother.sons
-        self.bio_half_brothers = self.biological_father.sons ^ self.biological_mother.sons
-        self.bio_sisters = self.biological_father.daughters | self.biological_mother.daughters
-        self.bio_full_sisters = self.biological_father.daughters & self.biological_mother.daughters
-        self.bio_half_sisters = self.biological_father.daughters ^ self.biological_mother.daughters
-        self.bio_immediate_family = self.bio_grandparents | self.bio_parents | self.bio_siblings
-
-    def _init_extended_family(self):
-        """Populate lists representing this person's (legal) extended family."""
-        self.greatgrandparents = self.father.grandparents | self.mother.grandparents
-        self.uncles = self.father.brothers | self.mother.brothers
-        self.aunts = self.father.sisters | self.mother.sisters
-        self.cousins = self.father.nieces | self.father.nephews | self.mother.nieces | self.mother.nephews
-        self.nephews = self.father.grandsons | self.mother.grandsons
-        self.nieces = self.father.granddaughters | self.mother.granddaughters
-        self.ancestors = self.father.ancestors | self.mother.ancestors | self.parents
-        self.extended_family = (
-            self.greatgrandparents | self.immediate_family | self.uncles | self.aunts |
-            self.cousins | self.nieces | self.nephews
-        )
-
-    def _init_biological_extended_family(self):
-        """Populate lists representing this person's (legal) extended family."""
-        self.bio_greatgrandparents = self.father.grandparents | self.mother.grandparents
-        self.bio_uncles = self.father.brothers | self.mother.brothers
-        self.bio_aunts = self.father.sisters | self.mother.sisters
-        self.bio_cousins = self.father.nieces | self.father.nephews | self.mother.nieces | self.mother.nephews
-        self.bio_nephews = self.father.grandsons | self.mother.grandsons
-        self.bio_nieces = self.father.granddaughters | self.mother.granddaughters
-        self.bio_ancestors = self.father.ancestors | self.mother.ancestors | self.parents
-        self.bio_extended_family = (
-            self.bio_greatgrandparents | self.bio_immediate_family | self.bio_uncles | self.bio_aunts |
-            self.bio_cousins | self.bio_nieces | self.bio_nephews
-        )
+        """Add this person to the sim's genealogy, from which their family members are derived."""
+        self.sim.genealogy.add_birth(person=self)
+        self.sim.relation_cache.forget_kinship()
 
     def _init_update_familial_attributes_of_family_members(self):
-        """Update familial attributes of myself and family members."""
+        """Have family members take note of this newborn."""
         config = self.sim.config
         for member in self.immediate_family:
-            member.immediate_family.add(self)
+            member.contractor_scores.clear()
             member.update_salience_of(
                 entity=self, change=config.salience_increment_from_relationship_change["immediate family"]
             )
         for member in self.extended_family:
-            member.extended_family.add(self)
+            member.contractor_scores.clear()
             member.update_salience_of(
                 entity=self, change=config.salience_increment_from_relationship_change["extended family"]
             )
-        # Update for gender-specific familial attributes
-        if self.male:
-            for g in self.greatgrandparents:
-                g.greatgrandsons.add(self)
-            for g in self.grandparents:
-                g.grandsons.add(self)
-            for p in self.parents:
-                p.sons.add(self)
-            for u in self.uncles:
-                u.nephews.add(self)
-            for a in self.aunts:
-                a.nephews.add(self)
-            for b in self.full_brothers:
-                b.full_brothers.add(self)
-                b.brothers.add(self)
-            for s in self.full_sisters:
-                s.full_brothers.add(self)
-                s.brothers.add(self)
-            for b in self.half_brothers:
-                b.half_brothers.add(self)
-                b.brothers.add(self)
-            for s in self.half_sisters:
-                s.half_brothers.add(self)
-                s.brothers.add(self)
-        elif self.female:
-            for g in self.greatgrandparents:
-                g.greatgranddaughters.add(self)
-            for g in self.grandparents:
-                g.granddaughters.add(self)
-            for p in self.parents:
-                p.daughters.add(self)
-            for u in self.uncles:
-                u.nieces.add(self)
-            for a in self.aunts:
-                a.nieces.add(self)
-            for b in self.full_brothers:
-                b.full_sisters.add(self)
-                b.sisters.add(self)
-            for s in self.full_sisters:
-                s.full_sisters.add(self)
-                s.sisters.add(self)
-            for b in self.half_brothers:
-                b.half_sisters.add(self)
-                b.sisters.add(self)
-            for s in self.half_sisters:
-                s.half_sisters.add(self)
-                s.sisters.add(self)
-        # Update for non-gender-specific familial attributes
-        for a in self.ancestors:
-            a.descendants.add(self)
-        for g in self.greatgrandparents:
-            g.greatgrandchildren.add(self)
-        for g in self.grandparents:
-            g.grandchildren.add(self)
-        for p in self.parents:
-            p.kids.add(self)
-        for fs in self.full_siblings:
-            fs.siblings.add(self)
-            fs.full_siblings.add(self)
-        for hs in self.half_siblings:
-            hs.siblings.add(self)
-            hs.half_siblings.add(self)
-        for c in self.cousins:
-            c.cousins.add(self)
+        # Have the companies that employ any of them count them as family of their personnel
+        self.sim.town.job_market.count_personnel_in_families(people=(self,), change=1)
 
     def _init_salience_values(self):
         """Determine an initial salience value for every other person associated with this newborn."""
@@ -704,8 +564,12 @@ class Person(object):
     @property
     def is_captivated_by(self):
         """The set of people that this person is romantically captivated by."""
-        spark_threshold_for_being_captivated = self.sim.config.spark_threshold_for_being_captivated
-        return [p for p in self.relationships if self.relationships[p].spark > spark_threshold_for_being_captivated]
+        raw_spark_threshold_for_being_captivated = self.sim.raw_thresholds.spark_above(
+            self.sim.config.spark_threshold_for_being_captivated
+        )
+        return [
+            p for p in self.relationships if self.relationships[p].raw_spark > raw_spark_threshold_for_being_captivated
+        ]
 
     def recount_life_history(self):
         """Print out the major life events in this person's simulated life."""
@@ -836,7 +700,7 @@ class Person(object):
         elif 'whereabouts' in feature_type:
             timestep = feature_type[12:]
             ordinal_date, day_or_night = timestep.split('-')
-            whereabout_object = self.whereabouts.date[(int(ordinal_date), int(day_or_night))]
+            whereabout_object = self.whereabouts.on(int(ordinal_date), int(day_or_night))
             return whereabout_object.location.name
 
     def _common_familial_relation_to_me(self, person):
@@ -847,38 +711,39 @@ class Person(object):
         richer in the number of relations it checks for. Basically, this method
         is meant for quick decision making, and known_relation_to_me for dialogue generation.
         """
-        if person is self.spouse:
-            return 'husband' if person.male else 'wife'
-        if person is self.father:
-            return 'father'
-        elif person is self.mother:
-            return 'mother'
-        elif person in self.brothers:
-            return 'brother'
-        elif person in self.sisters:
-            return 'sister'
-        elif person in self.aunts:
-            return 'aunt'
-        elif person in self.uncles:
-            return 'uncle'
-        elif person in self.sons:
-            return 'son'
-        elif person in self.daughters:
-            return 'daughter'
-        elif person in self.cousins:
-            return 'cousin'
-        elif person in self.nephews:
-            return 'nephew'
-        elif person in self.nieces:
-            return 'niece'
-        elif person in self.greatgrandparents:
-            return 'greatgrandfather' if person.male else 'greatgrandmother'
-        elif person in self.grandparents:
-            return 'grandfather' if person.male else 'grandmother'
-        elif person in self.grandchildren:
-            return 'grandson' if person.male else 'granddaughter'
-        else:
-            return None
+        return self._common_familial_relations_to_me().get(person)
+
+    def _common_familial_relations_to_me(self):
+        """Return a dictionary mapping each of my relatives to their immediate common familial relation to me.
+
+        This classifies all my relatives in a single pass, in the order of precedence that
+        _common_familial_relation_to_me() has always used, and is memoized in the sim's relation
+        cache until someone's family changes.
+        """
+        relation_cache = self.sim.relation_cache
+        try:
+            return relation_cache.familial[self]
+        except KeyError:
+            pass
+        relations = {}
+        classify = relation_cache.classify
+        classify(relations, (self.spouse,), ('husband', 'wife'))
+        classify(relations, (self.father,), 'father')
+        classify(relations, (self.mother,), 'mother')
+        classify(relations, self.brothers, 'brother')
+        classify(relations, self.sisters, 'sister')
+        classify(relations, self.aunts, 'aunt')
+        classify(relations, self.uncles, 'uncle')
+        classify(relations, self.sons, 'son')
+        classify(relations, self.daughters, 'daughter')
+        classify(relations, self.cousins, 'cousin')
+        classify(relations, self.nephews, 'nephew')
+        classify(relations, self.nieces, 'niece')
+        classify(relations, self.greatgrandparents, ('greatgrandfather', 'greatgrandmother'))
+        classify(relations, self.grandparents, ('grandfather', 'grandmother'))
+        classify(relations, self.grandchildren, ('grandson', 'granddaughter'))
+        relation_cache.familial[self] = relations
+        return relations
 
     def relation_to_me(self, person):
         """Return the primary relation of another person to me, if any.
@@ -891,143 +756,157 @@ class Person(object):
         dialogue, it won't return specific relationships like 'first cousin, once removed',
         because everyday people don't know or reference these relationships.
         """
-        if person is self:
-            return 'self'
-        elif person in self.greatgrandparents:
-            return 'greatgrandfather' if person.male else 'greatgrandmother'
-        elif person in self.grandparents:
-            return 'grandfather' if person.male else 'grandmother'
-        elif person is self.father:
-            return 'father'
-        elif person is self.mother:
-            return 'mother'
-        elif person in self.aunts:
-            return 'aunt'
-        elif person in self.uncles:
-            return 'uncle'
-        elif person in self.brothers:
-            return 'brother'
-        elif person in self.sisters:
-            return 'sister'
-        elif person in self.cousins:
-            return 'cousin'
-        elif person in self.sons:
-            return 'son'
-        elif person in self.daughters:
-            return 'daughter'
-        elif person in self.nephews:
-            return 'nephew'
-        elif person in self.nieces:
-            return 'niece'
-        elif person is self.spouse:
-            return 'husband' if person.male else 'wife'
-        elif self.divorces and any(d for d in self.divorces if person in d.subjects):
-            return 'ex-husband' if person.male else 'ex-wife'
-        elif self.widowed and any(m for m in self.marriages if person in m.subjects and m.terminus is person.death):
-            return 'deceased husband' if person.male else 'deceased wife'
-        elif person.spouse in self.siblings or self.spouse in person.siblings:
-            return 'brother in law' if person.male else 'sister in law'
-        elif self.father and any(d for d in self.father.divorces if person in d.subjects):
-            return "father's ex-{}".format('husband' if person.male else 'wife')
-        elif self.mother and any(d for d in self.mother.divorces if person in d.subjects):
-            return "mother's ex-{}".format('husband' if person.male else 'wife')
-        elif any(s for s in self.brothers if any(d for d in s.divorces if person in d.subjects)):
-            return "brother's ex-{}".format('husband' if person.male else 'wife')
-        elif any(s for s in self.sisters if any(d for d in s.divorces if person in d.subjects)):
-            return "sister's ex-{}".format('husband' if person.male else 'wife')
-        elif any(s for s in self.brothers if any(
-                m for m in s.marriages if person in m.subjects and m.terminus is person.death)):
-            return "brother's deceased {}".format('husband' if person.male else 'wife')
-        elif any(s for s in self.sisters if any(
-                m for m in s.marriages if person in m.subjects and m.terminus is person.death)):
-            return "sister's deceased {}".format('husband' if person.male else 'wife')
-        elif any(s for s in self.brothers if any(
-                m for m in s.marriages if person in m.subjects and m.terminus is s.death)):
-            return "deceased brother's former {}".format('husband' if person.male else 'wife')
-        elif any(s for s in self.sisters if any(
-                m for m in s.marriages if person in m.subjects and m.terminus is s.death)):
-            return "deceased sister's former {}".format('husband' if person.male else 'wife')
-        elif person.spouse in self.kids:
-            return 'son in law' if person.male else 'daughter in law'
-        elif self.spouse and person in self.spouse.parents:
-            return 'father in law' if person.male else 'mother in law'
-        elif self.spouse and person in self.spouse.sons:
-            return 'stepson'
-        elif self.spouse and person in self.spouse.daughters:
-            return 'stepdaughter'
-        elif self.mother and person is self.mother.spouse:
-            return 'stepfather' if person.male else 'stepmother'
-        elif self.father and person is self.father.spouse:
-            return 'stepfather' if person.male else 'stepmother'
-        elif self.greatgrandparents & person.greatgrandparents:
-            return 'second cousin'
-        elif self.greatgrandparents & person.siblings:
-            return 'great uncle' if person.male else 'great aunt'
-        elif person is self.best_friend:
-            return 'best friend'
-        elif person is self.worst_enemy:
-            return 'worst enemy'
-        elif person is self.significant_other:
-            return 'boyfriend' if person.male else 'girlfriend'
-        # elif person is self.love_interest:  # Commented out because no one would say this
-        #     return 'love interest'
-        elif person in self.coworkers:
-            return 'coworker'
-        elif person in self.neighbors:
-            return 'neighbor'
-        elif person in self.enemies:
-            return 'enemy'
-        elif any(p for p in self.parents if person is p.significant_other):
-            p = next(p for p in self.parents if person is p.significant_other)
-            return "{}'s {}".format(
-                'father' if p.male else 'mother', 'boyfriend' if person.male else 'girlfriend'
+        return self._relations_to_me().get(person)
+
+    def relations_to_me(self, people):
+        """Return a dictionary mapping each of the given people to their primary relation to me, if any.
+
+        This is the batch form of relation_to_me(), for classifying many people at once.
+        """
+        relations = self._relations_to_me()
+        return {person: relations.get(person) for person in people}
+
+    def _relations_to_me(self):
+        """Return a dictionary mapping everyone related to me in any way to their primary relation to me.
+
+        This classifies everyone in a single pass, by working through the relations that relation_to_me()
+        considers in their order of precedence, and is memoized in the sim's relation cache until someone's
+        family or social ties change. Where a relation hinges on one of several family members (e.g., a
+        sibling's best friend), those family members are considered in the order in which relation_to_me()
+        has always considered them.
+        """
+        relation_cache = self.sim.relation_cache
+        try:
+            return relation_cache.relations[self]
+        except KeyError:
+            pass
+        relations = {}
+        classify = relation_cache.classify
+        spouse, mother, father = self.spouse, self.mother, self.father
+        brothers, sisters, siblings, kids = self.brothers, self.sisters, self.siblings, self.kids
+        classify(relations, (self,), 'self')
+        classify(relations, self.greatgrandparents, ('greatgrandfather', 'greatgrandmother'))
+        classify(relations, self.grandparents, ('grandfather', 'grandmother'))
+        classify(relations, (father,), 'father')
+        classify(relations, (mother,), 'mother')
+        classify(relations, self.aunts, 'aunt')
+        classify(relations, self.uncles, 'uncle')
+        classify(relations, brothers, 'brother')
+        classify(relations, sisters, 'sister')
+        classify(relations, self.cousins, 'cousin')
+        classify(relations, self.sons, 'son')
+        classify(relations, self.daughters, 'daughter')
+        classify(relations, self.nephews, 'nephew')
+        classify(relations, self.nieces, 'niece')
+        classify(relations, (spouse,), ('husband', 'wife'))
+        classify(relations, self._former_spouses_by_divorce(), ('ex-husband', 'ex-wife'))
+        if self.widowed:
+            classify(relations, self._deceased_spouses(), ('deceased husband', 'deceased wife'))
+        classify(relations, self._people_married_to(siblings), ('brother in law', 'sister in law'))
+        if spouse:
+            classify(relations, spouse.siblings, ('brother in law', 'sister in law'))
+        if father:
+            classify(relations, father._former_spouses_by_divorce(), ("father's ex-husband", "father's ex-wife"))
+        if mother:
+            classify(relations, mother._former_spouses_by_divorce(), ("mother's ex-husband", "mother's ex-wife"))
+        for sibling_type, siblings_of_that_type in (('brother', brothers), ('sister', sisters)):
+            classify(
+                relations, (p for s in siblings_of_that_type for p in s._former_spouses_by_divorce()),
+                ("{}'s ex-husband".format(sibling_type), "{}'s ex-wife".format(sibling_type))
             )
-        elif any(k for k in self.kids if person is k.significant_other):
-            k = next(k for k in self.kids if person is k.significant_other)
-            return "{}'s {}".format(
-                'son' if k.male else 'daughter', 'boyfriend' if person.male else 'girlfriend'
+        for sibling_type, siblings_of_that_type in (('brother', brothers), ('sister', sisters)):
+            classify(
+                relations, (p for s in siblings_of_that_type for p in s._deceased_spouses()),
+                ("{}'s deceased husband".format(sibling_type), "{}'s deceased wife".format(sibling_type))
             )
-        elif any(s for s in self.siblings if person is s.significant_other):
-            s = next(s for s in self.siblings if person is s.significant_other)
-            return "{}'s {}".format(
-                'brother' if s.male else 'sister', 'boyfriend' if person.male else 'girlfriend'
+        for sibling_type, siblings_of_that_type in (('brother', brothers), ('sister', sisters)):
+            classify(
+                relations,
+                (p for s in siblings_of_that_type for m in s.marriages if m.terminus is s.death for p in m.subjects),
+                ("deceased {}'s former husband".format(sibling_type), "deceased {}'s former wife".format(sibling_type))
             )
-        elif self.spouse and person is self.spouse.best_friend:
-            return "{}'s best friend".format('husband' if self.spouse.male else 'wife')
-        elif self.mother and person is self.mother.best_friend:
-            return "mother's best friend"
-        elif self.father and person is self.father.best_friend:
-            return "father's best friend"
-        elif any(s for s in self.siblings if person is s.best_friend):
-            s = next(s for s in self.siblings if person is s.best_friend)
-            return "{}'s best friend".format('brother' if s.male else 'sister')
-        elif any(k for k in self.kids if person is k.best_friend):
-            k = next(k for k in self.kids if person is k.best_friend)
-            return "{}'s best friend".format('son' if k.male else 'daughter')
-        elif self.spouse and person in self.spouse.coworkers:
-            return "{}'s coworker".format('husband' if self.spouse.male else 'wife')
-        elif self.mother and person in self.mother.coworkers:
-            return "mother's coworker"
-        elif self.father and person in self.father.coworkers:
-            return "father's coworker"
-        elif person in self.friends:
-            return 'friend'
-        elif self.spouse and person in self.spouse.friends:
-            return "{}'s friend".format('husband' if self.spouse.male else 'wife')
-        elif self.mother and person in self.mother.friends:
-            return "mother's friend"
-        elif self.father and person in self.father.friends:
-            return "father's friend"
-        elif any(k for k in self.kids if person in k.friends):
-            k = next(k for k in self.kids if person in k.friends)
-            return "{}'s friend".format('son' if k.male else 'daughter')
-        elif any(s for s in self.siblings if person in s.friends):
-            s = next(s for s in self.siblings if person in s.friends)
-            return "{}'s friend".format('brother' if s.male else 'sister')
-        elif person in self.acquaintances:
-            return 'acquaintance'
-        else:
-            return None
+        classify(relations, self._people_married_to(kids), ('son in law', 'daughter in law'))
+        if spouse:
+            classify(relations, spouse.parents, ('father in law', 'mother in law'))
+            classify(relations, spouse.sons, 'stepson')
+            classify(relations, spouse.daughters, 'stepdaughter')
+        if mother:
+            classify(relations, (mother.spouse,), ('stepfather', 'stepmother'))
+        if father:
+            classify(relations, (father.spouse,), ('stepfather', 'stepmother'))
+        # Someone is my second cousin if we share a great-grandparent, and my great uncle or aunt
+        # if they are a sibling of one of my great-grandparents
+        greatgrandparents = self.greatgrandparents
+        classify(relations, (p for g in greatgrandparents for p in g.greatgrandchildren), 'second cousin')
+        classify(relations, (p for g in greatgrandparents for p in g.siblings), ('great uncle', 'great aunt'))
+        classify(relations, (self.best_friend,), 'best friend')
+        classify(relations, (self.worst_enemy,), 'worst enemy')
+        classify(relations, (self.significant_other,), ('boyfriend', 'girlfriend'))
+        classify(relations, self.coworkers, 'coworker')
+        classify(relations, self.neighbors, 'neighbor')
+        classify(relations, self.enemies, 'enemy')
+        for hinge_type, hinges in ((('father', 'mother'), self.parents), (('son', 'daughter'), kids),
+                                   (('brother', 'sister'), siblings)):
+            for hinge in hinges:
+                if hinge:
+                    hinge_type_for_this_hinge = hinge_type[0] if hinge.male else hinge_type[1]
+                    classify(
+                        relations, (hinge.significant_other,),
+                        ("{}'s boyfriend".format(hinge_type_for_this_hinge),
+                         "{}'s girlfriend".format(hinge_type_for_this_hinge))
+                    )
+        if spouse:
+            classify(relations, (spouse.best_friend,), "{}'s best friend".format('husband' if spouse.male else 'wife'))
+        if mother:
+            classify(relations, (mother.best_friend,), "mother's best friend")
+        if father:
+            classify(relations, (father.best_friend,), "father's best friend")
+        for sibling in siblings:
+            classify(
+                relations, (sibling.best_friend,), "{}'s best friend".format('brother' if sibling.male else 'sister')
+            )
+        for kid in kids:
+            classify(relations, (kid.best_friend,), "{}'s best friend".format('son' if kid.male else 'daughter'))
+        if spouse:
+            classify(relations, spouse.coworkers, "{}'s coworker".format('husband' if spouse.male else 'wife'))
+        if mother:
+            classify(relations, mother.coworkers, "mother's coworker")
+        if father:
+            classify(relations, father.coworkers, "father's coworker")
+        classify(relations, self.friends, 'friend')
+        if spouse:
+            classify(relations, spouse.friends, "{}'s friend".format('husband' if spouse.male else 'wife'))
+        if mother:
+            classify(relations, mother.friends, "mother's friend")
+        if father:
+            classify(relations, father.friends, "father's friend")
+        for kid in kids:
+            classify(relations, kid.friends, "{}'s friend".format('son' if kid.male else 'daughter'))
+        for sibling in siblings:
+            classify(relations, sibling.friends, "{}'s friend".format('brother' if sibling.male else 'sister'))
+        classify(relations, self.acquaintances, 'acquaintance')
+        relation_cache.relations[self] = relations
+        return relations
+
+    def _former_spouses_by_divorce(self):
+        """Return a generator over the people I've divorced (and, harmlessly, myself, if I've divorced at all)."""
+        return (p for d in self.divorces for p in d.subjects)
+
+    def _deceased_spouses(self):
+        """Return a generator over the people whose marriages to me ended with their deaths.
+
+        Like the check that relation_to_me() has always made, this also yields my current spouse
+        and me, since an ongoing marriage's terminus and a living person's death are both None.
+        """
+        return (p for m in self.marriages for p in m.subjects if m.terminus is p.death)
+
+    @staticmethod
+    def _people_married_to(people):
+        """Return a generator over everyone whose .spouse attribute is one of the given people.
+
+        Note that a deceased person's .spouse attribute continues to hold their widow.
+        """
+        return (p for s in people for m in s.marriages for p in m.subjects if p.spouse is s)
 
     def known_relation_to_me(self, person):
         """Return the primary relations of another person to me that are grounded in my knowledge, if any,
@@ -1372,6 +1251,7 @@ class Person(object):
             female_partner.conception_year = self.sim.year
             female_partner.due_date = self.sim.ordinal_date + 270
             female_partner.pregnant = True
+            self.sim.register_pregnancy(person=female_partner)
 
     def marry(self, partner):
         """Marry partner."""
@@ -1474,6 +1354,7 @@ class Person(object):
             if i_am_qualified_for_this_position:
                 if must_add_supplemental_position:
                     family_company.supplemental_vacancies[shift].append(position)
+                    family_company.town.update_supplemental_vacancies(company=family_company, shift=shift)
                 family_company.hire(
                     occupation_of_need=position, shift=shift, to_replace=None,
                     fills_supplemental_job_vacancy=True, selected_candidate=self,
@@ -1502,23 +1383,32 @@ class Person(object):
     def _get_scored_as_job_candidate_by_all_companies(self):
         """Get scored as a job candidate by all companies in town for all their supplemental positions."""
         scores = {}
-        # Assemble scores of this person as a job candidate from all companies
-        # in town for all of their open positions, day- or night-shift
-        for company in self.town.companies:
-            for shift in ('day', 'night'):
-                for position in company.supplemental_vacancies[shift]:
-                    i_am_qualified_for_this_position = (
-                        company.check_if_person_is_qualified_for_the_position(
-                            candidate=self, occupation_of_need=position
-                        )
+        qualifications = {}  # Maps positions to whether I'm qualified for them
+        company_scores = {}  # Maps companies to their ratings of me as a job candidate
+        # Assemble scores of this person as a job candidate from all companies in town for all
+        # of their open positions, day- or night-shift, which the town indexes by position and shift
+        for (position, shift), priorities in self.town.supplemental_vacancies.iteritems():
+            if not priorities:
+                continue
+            try:
+                i_am_qualified_for_this_position = qualifications[position]
+            except KeyError:
+                # Qualification doesn't depend on the company, so any company hiring for it can check
+                i_am_qualified_for_this_position = qualifications[position] = (
+                    next(iter(priorities)).check_if_person_is_qualified_for_the_position(
+                        candidate=self, occupation_of_need=position
                     )
-                    if i_am_qualified_for_this_position:
-                        score = company.rate_job_candidate(person=self)
-                        # The open positions are listed in order of priority, so
-                        # penalize this position if its not the company's top priority
-                        priority = company.supplemental_vacancies[shift].index(position)
-                        score /= priority+1
-                        scores[(company, position, shift)] = score
+                )
+            if not i_am_qualified_for_this_position:
+                continue
+            for company, priority in priorities.iteritems():
+                try:
+                    score = company_scores[company]
+                except KeyError:
+                    score = company_scores[company] = company.rate_job_candidate(person=self)
+                # The open positions are listed in order of priority, so
+                # penalize this position if its not the company's top priority
+                scores[(company, position, shift)] = score / (priority+1)
         return scores
 
     def move_out_of_parents(self):
@@ -1628,24 +1518,36 @@ class Person(object):
         else:
             people_involved_in_this_decision = (self,)
         for decision_maker in people_involved_in_this_decision:
-            if person in decision_maker.immediate_family:
-                score += decision_maker.sim.config.preference_to_contract_immediate_family
-            elif person in decision_maker.extended_family:  # elif because immediate family is subset of extended family
-                score += decision_maker.sim.config.preference_to_contract_extended_family
-            if person in decision_maker.friends:
-                score += decision_maker.sim.config.preference_to_contract_friend
-            elif person in decision_maker.acquaintances:
-                score += decision_maker.sim.config.preference_to_contract_acquaintance
-            if person in decision_maker.enemies:
-                score += decision_maker.sim.config.dispreference_to_hire_enemy
-            if person in decision_maker.former_contractors:
-                score += decision_maker.sim.config.preference_to_contract_former_contract
+            score += decision_maker._preference_to_contract(person=person)
         # Multiply score according to this person's experience in this occupation
         score *= person.sim.config.function_to_derive_score_multiplier_bonus_for_experience(
             years_experience=person.occupation.years_experience
         )
         return score
 
+    def _preference_to_contract(self, person):
+        """Return this person's preference, for social reasons, to contract a potential contractor."""
+        try:
+            return self.contractor_scores[person]
+        except KeyError:
+            pass
+        config = self.sim.config
+        score = 0
+        if person in self.immediate_family:
+            score += config.preference_to_contract_immediate_family
+        elif person in self.extended_family:  # elif because immediate family is subset of extended family
+            score += config.preference_to_contract_extended_family
+        if person in self.friends:
+            score += config.preference_to_contract_friend
+        elif person in self.acquaintances:
+            score += config.preference_to_contract_acquaintance
+        if person in self.enemies:
+            score += config.dispreference_to_hire_enemy
+        if person in self.former_contractors:
+            score += config.preference_to_contract_former_contract
+        self.contractor_scores[person] = score
+        return score
+
     def purchase_home(self, purchasers, home):
         # TEMP THING DUE TO CIRCULAR DEPENDENCY -- SEE RESIDENCE.PY -- TODO
         life_event.HomePurchase(subjects=purchasers, home=home, realtor=None)
@@ -1719,23 +1621,18 @@ class Person(object):
 
     def _rate_all_vacant_homes_and_vacant_lots(self):
         """Rate all vacant homes and vacant lots."""
+        vacant_homes = list(self.town.vacant_homes)
+        vacant_lots = list(self.town.vacant_lots)
+        lots = [home.lot for home in vacant_homes] + vacant_lots
+        lot_scores = self.rate_potential_lots(lots=lots)
+        if self.spouse:
+            lot_scores = map(operator.add, lot_scores, self.spouse.rate_potential_lots(lots=lots))
         scores = {}
-        for home in self.town.vacant_homes:
-            my_score = self.rate_potential_lot(lot=home.lot)
-            if self.spouse:
-                spouse_score = self.spouse.rate_potential_lot(lot=home.lot)
-            else:
-                spouse_score = 0
-            scores[home] = my_score + spouse_score
-        for lot in self.town.vacant_lots:
-            my_score = self.rate_potential_lot(lot=lot)
-            if self.spouse:
-                spouse_score = self.spouse.rate_potential_lot(lot=lot)
-            else:
-                spouse_score = 0
-            scores[lot] = (
-                (my_score + spouse_score) * self.sim.config.penalty_for_having_to_build_a_home_vs_buying_one
-            )
+        for home, score in itertools.izip(vacant_homes, lot_scores):
+            scores[home] = score
+        penalty_for_having_to_build_a_home = self.sim.config.penalty_for_having_to_build_a_home_vs_buying_one
+        for lot, score in itertools.izip(vacant_lots, lot_scores[len(vacant_homes):]):
+            scores[lot] = score * penalty_for_having_to_build_a_home
         return scores
 
     def rate_potential_lot(self, lot):
@@ -1747,29 +1644,47 @@ class Person(object):
         a penalty that makes people less willing to build a home on a vacant lot than to move
         into a vacant home.
         """
+        return self.rate_potential_lots(lots=(lot,))[0]
+
+    def rate_potential_lots(self, lots):
+        """Return a list of ratings of the desirability of living at the locations of the given lots, in order."""
+        if not lots:
+            return []
+        # The lots' town may not be mine yet, e.g., if I'm the spouse of someone moving into it
+        town = lots[0].town
+        return town.pulls_toward(lots=lots, sources=self._pulls_toward_potential_homes())
+
+    def _pulls_toward_potential_homes(self):
+        """Return (lot, strength) tuples for the places that pull me toward living near them.
+
+        These are the homes of my family (either positively or negatively, depending on my desire
+        to live near family) and friends, and my workplace. None of this depends on the lot being
+        rated, so it's determined once for all the lots that I'm rating.
+        """
         config = self.sim.config
         pull_to_live_near_that_relation = config.pull_to_live_near_family
         pull_to_live_near_a_friend = config.pull_to_live_near_a_friend
         desire_to_live_near_family = self._determine_desire_to_move_near_family()
-        # Score home for its proximity to family (either positively or negatively, depending); only
-        # consider family members that are alive, in town, and not living with you already (i.e., kids)
+        pulls = []
+        # Consider family members that are alive, in town, and not living with you already (i.e., kids);
+        # relatives whose relation to me exerts no pull are skipped, since they wouldn't affect any score
         relatives_in_town = {f for f in self.extended_family if f.present and f.home is not self.home}
-        score = 0
+        common_familial_relations_to_me = self._common_familial_relations_to_me()
         for relative in relatives_in_town:
-            relation_to_me = self._common_familial_relation_to_me(person=relative)
+            relation_to_me = common_familial_relations_to_me.get(relative)
             pull_toward_someone_of_that_relation = pull_to_live_near_that_relation.get(relation_to_me, 0.0)
-            dist = self.town.distance_between(relative.home.lot, lot) + 1.0  # To avoid ZeroDivisionError
-            score += (desire_to_live_near_family * pull_toward_someone_of_that_relation) / dist
-        # Score for proximity to friends (only positively)
+            if pull_toward_someone_of_that_relation:
+                pulls.append(
+                    (relative.home.lot, desire_to_live_near_family * pull_toward_someone_of_that_relation)
+                )
+        # Proximity to friends (only positively)
         for friend in self.friends:
-            dist = self.town.distance_between(friend.home.lot, lot) + 1.0
-            score += pull_to_live_near_a_friend / dist
-        # Score for proximity to workplace (only positively) -- will be only criterion for person
+            pulls.append((friend.home.lot, pull_to_live_near_a_friend))
+        # Proximity to workplace (only positively) -- will be only criterion for person
         # who is new to the town (and thus accurate_belief no one there yet)
         if self.occupation:
-            dist = self.town.distance_between(self.occupation.company.lot, lot) + 1.0
-            score += config.pull_to_live_near_workplace / dist
-        return score
+            pulls.append((self.occupation.company.lot, config.pull_to_live_near_workplace))
+        return pulls
 
     def _determine_desire_to_move_near_family(self):
         """Decide how badly you want to move near/away from family.
@@ -1791,31 +1706,78 @@ class Person(object):
             final_desire_to_live_near_family = config.desire_to_live_near_family_cap
         return final_desire_to_live_near_family
 
-    def socialize(self, missing_timesteps_to_account_for=1):
-        """Socialize with nearby people."""
+    def socialize(self, missing_timesteps_to_account_for=1, people_here_now=None):
+        """Socialize with nearby people.
+
+        @param people_here_now: A list of the people at this person's location, which may be passed
+                                in by the caller so that it gets built once per location, rather
+                                than once per person there.
+        """
         if not self.location:
             raise Exception("{} tried to socialize, but they have no location currently.".format(self.name))
-        for person in list(self.location.people_here_now):
-            if self._decide_to_instigate_social_interaction(other_person=person):
-                if person not in self.relationships:
-                    Acquaintance(owner=self, subject=person, preceded_by=None)
-                if not self.relationships[person].interacted_this_timestep:
-                    # Make sure they didn't already interact this timestep
-                    self.relationships[person].progress_relationship(
-                        missing_days_to_account_for=missing_timesteps_to_account_for
-                    )
+        if people_here_now is None:
+            people_here_now = list(self.location.people_here_now)
+        n_simulated_timesteps = self.sim.n_simulated_timesteps
+        for person in self._sample_people_to_instigate_social_interaction_with(people_here_now=people_here_now):
+            if person not in self.relationships:
+                Acquaintance(owner=self, subject=person, preceded_by=None)
+            if self.relationships[person].timestep_last_interacted != n_simulated_timesteps:
+                # Make sure they didn't already interact this timestep
+                self.relationships[person].progress_relationship(
+                    missing_days_to_account_for=missing_timesteps_to_account_for
+                )
         # Also cheat to simulate socializing between people that live together,
         # regardless of where they are truly located (otherwise have things like
         # a kid who has never met his mother, because she works the night shift)
         for person in list(self.home.residents-{self}):
             if person not in self.relationships:
                 Acquaintance(owner=self, subject=person, preceded_by=None)
-            if not self.relationships[person].interacted_this_timestep:
+            if self.relationships[person].timestep_last_interacted != n_simulated_timesteps:
                 # Make sure they didn't already interact this timestep
                 self.relationships[person].progress_relationship(
                     missing_days_to_account_for=missing_timesteps_to_account_for
                 )
 
+    def _sample_people_to_instigate_social_interaction_with(self, people_here_now):
+        """Return the people at this person's location whom they will instigate social interactions with.
+
+        This is equivalent to calling _decide_to_instigate_social_interaction() for every person here,
+        but avoids enumerating everyone: friends (including the best friend) are decided on individually,
+        since their chances are boosted, and everyone else gets the same chance, save for the openness
+        component that applies only to strangers. As such, candidates can be drawn by skipping ahead
+        through the people here by geometrically distributed gaps at the higher of those two chances,
+        with acquaintances (and enemies) then being kept at the ratio of their chance to that one.
+        """
+        config = self.sim.config
+        # The people here may have been listed before some of them died or left town (e.g., if the
+        # list is shared by everyone socializing here), so partners must still live in the town
+        residents = self.town.residents
+        people_to_interact_with = []
+        # Decide on friends individually
+        friends_here = set()
+        for person in self.friends | ({self.best_friend} if self.best_friend else set()):
+            if person.location is self.location and person in residents:
+                friends_here.add(person)
+                if self._decide_to_instigate_social_interaction(other_person=person):
+                    people_to_interact_with.append(person)
+        # Sample everyone else
+        floor = config.chance_someone_instigates_interaction_with_other_person_floor
+        cap = config.chance_someone_instigates_interaction_with_other_person_cap
+        extroversion_component = self._get_extroversion_component_to_chance_of_social_interaction()
+        openness_component = self._get_openness_component_to_chance_of_social_interaction()
+        chance_for_stranger = min(max(extroversion_component + openness_component, floor), cap)
+        chance_for_acquaintance = min(max(extroversion_component, floor), cap)
+        chance_for_candidate = max(chance_for_stranger, chance_for_acquaintance)
+        i = sample_geometric(chance_for_candidate) - 1
+        while i < len(people_here_now):
+            person = people_here_now[i]
+            if person is not self and person.age >= 5 and person not in friends_here and person in residents:
+                chance = chance_for_acquaintance if person in self.relationships else chance_for_stranger
+                if chance == chance_for_candidate or random.random() < chance / chance_for_candidate:
+                    people_to_interact_with.append(person)
+            i += sample_geometric(chance_for_candidate)
+        return people_to_interact_with
+
     def _decide_to_instigate_social_interaction(self, other_person):
         """Decide whether to instigate a social interaction with another person."""
         config = self.sim.config
@@ -1890,6 +1852,8 @@ class Person(object):
             pass
         if age == config.age_people_start_working(year=self.sim.year):
             self.in_the_workforce = True
+            if self.town:
+                self.town.job_market.update(person=self)
             consider_leaving_town = True
         if age == 18:
             self.adult = True
@@ -1938,11 +1902,15 @@ class Person(object):
 
     def update_salience_of(self, entity, change):
         """Increment your salience value for entity by change."""
+        # The per-person term may go negative, since it's offset by the entity's job-level
+        # salience; salience_of() clamps their sum
+        self.salience_of_other_people[entity] = self.salience_of_other_people.get(entity, 0.0) + change
+
+    def salience_of(self, entity):
+        """Return the salience of entity to you."""
         # TODO EXPLORE WHY SOME PEOPLE ARE INDEXING OTHERS WITH
         # NEGATIVE SALIENCE VALUES -- the max() is duct tape right now
-        self.salience_of_other_people[entity] = (
-            max(0.0, self.salience_of_other_people.get(entity, 0.0) + change)
-        )
+        return max(0.0, self.salience_of_other_people.get(entity, 0.0) + entity.job_level_salience)
 
     def connection_to_place(self):
         pass
@@ -1956,7 +1924,9 @@ class Person(object):
         if person not in self.relationships:
             return False
         else:
-            return self.relationships[person].charge > config.charge_threshold_for_liking_someone
+            return self.relationships[person].raw_charge > self.sim.raw_thresholds.charge_above(
+                config.charge_threshold_for_liking_someone
+            )
 
     def dislikes(self, person):
         """Return whether this person dislikes the given person."""
@@ -1964,7 +1934,9 @@ class Person(object):
         if person not in self.relationships:
             return False
         else:
-            return self.relationships[person].charge < config.charge_threshold_for_disliking_someone
+            return self.relationships[person].raw_charge < self.sim.raw_thresholds.charge_below(
+                config.charge_threshold_for_disliking_someone
+            )
 
     def hates(self, person):
         """Return whether this person hates the given person."""
@@ -1972,7 +1944,9 @@ class Person(object):
         if person not in self.relationships:
             return False
         else:
-            return self.relationships[person].charge < config.charge_threshold_for_hating_someone
+            return self.relationships[person].raw_charge < self.sim.raw_thresholds.charge_below(
+                config.charge_threshold_for_hating_someone
+            )
 
 
 class PersonExNihilo(Person):
@@ -1986,6 +1960,8 @@ class PersonExNihilo(Person):
     children) may be generated for a person of this class.
     """
 
+    __slots__ = ()  # See Person.__slots__
+
     def __init__(self, sim, job_opportunity_impetus, spouse_already_generated):
         super(PersonExNihilo, self).__init__(sim, birth=None)
         # Potentially overwrite sex set by Person.__init__()
@@ -2175,6 +2151,7 @@ class PersonExNihilo(Person):
         """Move into the town in which simplay takes place."""
         self.town = self.sim.town
         self.town.residents.add(self)
+        self.town.job_market.update(person=self)
         new_home = self.secure_home()
         if not new_home:
             someone_elses_home = random.choice(list(self.town.dwelling_places))
@@ -2206,4 +2183,8 @@ class PersonExNihilo(Person):
             self.move(
                 new_home=complex_that_will_expand.units[-2],
                 reason=hiring_that_instigated_move
-            )
\ No newline at end of file
+            )
+
+
+for _attribute in KINSHIP_ATTRIBUTES:
+    setattr(Person, _attribute, Kin(_attribute))
@@ -92,8 +92,10 @@ class _Index:
     """
     MAX = 1
     MAX_DEPTH = 3
-    def __init__(self, x, y, width, height, depth = 0):
+    def __init__(self, x, y, width, height, depth = 0, max_depth = None):
         self.nodes = []
+        if max_depth is not None:
+            self.MAX_DEPTH = max_depth
         self.children = []
         self.center = [x, y]
         self.width,self.height = width,height
@@ -196,19 +198,19 @@ class _Index:
         self.children = [_Index(self.center[0] - quartwidth,
                                   self.center[1] - quartheight,
                                   width=halfwidth, height=halfheight,
-                                  depth=self.depth + 1),
+                                  depth=self.depth + 1, max_depth=self.MAX_DEPTH),
                          _Index(self.center[0] - quartwidth,
                                   self.center[1] + quartheight,
                                   width=halfwidth, height=halfheight,
-                                  depth=self.depth + 1),
+                                  depth=self.depth + 1, max_depth=self.MAX_DEPTH),
                          _Index(self.center[0] + quartwidth,
                                   self.center[1] - quartheight,
                                   width=halfwidth, height=halfheight,
-                                  depth=self.depth + 1),
+                                  depth=self.depth + 1, max_depth=self.MAX_DEPTH),
                          _Index(self.center[0] + quartwidth,
                                   self.center[1] + quartheight,
                                   width=halfwidth, height=halfheight,
-                                  depth=self.depth + 1)]
+                                  depth=self.depth + 1, max_depth=self.MAX_DEPTH)]
         nodes = self.nodes
         self.nodes = []
         for node in nodes:
@@ -226,10 +228,13 @@ class Index(_Index):
     | **option** | **description**
     | --- | --- 
     | bbox | the coordinate system bounding box of the area that the quadtree should keep track of, as a 4-length sequence (xmin,ymin,xmax,ymax)
+    | max_depth | optional override of how many times the index may be subdivided (defaults to MAX_DEPTH)
     
     """
-    def __init__(self, bbox):
+    def __init__(self, bbox, max_depth = None):
         x1,y1,x2,y2 = bbox
+        if max_depth is not None:
+            self.MAX_DEPTH = max_depth
         width,height = x2-x1,y2-y1
         midx,midy = x1+width/2.0, y1+height/2.0
         self.nodes = []
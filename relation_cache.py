@@ -0,0 +1,48 @@
+class RelationCache(object):
+    """Memoized classifications of how people are related to one another.
+
+    Person.relation_to_me() and Person._common_familial_relation_to_me() resolve a person's relation
+    to someone by working through a long chain of checks, which is wasteful when a person is repeatedly
+    asked about the same people (e.g., their relatives, for every lot they consider moving to). Instead,
+    the first such query classifies, in a single pass, everyone whom the person has any relation to,
+    and the result is memoized here until some event invalidates it. There are two tiers: immediate
+    common familial relations, which change only with births, marriages, divorces, and deaths; and the
+    richer relations of relation_to_me(), which also change with the formation of acquaintanceships,
+    friendships, and enmities, changes in best friends and worst enemies, hirings, terminations, and
+    moves and departures (i.e., changes to people's coworkers and neighbors).
+    """
+
+    def __init__(self):
+        """Initialize a RelationCache object."""
+        # Maps people to dictionaries mapping their relatives to their common familial relations to them
+        self.familial = {}
+        # Maps people to dictionaries mapping anyone related to them to their primary relations to them
+        self.relations = {}
+
+    def forget_kinship(self):
+        """Forget all relations, since someone's family has changed."""
+        self.familial = {}
+        self.relations = {}
+
+    def forget_social_ties(self):
+        """Forget all relations that consider social ties, since someone's social ties have changed."""
+        self.relations = {}
+
+    @staticmethod
+    def classify(relations, people, relation):
+        """Record a relation to each of the given people who has not already been classified.
+
+        Classifications are made in order of precedence, and so anyone who has already been
+        classified is related in some other way that takes precedence over this one.
+
+        @param relations: A dictionary mapping people to their relations, which will be updated.
+        @param people: An iterable of people (any of which may be None, in which case it is skipped).
+        @param relation: Either a string naming the relation, or a (male, female) tuple of strings
+                         naming the relation for men and women, respectively.
+        """
+        for person in people:
+            if person and person not in relations:
+                if isinstance(relation, tuple):
+                    relations[person] = relation[0] if person.male else relation[1]
+                else:
+                    relations[person] = relation
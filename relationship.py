@@ -1,6 +1,14 @@
 class Relationship(object):
     """A social and/or romantic relationship between two people in a town."""
 
+    def __new__(cls, owner, subject, preceded_by):
+        """Return a new relationship, which will be a view over a row of the simulation's relationship
+        store, if it has one (see relationship_store.py).
+        """
+        if owner.sim.relationship_store:
+            return owner.sim.relationship_store.new_relationship(cls, owner, subject, preceded_by)
+        return super(Relationship, cls).__new__(cls)
+
     def __init__(self, owner, subject, preceded_by):
         """Initialize a Relationship object.
 
@@ -13,18 +21,19 @@ class Relationship(object):
         self.subject = subject
         self.preceded_by = preceded_by
         self.succeeded_by = None
+        # Note: strings describing when and where they met are only rendered on demand (by the
+        # first_met_str and last_met_str properties), since relationships progress so very often
         self.where_they_met = owner.location
         self.when_they_met = owner.sim.date
-        self.first_met_str = '{date} at {location}'.format(
-            date=owner.sim.year, location=owner.location.name
-        )
+        self.year_they_met = owner.sim.year
         self.where_they_last_met = owner.location  # These change as appropriate
         self.when_they_last_met = owner.sim.date
-        self.last_met_str_base = (
-            '{date} at {location}'.format(date=owner.sim.year, location=owner.location.name),
-            self.owner.sim.ordinal_date
-        )
+        self.year_they_last_met = owner.sim.year
+        self.ordinal_date_they_last_met = owner.sim.ordinal_date
         self.total_interactions = 0
+        # Normalized charge and spark values are computed from the raw ones as they are read (see
+        # the charge and spark properties), and memoized as (timestep, raw value, normalized value)
+        self._charge_memo = self._spark_memo = (None, None, None)
         # Set this as the primary relationship owner has with subject
         owner.relationships[subject] = self
         if not preceded_by:
@@ -42,29 +51,17 @@ class Relationship(object):
             # Inherit the spark increment and current spark of the preceding Acquaintance
             self.raw_spark_increment = float(preceded_by.raw_spark_increment)
             self.raw_spark = preceded_by.spark
-        # Normalize charge and spark values to -100 to 100 scales
-        self.charge = self.owner.sim.config.function_to_normalize_raw_charge(
-            n_simulated_timesteps=self.owner.sim.n_simulated_timesteps, raw_charge=self.raw_charge
-        )
-        self.spark = self.owner.sim.config.function_to_normalize_raw_spark(
-            n_simulated_timesteps=self.owner.sim.n_simulated_timesteps, raw_spark=self.raw_spark
-        )
-        # Prepare variables that specify the effects that age and job-level differences
-        # will have on this relationship's charge and spark values; these are set immediately
-        # by update_spark_and_charge_increments_for_new_age_difference() and update_spark_and_
-        # charge_increments_for_new_job_level_difference, which will also be called whenever a
-        # member of this relationship has a birthday or gets a new occupation
-        self.age_difference_effect_on_charge_increment = None
-        self.age_difference_effect_on_spark_increment = None
-        self.job_level_difference_effect_on_charge_increment = None
-        self.job_level_difference_effect_on_spark_increment = None
+        # Set the effects that age and job-level differences will have on this relationship's
+        # charge and spark values (.age_difference_effect_on_charge_increment and so forth); these
+        # methods will also be called whenever a member of this relationship has a birthday or gets
+        # a new occupation
         self.update_spark_and_charge_increments_for_new_age_difference()
         self.update_spark_and_charge_increments_for_job_level_difference()
-        # This attribute records whether the other person has already called the
-        # progress_relationship() method of this object on this timestep -- it gets
-        # set to True by progress_relationship() and then turned back to False by
-        # Simulation.enact_hi_fi_simulation()
-        self.interacted_this_timestep = False
+        # This attribute records the last simulated timestep on which progress_relationship() was
+        # called for this object, so that the other person doesn't call it again on that timestep
+        # (compared against sim.n_simulated_timesteps, which means nothing has to be reset between
+        # timesteps; see the interacted_this_timestep property)
+        self.timestep_last_interacted = 0
         # Keep track of all the conversations they've had during hi-fi timesteps
         self.conversations = []
 
@@ -273,10 +270,8 @@ class Relationship(object):
         self.total_interactions += 1
         self.where_they_last_met = owner.location  # Changes as appropriate
         self.when_they_last_met = owner.sim.date
-        self.last_met_str_base = (
-            '{date} at {location}'.format(date=owner.sim.year, location=owner.location.name),
-            self.owner.sim.ordinal_date
-        )
+        self.year_they_last_met = owner.sim.year
+        self.ordinal_date_they_last_met = owner.sim.ordinal_date
         # Increment salience
         self.owner.salience_of_other_people[self.subject] += config.salience_increment_for_social_interaction
         # Progress raw_charge, possibly leading to a Friendship or Enmity
@@ -286,13 +281,17 @@ class Relationship(object):
         )
         change_to_charge *= missing_days_to_account_for
         self.raw_charge += change_to_charge
-        # Normalize charge value to a -100 to 100 scale
-        self.charge = self.owner.sim.config.function_to_normalize_raw_charge(
-            n_simulated_timesteps=self.owner.sim.n_simulated_timesteps, raw_charge=self.raw_charge
-        )
-        if self.type != "friendship" and self.charge > config.charge_threshold_friendship:
+        # Compare against the thresholds in raw space, rather than normalizing the charge value
+        raw_thresholds = owner.sim.raw_thresholds
+        if (
+            self.type != "friendship" and
+            self.raw_charge > raw_thresholds.charge_above(config.charge_threshold_friendship)
+        ):
             Friendship(owner=owner, subject=subject, preceded_by=self)
-        elif self.type != "enmity" and self.charge < config.charge_threshold_enmity:
+        elif (
+            self.type != "enmity" and
+            self.raw_charge < raw_thresholds.charge_below(config.charge_threshold_enmity)
+        ):
             Enmity(owner=owner, subject=subject, preceded_by=self)
         # Progress spark, possibly leading to a
         self.raw_spark_increment *= config.spark_decay_rate
@@ -302,17 +301,13 @@ class Relationship(object):
         )
         change_to_spark *= missing_days_to_account_for
         self.raw_spark += change_to_spark
-        # Normalize spark value to a -100 to 100 scale
-        self.spark = self.owner.sim.config.function_to_normalize_raw_spark(
-            n_simulated_timesteps=self.owner.sim.n_simulated_timesteps, raw_spark=self.raw_spark
-        )
         # Check if subject is now owner's new best friend, worst enemy, or love interest; if
         # so, update accordingly
         self._update_social_network()
-        self.interacted_this_timestep = True
+        self.timestep_last_interacted = owner.sim.n_simulated_timesteps
         # Call this method for the subject's own conception of this relationship
         # to update its attributes according to this interaction
-        if not subject.relationships[owner].interacted_this_timestep:
+        if subject.relationships[owner].timestep_last_interacted != owner.sim.n_simulated_timesteps:
             subject.relationships[owner].progress_relationship(
                 missing_days_to_account_for=missing_days_to_account_for
             )
@@ -331,12 +326,14 @@ class Relationship(object):
             owner.update_salience_of(entity=subject, change=salience_change)
             owner.best_friend = subject
             owner.charge_of_best_friend = charge
+            owner.sim.relation_cache.forget_social_ties()
         # Potentially remove now former best friend if charge dropped below 0
         elif subject is owner.best_friend and charge < 0.0:
             salience_change = config.salience_increment_from_relationship_change['best friend']
             owner.update_salience_of(entity=subject, change=-salience_change)
             owner.best_friend = None
             owner.charge_of_best_friend = 0.0
+            owner.sim.relation_cache.forget_social_ties()
         # Potentially attribute new worst enemy
         if self.raw_charge < owner.charge_of_worst_enemy and subject is not owner.worst_enemy:
             salience_change = config.salience_increment_from_relationship_change['worst enemy']
@@ -346,12 +343,14 @@ class Relationship(object):
             owner.update_salience_of(entity=subject, change=salience_change)
             owner.worst_enemy = subject
             owner.charge_of_worst_enemy = self.raw_charge
+            owner.sim.relation_cache.forget_social_ties()
         # Potentially remove now former worst enemy if charge climbed above 0
         elif subject is owner.worst_enemy and charge > 0.0:
             salience_change = config.salience_increment_from_relationship_change['worst_enemy']
             owner.update_salience_of(entity=subject, change=-salience_change)
             owner.worst_enemy = None
             owner.charge_of_worst_enemy = 0.0
+            owner.sim.relation_cache.forget_social_ties()
         # Potentially attribute new love interest
         if 0 < self.raw_spark > owner.spark_of_love_interest and subject is not owner.love_interest:
             salience_change = config.salience_increment_from_relationship_change['love interest']
@@ -368,12 +367,48 @@ class Relationship(object):
             owner.love_interest = None
             owner.spark_of_love_interest = 0.0
 
+    @property
+    def interacted_this_timestep(self):
+        """Whether progress_relationship() has already been called for this object on this timestep."""
+        return self.timestep_last_interacted == self.owner.sim.n_simulated_timesteps
+
+    @property
+    def charge(self):
+        """This relationship's charge, normalized (to a -100 to 100 scale) as of the current timestep."""
+        n_simulated_timesteps = self.owner.sim.n_simulated_timesteps
+        raw_charge = self.raw_charge
+        timestep, memoized_raw_charge, charge = self._charge_memo
+        if timestep != n_simulated_timesteps or memoized_raw_charge != raw_charge:
+            charge = self.owner.sim.config.function_to_normalize_raw_charge(
+                n_simulated_timesteps=n_simulated_timesteps, raw_charge=raw_charge
+            )
+            self._charge_memo = (n_simulated_timesteps, raw_charge, charge)
+        return charge
+
+    @property
+    def spark(self):
+        """This relationship's spark, normalized (to a -100 to 100 scale) as of the current timestep."""
+        n_simulated_timesteps = self.owner.sim.n_simulated_timesteps
+        raw_spark = self.raw_spark
+        timestep, memoized_raw_spark, spark = self._spark_memo
+        if timestep != n_simulated_timesteps or memoized_raw_spark != raw_spark:
+            spark = self.owner.sim.config.function_to_normalize_raw_spark(
+                n_simulated_timesteps=n_simulated_timesteps, raw_spark=raw_spark
+            )
+            self._spark_memo = (n_simulated_timesteps, raw_spark, spark)
+        return spark
+
+    @property
+    def first_met_str(self):
+        """Return a string representing the first time these two met."""
+        return '{date} at {location}'.format(date=self.year_they_met, location=self.where_they_met.name)
+
     @property
     def last_met_str(self):
         """Return a string representing the last time these two met."""
-        base_str, ordinal_date_they_last_met = self.last_met_str_base
-        return "{} ({} days ago)".format(
-            base_str, self.owner.sim.ordinal_date-ordinal_date_they_last_met
+        return "{date} at {location} ({days} days ago)".format(
+            date=self.year_they_last_met, location=self.where_they_last_met.name,
+            days=self.owner.sim.ordinal_date-self.ordinal_date_they_last_met
         )
 
     def outline(self):
@@ -401,6 +436,8 @@ class Acquaintance(Relationship):
         """
         super(Acquaintance, self).__init__(owner, subject, preceded_by)
         owner.acquaintances.add(subject)
+        owner.contractor_scores.clear()
+        owner.sim.relation_cache.forget_social_ties()
         if self.owner not in self.subject.relationships:
             Acquaintance(owner=self.subject, subject=self.owner, preceded_by=None)
         # Update the salience value owner has for subject (not vice versa, because relationships
@@ -423,6 +460,8 @@ class Enmity(Relationship):
         super(Enmity, self).__init__(owner, subject, preceded_by)
         owner.acquaintances.remove(subject)
         owner.enemies.add(subject)
+        owner.contractor_scores.clear()
+        owner.sim.relation_cache.forget_social_ties()
         # Update the salience value owner has for subject (not vice versa, because relationships
         # are unidirectional)
         owner.update_salience_of(
@@ -443,8 +482,85 @@ class Friendship(Relationship):
         super(Friendship, self).__init__(owner, subject, preceded_by)
         owner.acquaintances.remove(subject)
         owner.friends.add(subject)
+        owner.contractor_scores.clear()
+        owner.sim.relation_cache.forget_social_ties()
         # Update the salience value owner has for subject (not vice versa, because relationships
         # are unidirectional)
         owner.update_salience_of(
             subject, change=owner.sim.config.salience_increment_from_relationship_change['friend']
         )
+
+
+class RawThresholds(object):
+    """Thresholds on normalized charge and spark values, translated into raw space for the current timestep.
+
+    Since normalized values depend on the number of simulated timesteps, comparing a raw value against
+    a translated threshold is equivalent to normalizing that value and comparing it against the original
+    threshold. Translations are computed (by bisection, so that the normalization functions in the config
+    may be freely altered, so long as they remain nondecreasing) as needed, and memoized for the timestep.
+    """
+
+    def __init__(self, sim):
+        """Initialize a RawThresholds object."""
+        self.sim = sim
+        self.n_simulated_timesteps = None  # The timestep that the memoized translations are for
+        self.translations = {}
+
+    def charge_above(self, threshold):
+        """Return the raw charge value that raw charges must exceed for their normalized values to exceed threshold."""
+        return self._translate('charge', threshold, above=True)
+
+    def charge_below(self, threshold):
+        """Return the raw charge value that raw charges must fall below for their normalized values to do so."""
+        return self._translate('charge', threshold, above=False)
+
+    def spark_above(self, threshold):
+        """Return the raw spark value that raw sparks must exceed for their normalized values to exceed threshold."""
+        return self._translate('spark', threshold, above=True)
+
+    def _translate(self, value_type, threshold, above):
+        """Return the given threshold translated into raw space for the current timestep."""
+        if self.n_simulated_timesteps != self.sim.n_simulated_timesteps:
+            self.n_simulated_timesteps = self.sim.n_simulated_timesteps
+            self.translations = {}
+        try:
+            return self.translations[(value_type, threshold, above)]
+        except KeyError:
+            translation = self._bisect(value_type=value_type, threshold=threshold, above=above)
+            self.translations[(value_type, threshold, above)] = translation
+            return translation
+
+    def _bisect(self, value_type, threshold, above):
+        """Find the pair of adjacent raw values between which normalized values cross the threshold.
+
+        If above, this returns the greatest raw value whose normalized value does not exceed the threshold;
+        otherwise, it returns the least raw value whose normalized value is not below the threshold.
+        """
+        config = self.sim.config
+        n_simulated_timesteps = self.n_simulated_timesteps
+        if value_type == 'charge':
+            normalize = lambda raw_value: config.function_to_normalize_raw_charge(
+                n_simulated_timesteps=n_simulated_timesteps, raw_charge=raw_value
+            )
+        else:
+            normalize = lambda raw_value: config.function_to_normalize_raw_spark(
+                n_simulated_timesteps=n_simulated_timesteps, raw_spark=raw_value
+            )
+        if above:
+            crosses = lambda raw_value: normalize(raw_value) > threshold
+        else:
+            crosses = lambda raw_value: normalize(raw_value) >= threshold
+        low, high = -1.0, 1.0
+        while crosses(low):
+            low *= 2
+        while not crosses(high):
+            high *= 2
+        while True:
+            middle = (low + high) / 2.0
+            if middle == low or middle == high:
+                break
+            if crosses(middle):
+                high = middle
+            else:
+                low = middle
+        return low if above else high
@@ -0,0 +1,199 @@
+from array import array
+from relationship import Relationship, Acquaintance, Enmity, Friendship
+
+
+# The attributes of a relationship that a RelationshipStore keeps in columns, mapped to the
+# typecodes of the arrays holding them (None indicating a list, for references to other objects)
+COLUMNS = {
+    'raw_charge': 'd',
+    'raw_spark': 'd',
+    'raw_charge_increment': 'd',
+    'raw_spark_increment': 'd',
+    'age_difference_effect_on_charge_increment': 'd',
+    'age_difference_effect_on_spark_increment': 'd',
+    'job_level_difference_effect_on_charge_increment': 'd',
+    'job_level_difference_effect_on_spark_increment': 'd',
+    'total_interactions': 'l',
+    'year_they_last_met': 'l',
+    'ordinal_date_they_last_met': 'l',
+    'timestep_last_interacted': 'l',
+    'where_they_last_met': None,
+    'when_they_last_met': None,
+}
+
+
+class RelationshipStore(object):
+    """A columnar store for the relationships in a simulation.
+
+    Rather than each relationship holding its raw charge, raw spark, increments, and so forth as attributes
+    of its own, these are kept in parallel arrays that have a row for each (owner, subject) pair, and
+    the relationship objects in people's .relationships dictionaries are thin views over those rows.
+    Interactions are queued as people socialize and then progressed in a single batch at the end of
+    the timestep. When an Acquaintance becomes a Friendship or Enmity, the new relationship takes over
+    the row, and the preceding one is detached from it, keeping a snapshot of its final values.
+
+    This is enabled by config.use_columnar_relationship_store.
+    """
+
+    def __init__(self, sim):
+        """Initialize a RelationshipStore object."""
+        self.sim = sim
+        for column, typecode in COLUMNS.iteritems():
+            setattr(self, column, array(typecode) if typecode else [])
+        self.relationships = []  # The relationship currently occupying each row
+        self.queued_interactions = []  # (Row, number of days to account for) tuples
+
+    def new_relationship(self, relationship_class, owner, subject, preceded_by):
+        """Return a new (uninitialized) relationship of the given class, viewing a row in this store."""
+        relationship = object.__new__(STORED_RELATIONSHIP_CLASSES[relationship_class])
+        relationship.store = self
+        if preceded_by and preceded_by.row is not None:
+            row = preceded_by.row
+            self._detach(preceded_by)
+        else:
+            row = len(self.relationships)
+            for column, typecode in COLUMNS.iteritems():
+                getattr(self, column).append(0 if typecode else None)
+            self.relationships.append(None)
+        relationship.row = row
+        self.relationships[row] = relationship
+        return relationship
+
+    def _detach(self, relationship):
+        """Detach a relationship from its row, copying its values into the relationship itself."""
+        row = relationship.row
+        for column in COLUMNS:
+            relationship.__dict__[column] = getattr(self, column)[row]
+        relationship.row = None
+
+    def queue_interaction(self, relationship, missing_days_to_account_for):
+        """Queue an interaction between the owner and subject of a relationship (in both directions)."""
+        n_simulated_timesteps = self.sim.n_simulated_timesteps
+        self.timestep_last_interacted[relationship.row] = n_simulated_timesteps
+        self.queued_interactions.append((relationship.row, missing_days_to_account_for))
+        subjects_relationship = relationship.subject.relationships[relationship.owner]
+        if self.timestep_last_interacted[subjects_relationship.row] != n_simulated_timesteps:
+            self.timestep_last_interacted[subjects_relationship.row] = n_simulated_timesteps
+            self.queued_interactions.append((subjects_relationship.row, missing_days_to_account_for))
+
+    def progress_queued_interactions(self):
+        """Progress the relationships for every interaction that was queued on this timestep.
+
+        This mirrors Relationship.progress_relationship() exactly, except in that a relationship gets
+        progressed at most once per timestep, even if it was succeeded by a Friendship or Enmity.
+        """
+        queued_interactions, self.queued_interactions = self.queued_interactions, []
+        # Attribute accessing is expensive -- set local variables
+        sim = self.sim
+        config = sim.config
+        date, year, ordinal_date = sim.date, sim.year, sim.ordinal_date
+        raw_charge_threshold_friendship = sim.raw_thresholds.charge_above(config.charge_threshold_friendship)
+        raw_charge_threshold_enmity = sim.raw_thresholds.charge_below(config.charge_threshold_enmity)
+        spark_decay_rate = config.spark_decay_rate
+        salience_increment = config.salience_increment_for_social_interaction
+        relationships = self.relationships
+        raw_charge, raw_spark = self.raw_charge, self.raw_spark
+        raw_charge_increment, raw_spark_increment = self.raw_charge_increment, self.raw_spark_increment
+        age_effect_on_charge = self.age_difference_effect_on_charge_increment
+        age_effect_on_spark = self.age_difference_effect_on_spark_increment
+        job_level_effect_on_charge = self.job_level_difference_effect_on_charge_increment
+        job_level_effect_on_spark = self.job_level_difference_effect_on_spark_increment
+        total_interactions = self.total_interactions
+        where_they_last_met, when_they_last_met = self.where_they_last_met, self.when_they_last_met
+        year_they_last_met, ordinal_date_they_last_met = self.year_they_last_met, self.ordinal_date_they_last_met
+        for row, missing_days_to_account_for in queued_interactions:
+            relationship = relationships[row]
+            owner, subject = relationship.owner, relationship.subject
+            total_interactions[row] += 1
+            where_they_last_met[row] = owner.location
+            when_they_last_met[row] = date
+            year_they_last_met[row] = year
+            ordinal_date_they_last_met[row] = ordinal_date
+            owner.salience_of_other_people[subject] += salience_increment
+            raw_charge[row] += (
+                raw_charge_increment[row] * age_effect_on_charge[row] * job_level_effect_on_charge[row] *
+                missing_days_to_account_for
+            )
+            if relationship.type != "friendship" and raw_charge[row] > raw_charge_threshold_friendship:
+                Friendship(owner=owner, subject=subject, preceded_by=relationship)
+            elif relationship.type != "enmity" and raw_charge[row] < raw_charge_threshold_enmity:
+                Enmity(owner=owner, subject=subject, preceded_by=relationship)
+            if relationship.row is None:
+                # The relationship was just succeeded (and thus detached from this row), so progress
+                # the remainder of this interaction on the relationship itself
+                relationship.raw_spark_increment *= spark_decay_rate
+                relationship.raw_spark += (
+                    relationship.raw_spark_increment * relationship.age_difference_effect_on_spark_increment *
+                    relationship.job_level_difference_effect_on_spark_increment * missing_days_to_account_for
+                )
+            else:
+                raw_spark_increment[row] *= spark_decay_rate
+                raw_spark[row] += (
+                    raw_spark_increment[row] * age_effect_on_spark[row] * job_level_effect_on_spark[row] *
+                    missing_days_to_account_for
+                )
+            relationship._update_social_network()
+
+
+class _Column(object):
+    """A descriptor for a relationship attribute that is held in a column of a RelationshipStore."""
+
+    def __init__(self, name):
+        """Initialize a _Column object."""
+        self.name = name
+
+    def __get__(self, relationship, relationship_class):
+        """Return the value of this attribute for the given relationship."""
+        if relationship is None:
+            return self
+        row = relationship.row
+        if row is None:
+            return relationship.__dict__[self.name]
+        return getattr(relationship.store, self.name)[row]
+
+    def __set__(self, relationship, value):
+        """Set the value of this attribute for the given relationship."""
+        row = relationship.row
+        if row is None:
+            relationship.__dict__[self.name] = value
+        else:
+            getattr(relationship.store, self.name)[row] = value
+
+
+class StoredRelationship(Relationship):
+    """A relationship whose numeric attributes (and last meeting) are held in a RelationshipStore."""
+
+    def __init__(self, owner, subject, preceded_by):
+        """Initialize a StoredRelationship object."""
+        super(StoredRelationship, self).__init__(owner, subject, preceded_by)
+        self.type = self.relationship_type
+
+    def progress_relationship(self, missing_days_to_account_for):
+        """Queue an interaction, to be progressed along with all others at the end of this timestep."""
+        self.store.queue_interaction(self, missing_days_to_account_for=missing_days_to_account_for)
+
+
+for _column in COLUMNS:
+    setattr(StoredRelationship, _column, _Column(_column))
+
+
+class StoredAcquaintance(StoredRelationship, Acquaintance):
+    """An Acquaintance whose numeric attributes are held in a RelationshipStore."""
+    relationship_type = "acquaintance"
+
+
+class StoredEnmity(StoredRelationship, Enmity):
+    """An Enmity whose numeric attributes are held in a RelationshipStore."""
+    relationship_type = "enmity"
+
+
+class StoredFriendship(StoredRelationship, Friendship):
+    """A Friendship whose numeric attributes are held in a RelationshipStore."""
+    relationship_type = "friendship"
+
+
+STORED_RELATIONSHIP_CLASSES = {
+    Acquaintance: StoredAcquaintance,
+    Enmity: StoredEnmity,
+    Friendship: StoredFriendship,
+}
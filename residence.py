@@ -33,6 +33,7 @@ class DwellingPlace(object):
         self._init_ownership(initial_owners=owners)
         self.people_here_now = set()  # People at home on a specific time step (either a resident or visitor)
         self.demolition = None  # Potentially gets set by event.Demolition.__init__()
+        self.town.update_vacancy_of_home(home=self)
 
     def __str__(self):
         """Return string representation."""
@@ -120,4 +121,5 @@ class House(DwellingPlace):
     def __init__(self, lot, construction):
         super(House, self).__init__(lot, owners=construction.subjects)
         self.construction = construction
-        self.lot.building = self
\ No newline at end of file
+        self.lot.building = self
+        self.town.update_vacancy_of_lot(lot=self.lot)
\ No newline at end of file
@@ -1,10 +1,23 @@
+import os
 import sys
+import heapq
 import time
+import zlib
+import hashlib
+import cPickle
 import datetime
 from business import *
 from config import Config
 from town import *
 from drama import StoryRecognizer
+from genealogy import Genealogy
+from hiring_chain import HiringStats
+from relation_cache import RelationCache
+from whereabouts import WhereaboutsLog
+from relationship import RawThresholds
+from relationship_store import RelationshipStore
+from utils import sample_geometric
+import checkpoint
 
 
 class Simulation(object):
@@ -29,6 +42,20 @@ class Simulation(object):
         self.time_of_day = "day"
         self.date = self.get_date()
         self.town = None
+        # Prepare the genealogy, which records everyone's parents and marriages and answers kinship
+        # queries, e.g., for a person's cousins
+        self.genealogy = Genealogy()
+        # Prepare a cache of how people are related to one another (see Person.relation_to_me())
+        self.relation_cache = RelationCache()
+        # Prepare the log of everyone's whereabouts on every timestep (see Person.go_to())
+        self.whereabouts_log = WhereaboutsLog()
+        # If so configured, keep the numeric attributes of all relationships in a columnar store
+        if self.config.use_columnar_relationship_store:
+            self.relationship_store = RelationshipStore(sim=self)
+        else:
+            self.relationship_store = None
+        # Prepare statistics about the hiring chains that play out in the town (see JobMarket.complete_hiring_chain())
+        self.hiring_stats = HiringStats()
         # Prepare a listing of all simulated events, which will facilitate debugging later
         self.events = []
         # A simulation's event number allows the precise ordering of events that
@@ -40,6 +67,10 @@ class Simulation(object):
         # we need to perform a check every March 1 to ensure that all leap-year babies
         # celebrate their birthday that day on non-leap years
         self.birthdays = {(2, 29): set()}
+        # Prepare a heap of (due date, person ID, person) tuples for all pregnancies, which is pushed
+        # to whenever someone gets pregnant; pregnancies that end otherwise than in birth (i.e., because
+        # the person died or left town) are simply discarded once they come due
+        self.pregnancies = []
         # Prepare a number that will hold a single random number that is generated daily -- this
         # facilitates certain things that should be determined randomly but remain constant across
         # a timestep, e.g., whether a person locked their door before leaving home
@@ -48,6 +79,9 @@ class Simulation(object):
         # Keep track of some metadata about timesteps that have actually been simulated
         self.last_simulated_day = self.ordinal_date
         self.n_simulated_timesteps = 0
+        # Thresholds on normalized charge and spark values, translated into raw space for the current
+        # timestep, so that raw values can be compared against them directly
+        self.raw_thresholds = RawThresholds(sim=self)
         # Prepare a story recognizer -- this a module whose job is to excavate nuggets of dramatic
         # intrigue from the raw emergent material generated by this simulation
         self.story_recognizer = StoryRecognizer(simulation=self)
@@ -67,14 +101,21 @@ class Simulation(object):
         for recent_event in self.events[-5:]:
             print recent_event
 
+    def save_checkpoint(self, filename):
+        """Save the complete state of this simulation to a checkpoint file, from which it may be resumed."""
+        checkpoint.save(sim=self, filename=filename)
+
+    @staticmethod
+    def load_checkpoint(filename):
+        """Return a simulation resumed from a checkpoint file written by Simulation.save_checkpoint()."""
+        return checkpoint.load(filename=filename)
+
     def establish_setting(self):
         """Establish the town that will be simulated."""
         # Generate a town plan with at least two tracts
         print "Generating a town..."
         time.sleep(0.7)
-        self.town = Town(self)
-        while len(self.town.tracts) < 2:
-            self.town = Town(self)
+        self.town = self._generate_town_plan()
         # Have families establish farms on all of the town tracts except one,
         # which will be a cemetery
         for i in xrange(len(self.town.tracts)-2):
@@ -112,6 +153,46 @@ class Simulation(object):
         n_timesteps_until_worldgen_ends = n_days_until_worldgen_ends * 2
         self.simulate(n_timesteps=n_timesteps_until_worldgen_ends)
 
+    def _generate_town_plan(self):
+        """Generate a town plan with at least two tracts, or load it from the town-layout cache."""
+        cache_filename = None
+        if self.config.town_layout_cache_directory:
+            cache_filename = self._town_layout_cache_filename()
+            if os.path.exists(cache_filename):
+                with open(cache_filename, 'rb') as f:
+                    cached = cPickle.loads(zlib.decompress(f.read()))
+                if cached['layout']['version'] == TOWN_LAYOUT_FORMAT_VERSION:
+                    # Pick up the random number generator where the original generation left it,
+                    # so that the rest of this simulation unfolds just as it would have otherwise
+                    random.setstate(cached['random_state'])
+                    return Town(self, layout=cached['layout'])
+        town = Town(self)
+        while len(town.tracts) < 2:
+            town = Town(self)
+        if cache_filename:
+            cached = {'layout': town.serialize_layout(), 'random_state': random.getstate()}
+            if not os.path.isdir(self.config.town_layout_cache_directory):
+                os.makedirs(self.config.town_layout_cache_directory)
+            with open(cache_filename, 'wb') as f:
+                f.write(zlib.compress(cPickle.dumps(cached, cPickle.HIGHEST_PROTOCOL)))
+        return town
+
+    def _town_layout_cache_filename(self):
+        """Return the path to the town-layout cache file for this simulation's seed and layout config.
+
+        Rather than config.seed itself, the key uses the current state of the random number generator,
+        which follows from the seed but also reflects any random draws (or reseeding) that happened
+        before the town plan is to be generated.
+        """
+        config = self.config
+        layout_config = (
+            TOWN_LAYOUT_FORMAT_VERSION, config.town_scale, config.town_grid_size(config.town_scale),
+            config.town_n_loci(config.town_scale), config.town_n_quadtree_samples(config.town_scale),
+            config.chance_street_gets_numbered_name, config.chance_avenue_gets_numbered_name,
+        )
+        key = hashlib.md5(repr((layout_config, random.getstate()))).hexdigest()[:16]
+        return os.path.join(config.town_layout_cache_directory, 'town_{}.layout'.format(key))
+
     def _generate_name_for_town(self):
         """Generate a name for the town."""
         if random.random() < self.config.chance_town_gets_named_for_a_settler:
@@ -160,6 +241,9 @@ class Simulation(object):
 
     def simulate(self, n_timesteps=1):
         """Simulate activity in this town for the given number of timesteps."""
+        if self.config.skip_unsimulated_timesteps:
+            self._simulate_skipping_unsimulated_timesteps(n_timesteps=n_timesteps)
+            return
         for i in xrange(n_timesteps):
             # Do some basic bookkeeping, regardless of whether the timestep will be simulated
             self.advance_time()
@@ -179,6 +263,103 @@ class Simulation(object):
         sys.stdout.write('\r{}'.format(' '*94))  # Clear out the last sampled event written to stdout
         sys.stdout.write('\rWrapping up...')
 
+    def _simulate_skipping_unsimulated_timesteps(self, n_timesteps):
+        """Simulate activity in this town for the given number of timesteps, skipping over unsimulated ones.
+
+        Rather than rolling on each timestep for whether it will be simulated, this draws the number of
+        timesteps until the next simulated one from the corresponding geometric distribution. For the
+        timesteps in between, the bookkeeping that Simulation.simulate() otherwise does on every timestep
+        is scheduled up front: business openings and closings are drawn as the arrivals of the very same
+        per-timestep Bernoulli processes.
+        """
+        config = self.config
+        n_timesteps_remaining = n_timesteps
+        while n_timesteps_remaining:
+            n_timesteps_until_next_simulated_timestep = sample_geometric(config.chance_of_a_timestep_being_simulated)
+            n_timesteps_to_skip = min(n_timesteps_until_next_simulated_timestep, n_timesteps_remaining)
+            self._advance_through_timesteps(n_timesteps=n_timesteps_to_skip)
+            n_timesteps_remaining -= n_timesteps_to_skip
+            if n_timesteps_until_next_simulated_timestep == n_timesteps_to_skip:
+                self._simulate_timestep()
+            # Write out samples from the event stream to stdout
+            if self.events:
+                recent_event_str = str(random.choice(self.events[-10:]))[:94]
+                sys.stdout.write('\r' + recent_event_str.ljust(94))
+                sys.stdout.flush()
+        sys.stdout.write('\r{}'.format(' '*94))  # Clear out the last sampled event written to stdout
+        sys.stdout.write('\rWrapping up...')
+
+    def _advance_through_timesteps(self, n_timesteps):
+        """Advance time by the given number of timesteps, doing the bookkeeping for each one along the way.
+
+        Openings and closings of businesses are scheduled in terms of the number of timesteps from now,
+        and closings are rescheduled whenever the year changes, since that may change the chance of a
+        business closing (namely, if it becomes anachronistic); because these are memoryless processes,
+        rescheduling in this way does not alter the distribution of when businesses close.
+        """
+        config = self.config
+        business_openings = set()
+        timestep = sample_geometric(config.chance_a_business_opens_some_timestep)
+        while timestep <= n_timesteps:
+            business_openings.add(timestep)
+            timestep += sample_geometric(config.chance_a_business_opens_some_timestep)
+        business_closings = {}  # Maps timesteps to businesses that may close on them
+        next_potential_closing = {}  # Maps businesses to the timestep that they may next close on
+        businesses_already_scheduled = set(self.town.companies)
+        for business in businesses_already_scheduled:
+            self._schedule_potential_closing(business, 0, n_timesteps, business_closings, next_potential_closing)
+        # Whether the town has changed in a way that may call for an apartment complex, which is
+        # the case at the outset due to whatever happened on the last simulated timestep
+        town_changed = True
+        for timestep in xrange(1, n_timesteps+1):
+            year = self.year
+            self.advance_time()
+            if self.year != year:
+                business_closings = {}
+                for business in self.town.companies:
+                    self._schedule_potential_closing(
+                        business, timestep-1, n_timesteps, business_closings, next_potential_closing
+                    )
+            # Mirror Simulation._potentially_establish_a_new_business(), but with its roll already made
+            if town_changed or timestep in business_openings:
+                town_changed = self._potentially_establish_an_apartment_complex()
+                if not town_changed and timestep in business_openings:
+                    self._establish_a_new_business()
+                    town_changed = True
+            for business in business_closings.pop(timestep, ()):
+                if next_potential_closing.get(business) == timestep and business in self.town.companies:
+                    if self._potentially_shut_down_business(business=business):
+                        town_changed = True
+                    else:
+                        self._schedule_potential_closing(
+                            business, timestep, n_timesteps, business_closings, next_potential_closing
+                        )
+            if town_changed:
+                # Schedule the closings of any businesses that were just established
+                for business in self.town.companies - businesses_already_scheduled:
+                    businesses_already_scheduled.add(business)
+                    self._schedule_potential_closing(
+                        business, timestep, n_timesteps, business_closings, next_potential_closing
+                    )
+            self._simulate_births()
+
+    def _schedule_potential_closing(self, business, timestep, n_timesteps, business_closings, next_potential_closing):
+        """Schedule the next timestep after the given one on which the given business would roll to close down.
+
+        Nothing gets scheduled if that timestep would fall beyond the last of the given number of timesteps.
+        """
+        config = self.config
+        if business.demise <= self.year:
+            chance_of_closing = config.chance_a_business_shuts_down_on_timestep_after_its_demise
+        else:
+            chance_of_closing = config.chance_a_business_closes_some_timestep
+        timestep_of_potential_closing = timestep + sample_geometric(chance_of_closing)
+        if timestep_of_potential_closing <= n_timesteps:
+            business_closings.setdefault(timestep_of_potential_closing, []).append(business)
+            next_potential_closing[business] = timestep_of_potential_closing
+        else:
+            next_potential_closing.pop(business, None)
+
     def advance_time(self):
         """Advance time of day and date, if it's a new day."""
         # Update the time of day
@@ -230,51 +411,79 @@ class Simulation(object):
 
     def _simulate_births(self):
         """Simulate births, even if this timestep will not actually be simulated."""
-        for person in list(self.town.residents):
-            if person.pregnant:
-                if self.ordinal_date >= person.due_date:  # Not worth the computation to be realistic about late births
-                    if self.time_of_day == 'day':
-                        if random.random() < 0.5:
-                            person.give_birth()
-                    else:
-                        person.give_birth()
+        pregnancies = self.pregnancies
+        if not pregnancies or pregnancies[0][0] > self.ordinal_date:
+            return
+        due_pregnancies = []
+        while pregnancies and pregnancies[0][0] <= self.ordinal_date:
+            due_pregnancies.append(heapq.heappop(pregnancies))
+        for pregnancy in due_pregnancies:
+            due_date, _, person = pregnancy
+            # Discard pregnancies that have already ended, e.g., because the person died or left town
+            if person.pregnant and person.due_date == due_date and person in self.town.residents:
+                self._potentially_give_birth(person=person)
+                if person.pregnant:  # Not born yet, so check again next timestep
+                    heapq.heappush(pregnancies, pregnancy)
+
+    def register_pregnancy(self, person):
+        """Register that the given person has just gotten pregnant, so that they will give birth when due."""
+        heapq.heappush(self.pregnancies, (person.due_date, person.id, person))
+
+    def _potentially_give_birth(self, person):
+        """Have the given pregnant person potentially give birth, if they are due."""
+        if self.ordinal_date >= person.due_date:  # Not worth the computation to be realistic about late births
+            if self.time_of_day == 'day':
+                if random.random() < 0.5:
+                    person.give_birth()
+            else:
+                person.give_birth()
 
     def _potentially_establish_a_new_business(self):
         """Potentially have a new business get constructed in town."""
-        config = self.config
+        if not self._potentially_establish_an_apartment_complex():
+            if random.random() < self.config.chance_a_business_opens_some_timestep:
+                self._establish_a_new_business()
+
+    def _potentially_establish_an_apartment_complex(self):
+        """Establish an apartment complex if the town needs one, and return whether one was established."""
         # If there's less than 30 vacant homes in this town and no apartment complex
         # yet, have one open up
-        if len(self.town.vacant_lots) < 30 and not self.town.businesses_of_type('ApartmentComplex'):
+        if len(self.town.vacant_lots) < 30 and not self.town.businesses_of_type(ApartmentComplex):
             owner = self._determine_who_will_establish_new_business(business_type=ApartmentComplex)
             ApartmentComplex(owner=owner)
-        elif random.random() < config.chance_a_business_opens_some_timestep:
-            all_business_types = Business.__subclasses__()
-            type_of_business_that_will_open = None
-            tries = 0
-            while not type_of_business_that_will_open:
-                tries += 1
-                randomly_selected_type = random.choice(all_business_types)
-                advent, demise, min_pop = config.business_types_advent_demise_and_minimum_population[
-                    randomly_selected_type
-                ]
-                # Check if the business type is era-appropriate
-                if advent < self.year < demise and self.town.population > min_pop:
-                    # Check if there aren't already too many businesses of this type in town
-                    max_number_for_this_type = config.max_number_of_business_types_at_one_time[randomly_selected_type]
-                    if (len(self.town.businesses_of_type(randomly_selected_type.__name__)) <
-                            max_number_for_this_type):
-                        # Lastly, if this is a business that only forms on a tract, make sure
-                        # there is a vacant tract for it to be established upon
-                        need_tract = randomly_selected_type in config.companies_that_get_established_on_tracts
-                        if (need_tract and self.town.vacant_tracts) or not need_tract:
-                            type_of_business_that_will_open = randomly_selected_type
-                if self.town.population < 50 or tries > 10:  # Just not ready for more businesses yet -- grow naturally
-                    break
-            if type_of_business_that_will_open in config.public_company_types:
-                type_of_business_that_will_open(owner=self.town.mayor)
-            elif type_of_business_that_will_open:
-                owner = self._determine_who_will_establish_new_business(business_type=type_of_business_that_will_open)
-                type_of_business_that_will_open(owner=owner)
+            return True
+        return False
+
+    def _establish_a_new_business(self):
+        """Have a new business of some era-appropriate type get constructed in town, if possible."""
+        config = self.config
+        all_business_types = Business.__subclasses__()
+        type_of_business_that_will_open = None
+        tries = 0
+        while not type_of_business_that_will_open:
+            tries += 1
+            randomly_selected_type = random.choice(all_business_types)
+            advent, demise, min_pop = config.business_types_advent_demise_and_minimum_population[
+                randomly_selected_type
+            ]
+            # Check if the business type is era-appropriate
+            if advent < self.year < demise and self.town.population > min_pop:
+                # Check if there aren't already too many businesses of this type in town
+                max_number_for_this_type = config.max_number_of_business_types_at_one_time[randomly_selected_type]
+                if (len(self.town.businesses_of_type(randomly_selected_type)) <
+                        max_number_for_this_type):
+                    # Lastly, if this is a business that only forms on a tract, make sure
+                    # there is a vacant tract for it to be established upon
+                    need_tract = randomly_selected_type in config.companies_that_get_established_on_tracts
+                    if (need_tract and self.town.vacant_tracts) or not need_tract:
+                        type_of_business_that_will_open = randomly_selected_type
+            if self.town.population < 50 or tries > 10:  # Just not ready for more businesses yet -- grow naturally
+                break
+        if type_of_business_that_will_open in config.public_company_types:
+            type_of_business_that_will_open(owner=self.town.mayor)
+        elif type_of_business_that_will_open:
+            owner = self._determine_who_will_establish_new_business(business_type=type_of_business_that_will_open)
+            type_of_business_that_will_open(owner=owner)
 
     def _determine_who_will_establish_new_business(self, business_type):
         """Select a person who will establish a new business of the given type."""
@@ -325,7 +534,7 @@ class Simulation(object):
         return owner
 
     def _potentially_shut_down_businesses(self):
-        """Potentially have a new business get constructed in town."""
+        """Potentially have existing businesses in town shut down."""
         config = self.config
         chance_a_business_shuts_down_this_timestep = config.chance_a_business_closes_some_timestep
         chance_a_business_shuts_down_on_timestep_after_its_demise = (
@@ -335,17 +544,26 @@ class Simulation(object):
         for business in list(self.town.companies):
             if business.demise <= self.year:
                 if random.random() < chance_a_business_shuts_down_on_timestep_after_its_demise:
-                    if business.__class__ not in config.public_company_types:
-                        business.go_out_of_business(reason=None)
+                    self._potentially_shut_down_business(business=business)
             elif random.random() < chance_a_business_shuts_down_this_timestep:
-                if business.__class__ not in config.public_company_types:
-                    if not (
-                        # Don't shut down an apartment complex with people living in it,
-                        # or an apartment complex that's the only one in town
-                        business.__class__ is ApartmentComplex and business.residents or
-                        len(self.town.businesses_of_type('ApartmentComplex')) == 1
-                    ):
-                        business.go_out_of_business(reason=None)
+                self._potentially_shut_down_business(business=business)
+
+    def _potentially_shut_down_business(self, business):
+        """Shut down the given business, unless it is one that cannot close, and return whether it closed.
+
+        This gets called once a business has rolled to close down on this timestep.
+        """
+        if business.__class__ in self.config.public_company_types:
+            return False
+        if business.demise > self.year and (
+            # Don't shut down an apartment complex with people living in it,
+            # or an apartment complex that's the only one in town
+            business.__class__ is ApartmentComplex and business.residents or
+            len(self.town.businesses_of_type(ApartmentComplex)) == 1
+        ):
+            return False
+        business.go_out_of_business(reason=None)
+        return True
 
     def _simulate_timestep(self):
         """Simulate town activity for a single timestep."""
@@ -353,24 +571,47 @@ class Simulation(object):
         for person in list(self.town.residents):
             self._simulate_life_events_for_a_person_on_this_timestep(person=person)
         days_since_last_simulated_day = self.ordinal_date - self.last_simulated_day
-        # Reset all Relationship interacted_this_timestep attributes
-        for person in list(self.town.residents):
-            for other_person in person.relationships:
-                person.relationships[other_person].interacted_this_timestep = False
-        # Have people go to the location they will be at this timestep
-        for person in list(self.town.residents):
+        # Note: there's no need to reset whether relationships have been progressed, since each one
+        # records the timestep on which it was last progressed (see Relationship.__init__())
+        # Have people go to the location they will be at this timestep, noting who is socializing
+        # where; since enacting a routine only ever moves the person themself, the town's residents
+        # don't have to be copied here
+        people_socializing_at = {}
+        for person in self.town.residents:
             person.routine.enact()
+            if person.age > 3:  # Must be at least four years old to socialize
+                people_socializing_at.setdefault(person.location, []).append(person)
         # Have people initiate social interactions with one another
-        for person in list(self.town.residents):
-            # Person may have married (during an earlier iteration of this loop) and
-            # then immediately departed because the new couple could not find home,
-            # so we still have to make sure they actually live in the town currently before
-            # having them socialize
-            if person in self.town.residents:
-                if person.age > 3:  # Must be at least four years old to socialize
-                    person.socialize(missing_timesteps_to_account_for=days_since_last_simulated_day * 2)
+        self._simulate_social_interactions(
+            people_socializing_at=people_socializing_at,
+            missing_timesteps_to_account_for=days_since_last_simulated_day * 2
+        )
+        if self.relationship_store:
+            # Progress all the relationships of people who interacted on this timestep
+            self.relationship_store.progress_queued_interactions()
         self.last_simulated_day = self.ordinal_date
 
+    def _simulate_social_interactions(self, people_socializing_at, missing_timesteps_to_account_for):
+        """Have everyone in town initiate social interactions, one location at a time.
+
+        @param people_socializing_at: A dictionary mapping locations to the people socializing there.
+
+        The people at each location are listed only once, and then shared by everyone socializing
+        there, each of whom samples whom to interact with from that list.
+        """
+        for location, people_socializing_here in people_socializing_at.iteritems():
+            people_here_now = list(location.people_here_now) if location else None
+            for person in people_socializing_here:
+                # Person may have married (during an earlier iteration of this loop) and
+                # then immediately departed because the new couple could not find home,
+                # so we still have to make sure they actually live in the town currently before
+                # having them socialize
+                if person in self.town.residents:
+                    person.socialize(
+                        missing_timesteps_to_account_for=missing_timesteps_to_account_for,
+                        people_here_now=people_here_now
+                    )
+
     def _simulate_life_events_for_a_person_on_this_timestep(self, person):
         """Simulate the life of the given person on this timestep."""
         # First, we need to make sure that this person didn't already die or leave town
@@ -405,14 +646,16 @@ class Simulation(object):
         # and amount of time spent together; see relationship.py), and if a threshold
         # for mutual romantic affinity is eclipsed, they may marry (right on this timestep)
         if person.age >= self.config.marriageable_age:
-            min_mutual_spark_for_proposal = self.config.min_mutual_spark_value_for_someone_to_propose_marriage
+            min_mutual_raw_spark_for_proposal = self.raw_thresholds.spark_above(
+                self.config.min_mutual_spark_value_for_someone_to_propose_marriage
+            )
             people_they_have_strong_romantic_feelings_for = [
-                p for p in person.relationships if person.relationships[p].spark > min_mutual_spark_for_proposal
+                p for p in person.relationships if person.relationships[p].raw_spark > min_mutual_raw_spark_for_proposal
             ]
             for prospective_partner in people_they_have_strong_romantic_feelings_for:
                 if prospective_partner.age >= self.config.marriageable_age:
                     if prospective_partner.present and not prospective_partner.spouse:
-                        if prospective_partner.relationships[person].spark > min_mutual_spark_for_proposal:
+                        if prospective_partner.relationships[person].raw_spark > min_mutual_raw_spark_for_proposal:
                             person.marry(partner=prospective_partner)
                             break
 
@@ -460,6 +703,7 @@ class Simulation(object):
             if (not person.college_graduate and person.age > 22 and
                     person.male if self.year < 1920 else True):
                 person.college_graduate = True
+                self.town.job_market.update(person=person)
             elif random.random() < self.config.chance_an_unemployed_person_departs_on_a_simulated_timestep:
                 if not (person.spouse and person.spouse.occupation):
                     person.depart_town()
@@ -513,7 +757,6 @@ class Simulation(object):
     def find_co(self, name):
         """Return company in this town with the given name."""
         try:
-            company = next(c for c in self.town.companies if c.name == name)
-            return company
-        except StopIteration:
+            return self.town.companies_by_name[name]
+        except KeyError:
             raise Exception('There is no company in {} named {}'.format(self.town.name, name))
\ No newline at end of file
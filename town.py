@@ -1,22 +1,36 @@
 import random
+import array
+import math
+import itertools
+import operator
 from business import *
 from residence import *
 from occupation import *
 import pyqtree
 from random import gauss,randrange
 from corpora import Names
+from job_market import JobMarket
 from config import Config
-import heapq
+
+
+# Sentinel for parcel pairs that have no path between them in Town.parcel_distances
+UNREACHABLE_PARCEL_DISTANCE = 0xFFFF
+# Version of the record produced by Town.serialize_layout(); bump this whenever that changes
+TOWN_LAYOUT_FORMAT_VERSION = 1
 
 
 class Town(object):
-    """A procedurally generated American small town on a 9x9 grid of city blocks.
+    """A procedurally generated American small town on a grid of city blocks (9x9 at the default scale).
 
     Most of the code for this class was written by Adam Summerville.
     """
 
-    def __init__(self, sim):
-        """Initialize a Town object."""
+    def __init__(self, sim, layout=None):
+        """Initialize a Town object.
+
+        @param layout: A town plan previously serialized by Town.serialize_layout(); if one is
+                       passed, it is restored rather than a new town plan being generated.
+        """
         self.sim = sim
         self.founded = sim.year
         self.settlers = set()  # Will get added to during Simulation.establish_setting()
@@ -25,6 +39,23 @@ class Town(object):
         self.deceased = set()  # People who died in in the town
         self.companies = set()
         self.former_companies = set()
+        # Registries of current companies by type (keyed by both class and class name, which
+        # share the same list) and by name; these are kept up to date by Town.add_company(),
+        # Town.remove_company(), and Town.index_company_name()
+        self.companies_of_type = {}
+        self.companies_by_name = {}
+        # Registry of current occupations by class, which is kept up to date by Occupation.__init__()
+        # and Occupation.terminate()
+        self.occupations_of_type = {}
+        # Index of the people who may be candidates for job openings, which is kept up to date by
+        # calls to JobMarket.update() wherever someone's standing on the job market may change
+        self.job_market = JobMarket(town=self)
+        # Index of the supplemental job vacancies at companies in town, which maps (occupation class,
+        # shift) tuples to dictionaries mapping companies with such vacancies to their priorities (i.e.,
+        # where the first such vacancy falls in the company's list for that shift); this is kept up to
+        # date by Town.update_supplemental_vacancies() as companies' vacancies get filled and reopened
+        self.supplemental_vacancies = {}
+        self.supplemental_vacancy_priorities = {}  # Maps (company, shift) tuples to their indexed priorities
         self.lots = set()
         self.tracts = set()
         self.dwelling_places = set()  # Both houses and apartment units (not complexes)
@@ -32,39 +63,68 @@ class Town(object):
         self.streets = set()
         self.parcels = set()
         self.blocks = set()
-        self.generate_lots(sim.config)
+        if layout:
+            self._restore_layout(layout)
+        else:
+            self._generate_layout()
+        # Vacant lots, tracts, and homes, which are kept up to date (by Town.update_vacancy_of_lot() and
+        # Town.update_vacancy_of_home()) as buildings are constructed and demolished and as people move
+        self.vacant_lots = set(self.lots)
+        self.vacant_tracts = set(self.tracts)
+        self.vacant_homes = set()
+        self.name = None  # Gets set by Simulation.establish_setting() so that it may be named after an early settler
+        # These get set when these businesses get established (by their __init__() magic methods)
+        self.cemetery = None
+        self.city_hall = None
+        self.fire_station = None
+        self.hospital = None
+        self.police_station = None
+        self.school = None
+        self.university = None
+
+    def _generate_layout(self):
+        """Generate a new town plan: its streets, parcels, city blocks, lots, and tracts."""
+        self.generate_lots(self.sim.config)
         for lot in self.lots | self.tracts:
             lot.set_neighboring_lots_for_town_generation()
             lot.init_generate_address()
         # Survey all town lots to instantiate conventional city blocks
+        blocks_by_number_and_street = {}
         for lot in self.lots | self.tracts:
             number, street = lot.parcel_address_is_on.number, lot.parcel_address_is_on.street
-            try:
-                city_block = next(b for b in self.blocks if b.number == number and b.street is street)
-                city_block.lots.append(lot)
-                lot.block = city_block
-            except StopIteration:
+            city_block = blocks_by_number_and_street.get((number, street))
+            if not city_block:
                 city_block = Block(number=number, street=street)
                 self.blocks.add(city_block)
-                city_block.lots.append(lot)
-                lot.block = city_block
+                blocks_by_number_and_street[(number, street)] = city_block
+            city_block.lots.append(lot)
+            lot.block = city_block
         for block in self.blocks:
             block.lots.sort(key=lambda lot: lot.house_number)
         # Fill in any missing blocks, which I think gets caused by tracts being so large
         # in some cases; these blocks will not have any lots on them, so they'll never
         # have buildings on them, but it makes town navigation more natural during simplay
         for street in self.streets:
+            if not street.blocks:  # Can happen in towns generated at larger scales
+                continue
             street.blocks.sort(key=lambda block: block.number)
-            current_block_number = min(street.blocks, key=lambda block: block.number).number
-            largest_block_number = max(street.blocks, key=lambda block: block.number).number
+            current_block_number = street.blocks[0].number
+            largest_block_number = street.blocks[-1].number
+            block_numbers_on_this_street = {b.number for b in street.blocks}
             while current_block_number != largest_block_number:
                 current_block_number += 100
-                if not any(b for b in street.blocks if b.number == current_block_number):
+                if current_block_number not in block_numbers_on_this_street:
                     self.blocks.add(Block(number=current_block_number, street=street))
             # Sort one last time to facilitate easy navigation during simplay
             street.blocks.sort(key=lambda block: block.number)
-        self.paths = {}
+        self.parcel_distances = []  # Gets set by generatePaths()
         self.generatePaths()
+        # Derive from those the distance between every pair of lots, which is what
+        # the rest of the simulation actually reasons over
+        self.first_lot_id = None  # These three get set by _generate_lot_distances()
+        self.n_lots = 0
+        self.lot_distances = None
+        self._generate_lot_distances()
         # Determine coordinates for each lot in the town, which are critical for
         # graphically displaying the town
         self._determine_lot_coordinates()
@@ -77,19 +137,135 @@ class Town(object):
             if density > highest_density:
                 highest_density = density
                 self.downtown = lot
-        self.name = None  # Gets set by Simulation.establish_setting() so that it may be named after an early settler
         # Finally, reset the neighboring lots to all lots to be the other
         # lots on the same city block
         for lot in self.lots:
             lot.init_set_neighbors_lots_as_other_lots_on_same_city_block()
-        # These get set when these businesses get established (by their __init__() magic methods)
-        self.cemetery = None
-        self.city_hall = None
-        self.fire_station = None
-        self.hospital = None
-        self.police_station = None
-        self.school = None
-        self.university = None
+
+    def serialize_layout(self):
+        """Return a compact, picklable record of this town's plan, from which it can be restored.
+
+        This is meant to be called just after the town plan has been generated, before any
+        people or businesses exist; streets, parcels, city blocks, and lots reference one
+        another by ID (city blocks, which have no IDs, by their index in the record).
+        """
+        streets = sorted(self.streets, key=lambda street: street.id)
+        parcels = sorted(self.parcels, key=lambda parcel: parcel.id)
+        blocks = sorted(self.blocks, key=lambda block: (block.street.id, block.number))
+        block_indices = {block: i for i, block in enumerate(blocks)}
+        lots = sorted(self.lots | self.tracts, key=lambda lot: lot.id)
+        layout = {
+            'version': TOWN_LAYOUT_FORMAT_VERSION,
+            # Where the ID counters stood after this plan was generated
+            'counters': (Street.counter, Parcel.counter, Lot.counter),
+            'streets': [
+                (street.id, street.number, street.direction, street.name, street.starting_parcel,
+                 street.ending_parcel, [block_indices[block] for block in street.blocks])
+                for street in streets
+            ],
+            'parcels': [
+                (parcel.id, parcel.street.id, parcel.number, parcel.coords, [lot.id for lot in parcel.lots],
+                 [neighbor.id for neighbor in parcel.neighbors], parcel.index)
+                for parcel in parcels
+            ],
+            'blocks': [(block.number, block.street.id, [lot.id for lot in block.lots]) for block in blocks],
+            'lots': [
+                (lot.id, lot.size if lot.tract else None, [street.id for street in lot.streets],
+                 [parcel.id for parcel in lot.parcels], block_indices[lot.block], lot.sides_of_street,
+                 lot.house_numbers, lot.positions_in_city_blocks, sorted(l.id for l in lot.neighboring_lots),
+                 lot.coordinates, lot.house_number, lot.address, lot.index_of_street_address_will_be_on)
+                for lot in lots
+            ],
+            'parcel_distances': ''.join(row.tostring() for row in self.parcel_distances),
+            'lot_distances': self.lot_distances.tostring(),
+            'downtown': self.downtown.id,
+        }
+        return layout
+
+    def _restore_layout(self, layout):
+        """Restore a town plan from a record produced by Town.serialize_layout()."""
+        assert layout['version'] == TOWN_LAYOUT_FORMAT_VERSION, "This town layout was saved in an outdated format."
+        # Make sure that objects generated from here on out do not collide with the restored ones
+        street_counter, parcel_counter, lot_counter = layout['counters']
+        Street.counter = max(Street.counter, street_counter)
+        Parcel.counter = max(Parcel.counter, parcel_counter)
+        Lot.counter = max(Lot.counter, lot_counter)
+        # Instantiate all the objects first, bypassing their __init__() methods (which would
+        # generate them anew), and then wire up their references to one another
+        streets, parcels, lots = {}, {}, {}
+        for street_record in layout['streets']:
+            street = Street.__new__(Street)
+            street.id, street.number, street.direction, street.name = street_record[:4]
+            street.starting_parcel, street.ending_parcel = street_record[4:6]
+            street.town = self
+            streets[street.id] = street
+        for parcel_record in layout['parcels']:
+            parcel = Parcel.__new__(Parcel)
+            parcel.id, parcel.number, parcel.coords, parcel.index = (
+                parcel_record[0], parcel_record[2], parcel_record[3], parcel_record[6]
+            )
+            parcel.street = streets[parcel_record[1]]
+            parcels[parcel.id] = parcel
+        for lot_record in layout['lots']:
+            lot_id, tract_size = lot_record[:2]
+            lot = Lot.__new__(Lot) if tract_size is None else Tract.__new__(Tract)
+            lot.id = lot_id
+            lot.lot = tract_size is None
+            lot.tract = not lot.lot
+            if lot.tract:
+                lot.size = tract_size
+            lot.town = self
+            lot.building = None
+            lot.former_buildings = []
+            lots[lot.id] = lot
+        blocks = []
+        for number, street_id, lot_ids in layout['blocks']:
+            block = Block.__new__(Block)
+            block.number = number
+            block.street = streets[street_id]
+            block.lots = [lots[lot_id] for lot_id in lot_ids]
+            block.type = 'block'
+            if block.street.direction in ('N', 'S'):
+                block.starting_coordinates = (block.street.number, block.number/100)
+                block.ending_coordinates = (block.starting_coordinates[0], block.starting_coordinates[1]+1)
+            else:
+                block.starting_coordinates = (block.number/100, block.street.number)
+                block.ending_coordinates = (block.starting_coordinates[0]+1, block.starting_coordinates[1])
+            blocks.append(block)
+        for street_record in layout['streets']:
+            streets[street_record[0]].blocks = [blocks[i] for i in street_record[6]]
+        for parcel_record in layout['parcels']:
+            parcel = parcels[parcel_record[0]]
+            parcel.lots = [lots[lot_id] for lot_id in parcel_record[4]]
+            parcel.neighbors = [parcels[parcel_id] for parcel_id in parcel_record[5]]
+        for lot_record in layout['lots']:
+            lot = lots[lot_record[0]]
+            lot.streets = [streets[street_id] for street_id in lot_record[2]]
+            lot.parcels = [parcels[parcel_id] for parcel_id in lot_record[3]]
+            lot.block = blocks[lot_record[4]]
+            lot.sides_of_street, lot.house_numbers, lot.positions_in_city_blocks = lot_record[5:8]
+            lot.neighboring_lots = {lots[lot_id] for lot_id in lot_record[8]}
+            lot.coordinates, lot.house_number, lot.address, lot.index_of_street_address_will_be_on = lot_record[9:]
+            lot.street_address_is_on = lot.streets[lot.index_of_street_address_will_be_on]
+            lot.parcel_address_is_on = lot.parcels[lot.index_of_street_address_will_be_on]
+        self.streets = set(streets.itervalues())
+        self.parcels = set(parcels.itervalues())
+        self.blocks = set(blocks)
+        self.lots = {lot for lot in lots.itervalues() if lot.lot}
+        self.tracts = {lot for lot in lots.itervalues() if lot.tract}
+        # Restore the distance matrices
+        n_parcels = len(parcels)
+        all_parcel_distances = array.array('H')
+        all_parcel_distances.fromstring(layout['parcel_distances'])
+        self.parcel_distances = [
+            all_parcel_distances[i*n_parcels:(i+1)*n_parcels] for i in xrange(n_parcels)
+        ]
+        self.first_lot_id = min(lots)
+        self.n_lots = len(lots)
+        self.lot_distances = array.array('H')
+        self.lot_distances.fromstring(layout['lot_distances'])
+        self.downtown = lots[layout['downtown']]
+        self.mayor = None
 
     def __str__(self):
         """Return the town's name and population."""
@@ -172,40 +348,112 @@ class Town(object):
         return self.distance_between(lot,self.downtown)
 
     def generatePaths(self):
-        for start in self.parcels:
-            for goal in self.parcels:
-                if (start == goal):
-                     self.paths[(start,goal)] = 0
-                else :
-                    if ((start,goal) not in self.paths):
-                        came_from, cost_so_far = Town.a_star_search(start, goal)
-                        current  = goal
-                        count = 0
-                        while (current != start):
-                            current = came_from[current]
-                            count += 1
-                        self.paths[(start,goal)] =count
-                        self.paths[(goal,start)] =count
-                        
+        """Determine the distance (in parcel hops) between every pair of parcels in this town.
+
+        Because the parcel graph is unweighted, a single breadth-first search from each
+        parcel yields its distance to every other parcel; the results are stored in a dense
+        matrix, self.parcel_distances, whose rows and columns are indexed by Parcel.index.
+        """
+        parcels = sorted(self.parcels, key=lambda p: p.id)
+        for index, parcel in enumerate(parcels):
+            parcel.index = index
+        n_parcels = len(parcels)
+        unreached = UNREACHABLE_PARCEL_DISTANCE
+        self.parcel_distances = []
+        for start in parcels:
+            row = array.array('H', [unreached]) * n_parcels
+            row[start.index] = 0
+            frontier = [start]
+            distance = 0
+            while frontier:
+                distance += 1
+                next_frontier = []
+                for parcel in frontier:
+                    for neighbor in parcel.neighbors:
+                        if row[neighbor.index] == unreached:
+                            row[neighbor.index] = distance
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+            self.parcel_distances.append(row)
+
+    def _generate_lot_distances(self):
+        """Determine the distance between every pair of lots (including tracts) in this town.
+
+        The results are stored in a flat matrix, self.lot_distances, whose rows and columns are
+        keyed by Lot.id (offset by the ID of this town's first lot, since lot IDs are assigned
+        contiguously as a town's lots are generated).
+        """
+        lots = sorted(self.lots | self.tracts, key=lambda l: l.id)
+        self.first_lot_id = first_lot_id = lots[0].id
+        self.n_lots = n_lots = len(lots)
+        assert lots[-1].id - first_lot_id == n_lots - 1, "The IDs of a town's lots must be contiguous."
+        # Every lot (but not every tract) is on either one or two parcels, so its distance to some
+        # other lot is the lesser of two entries in that lot's row of parcel distances; we prepare
+        # getters that pull those entries for all lots at once, and then handle tracts on their own
+        get_distances_to_first_parcels = operator.itemgetter(*[lot.parcels[0].index for lot in lots])
+        get_distances_to_last_parcels = operator.itemgetter(*[lot.parcels[-1].index for lot in lots])
+        tracts = [
+            (tract.id-first_lot_id, [parcel.index for parcel in tract.parcels]) for tract in lots
+            if len(tract.parcels) > 2
+        ]
+        self.lot_distances = array.array('H')
+        for lot in lots:
+            if len(lot.parcels) == 1:
+                distances_to_parcels = self.parcel_distances[lot.parcels[0].index]
+            else:
+                distances_to_parcels = map(min, *[self.parcel_distances[parcel.index] for parcel in lot.parcels])
+            row = [
+                d1 if d1 < d2 else d2 for d1, d2 in itertools.izip(
+                    get_distances_to_first_parcels(distances_to_parcels),
+                    get_distances_to_last_parcels(distances_to_parcels)
+                )
+            ]
+            for tract_index, parcel_indices in tracts:
+                row[tract_index] = min(distances_to_parcels[i] for i in parcel_indices)
+            self.lot_distances.extend(row)
+
     def distance_between(self, lot1, lot2):
-        min_dist = float("inf")
-        for parcel in lot1.parcels:
-            for other_parcel in lot2.parcels:
-                if self.paths[(parcel, other_parcel)] < min_dist:
-                    min_dist = self.paths[(parcel, other_parcel)]
-        return min_dist
+        """Return the number of parcel hops between the closest parcels of the two given lots."""
+        return self.lot_distances[(lot1.id - self.first_lot_id) * self.n_lots + lot2.id - self.first_lot_id]
+
+    def distances_from(self, lot, other_lots):
+        """Return a list of the distances between the given lot and each of the given other lots, in order."""
+        offset = (lot.id - self.first_lot_id) * self.n_lots - self.first_lot_id
+        lot_distances = self.lot_distances
+        return [lot_distances[offset + other_lot.id] for other_lot in other_lots]
+
+    def pulls_toward(self, lots, sources):
+        """Return a list of the total pull toward each of the given lots exerted by the given sources.
+
+        A source at some lot pulls toward another lot with its strength divided by one more than the
+        distance between the two.
+
+        @param lots: A sequence of lots (or tracts).
+        @param sources: A sequence of (lot, strength) tuples.
+        """
+        first_lot_id, n_lots, lot_distances = self.first_lot_id, self.n_lots, self.lot_distances
+        columns = [lot.id - first_lot_id for lot in lots]
+        pulls = [0] * len(columns)
+        for source_lot, strength in sources:
+            start = (source_lot.id - first_lot_id) * n_lots
+            pulls = [
+                pull + strength / (lot_distances[start + column] + 1.0)
+                for pull, column in itertools.izip(pulls, columns)
+            ]
+        return pulls
 
     def nearest_business_of_type(self, lot, business_type):
-        """Return the Manhattan distance between this lot and the nearest company of the given type.
+        """Return the company of the given type that is nearest to this lot.
 
-        @param business_type: The Class representing the type of company in question.
+        @param business_type: The Class representing the type of company in question, or a string of its name.
         """
         businesses_of_this_type = self.businesses_of_type(business_type)
         if businesses_of_this_type:
-            return min(businesses_of_this_type, key=lambda b: self.distance_between(lot, b.lot))
+            distances = self.distances_from(lot, [b.lot for b in businesses_of_this_type])
+            return businesses_of_this_type[distances.index(min(distances))]
         else:
             return None
-        
+
     def dist_to_nearest_business_of_type(self, lot, business_type, exclusion):
         """Return the Manhattan distance between this lot and the nearest company of the given type.
 
@@ -214,11 +462,11 @@ class Town(object):
                           are the ones making the call to this method, as they try to decide where
                           to put their lot.
         """
-        distances = [
-            self.distance_between(lot, company.lot) for company in self.companies if isinstance(company, business_type)
-            and company is not exclusion
+        lots_of_companies_of_this_type = [
+            company.lot for company in self.businesses_of_type(business_type) if company is not exclusion
         ]
-        if distances:
+        if lots_of_companies_of_this_type:
+            distances = self.distances_from(lot, lots_of_companies_of_this_type)
             return max(99, min(distances))  # Elsewhere, a max of 99 is relied on
         else:
             return None
@@ -260,13 +508,16 @@ class Town(object):
         return tertiary_density
         
     def generate_lots(self, config):
-        loci = 3
-        samples = 32
-        size = 16
+        # Determine the dimensions of the town from its configured scale; the quadtree is
+        # allowed to subdivide down to 2x2 cells, which is the size of a single city block
+        loci = config.town_n_loci(config.town_scale)
+        samples = config.town_n_quadtree_samples(config.town_scale)
+        size = config.town_grid_size(config.town_scale)
+        assert size >= 2 and size & (size-1) == 0, "The town grid size must be a power of two."
         lociLocations = []
         for ii in range(loci):
             lociLocations.append([gauss(size/2.0,size/6.0), gauss(size/2.0,size/6.0)])
-        tree = pyqtree.Index(bbox=[0,0,size,size])
+        tree = pyqtree.Index(bbox=[0,0,size,size], max_depth=int(math.log(size, 2))-1)
         for ii in range(samples):
             center = lociLocations[randrange(len(lociLocations))]
             point = [clamp(gauss(center[0],size/6.0),0,size-1),clamp(gauss(center[1],size/6.0),0,size-1)]
@@ -280,8 +531,8 @@ class Town(object):
         lots = []
         tracts =[]
             
-        nsEnd = []
-        ewEnd = []
+        nsEnd = set()
+        ewEnd = set()
         streets = []
         
         def traverseTree(node):
@@ -310,7 +561,7 @@ class Town(object):
                     while end in nsstreets:
                         end = nsstreets[end]
                     if (end not in nsEnd):
-                        nsEnd.append(end)             
+                        nsEnd.add(end)             
                         streets.append(['ns',start, end])
                 if street in ewstreets:
                     start = street
@@ -318,7 +569,7 @@ class Town(object):
                     while end in ewstreets:
                         end = ewstreets[end]
                     if (end not in ewEnd):
-                        ewEnd.append(end)             
+                        ewEnd.add(end)             
                         streets.append(['ew',start, end])         
         
         nsStreets = {}
@@ -535,24 +786,6 @@ class Town(object):
         houses = {d for d in self.dwelling_places if d.__class__ is House}
         return houses | self.companies
 
-    @property
-    def vacant_lots(self):
-        """Return all vacant lots in the town."""
-        vacant_lots = [lot for lot in self.lots if not lot.building]
-        return vacant_lots
-
-    @property
-    def vacant_tracts(self):
-        """Return all vacant tracts in the town."""
-        vacant_tracts = [tract for tract in self.tracts if not tract.building]
-        return vacant_tracts
-
-    @property
-    def vacant_homes(self):
-        """Return all vacant homes in the town."""
-        vacant_homes = [home for home in self.dwelling_places if not home.residents]
-        return vacant_homes
-
     @property
     def all_time_residents(self):
         """Return everyone who has at one time lived in the town."""
@@ -561,60 +794,85 @@ class Town(object):
     @property
     def unemployed(self):
         """Return unemployed (mostly young) people, excluding retirees."""
-        unemployed_people = set()
-        for resident in self.residents:
-            if not resident.occupation and not resident.retired:
-                if resident.in_the_workforce:
-                    unemployed_people.add(resident)
-        return unemployed_people
+        return set(self.job_market.unemployed)
 
     def workers_of_trade(self, occupation):
         """Return all population in the town who practice to given occupation.
 
         @param occupation: The class pertaining to the occupation in question.
         """
-        return [resident for resident in self.residents if isinstance(resident.occupation, occupation)]
+        return [
+            employee.person for employee in self.occupations_of_type.get(occupation, ())
+            if employee.person.occupation is employee and employee.person in self.residents
+        ]
+
+    def update_vacancy_of_lot(self, lot):
+        """Update whether the given lot or tract is listed as vacant, given that a building went up or came down."""
+        vacant_lots_or_tracts = self.vacant_tracts if lot in self.tracts else self.vacant_lots
+        if lot.building:
+            vacant_lots_or_tracts.discard(lot)
+        else:
+            vacant_lots_or_tracts.add(lot)
+
+    def update_vacancy_of_home(self, home):
+        """Update whether the given home is listed as vacant, given that its residents or existence changed."""
+        if home.residents or home not in self.dwelling_places:
+            self.vacant_homes.discard(home)
+        else:
+            self.vacant_homes.add(home)
+
+    def update_supplemental_vacancies(self, company, shift):
+        """Reindex a company's supplemental job vacancies for a shift, given that they (or the company) changed."""
+        priorities = {}
+        if company in self.companies:
+            for priority, position in enumerate(company.supplemental_vacancies[shift]):
+                priorities.setdefault(position, priority)
+        for position in self.supplemental_vacancy_priorities.pop((company, shift), ()):
+            del self.supplemental_vacancies[(position, shift)][company]
+        for position, priority in priorities.iteritems():
+            self.supplemental_vacancies.setdefault((position, shift), {})[company] = priority
+        if priorities:
+            self.supplemental_vacancy_priorities[(company, shift)] = priorities
 
     def businesses_of_type(self, business_type):
         """Return all business in this town of the given type.
 
-        @param business_type: A string of the Class name representing the type of business in question.
-        """
-        businesses_of_this_type = [
-            company for company in self.companies if company.__class__.__name__ == business_type
-        ]
-        return businesses_of_this_type
-
-    @staticmethod
-    def heuristic(a, b):
-        (x1, y1) = a.coords
-        (x2, y2) = b.coords
-        return abs(x1 - x2) + abs(y1 - y2)
+        Note: this returns the registry's own (live) list, which callers must not modify.
 
-    @staticmethod
-    def a_star_search(start, goal):
-        frontier = PriorityQueue()
-        frontier.put(start, 0)
-        came_from = {}
-        cost_so_far = {}
-        came_from[start] = None
-        cost_so_far[start] = 0
-        
-        while not frontier.empty():
-            current = frontier.get()
-            
-            if current == goal:
-                break
-            
-            for next in current.neighbors:
-                new_cost = cost_so_far[current] + 1
-                if next not in cost_so_far or new_cost < cost_so_far[next]:
-                    cost_so_far[next] = new_cost
-                    priority = new_cost + Town.heuristic(goal, next)
-                    frontier.put(next, priority)
-                    came_from[next] = current
-        
-        return came_from, cost_so_far
+        @param business_type: The Class representing the type of business in question, or
+                              a string of its name.
+        """
+        return self.companies_of_type.get(business_type, [])
+
+    def add_company(self, company):
+        """Add a newly established company to this town."""
+        self.companies.add(company)
+        companies_of_this_type = self.companies_of_type.get(company.__class__)
+        if companies_of_this_type is None:
+            companies_of_this_type = self.companies_of_type[company.__class__] = []
+            self.companies_of_type[company.__class__.__name__] = companies_of_this_type
+        companies_of_this_type.append(company)
+
+    def remove_company(self, company):
+        """Remove a company that has gone out of business from this town."""
+        self.companies.remove(company)
+        self.former_companies.add(company)
+        self.companies_of_type[company.__class__].remove(company)
+        if self.companies_by_name.get(company.name) is company:
+            del self.companies_by_name[company.name]
+        for shift in ('day', 'night'):
+            self.update_supplemental_vacancies(company=company, shift=shift)
+
+    def index_company_name(self, company, former_name=None):
+        """Index a current company under its (potentially new) name.
+
+        @param former_name: The name the company went by previously, if it has been renamed.
+        """
+        if company not in self.companies:
+            return
+        if former_name is not None and self.companies_by_name.get(former_name) is company:
+            del self.companies_by_name[former_name]
+        self.companies_by_name[company.name] = company
 
 
 class Street(object):
@@ -641,6 +899,9 @@ class Street(object):
             1: '1st', 2: '2nd', 3: '3rd', 4: '4th', 5: '5th',
             6: '6th', 7: '7th', 8: '8th', 9: '9th'
         }
+        if number not in number_to_ordinal:  # Only happens in towns generated at larger scales
+            suffix = 'th' if 10 <= number % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+            number_to_ordinal[number] = '{}{}'.format(number, suffix)
         if direction == 'E' or direction == 'W':
             street_type = 'Street'
             if random.random() < config.chance_street_gets_numbered_name:
@@ -682,6 +943,7 @@ class Parcel(object):
         self.lots = []
         self.neighbors = []
         self.coords = coords
+        self.index = None  # Row/column of this parcel in Town.parcel_distances; set by Town.generatePaths()
 
     @staticmethod
     def determine_house_numbering(block_number, side_of_street, config):
@@ -846,22 +1108,5 @@ class Tract(Lot):
         super(Tract, self).__init__(town)
 
 
-class PriorityQueue:
-    """A helper class used when generating a town layout."""
-
-    def __init__(self):
-        """Initialize a PriorityQueue object."""
-        self.elements = []
-    
-    def empty(self):
-        return len(self.elements) == 0
-    
-    def put(self, item, priority):
-        heapq.heappush(self.elements, (priority, item))
-    
-    def get(self):
-        return heapq.heappop(self.elements)[1]
-
-
 def clamp(val, minimum, maximum):
     return max(minimum, min(val, maximum))
\ No newline at end of file
@@ -1,3 +1,8 @@
+import sys
+import math
+import random
+
+
 def fit_probability_distribution(relative_frequencies_dictionary):
     """Return a probability distribution fitted to the given relative-frequencies dictionary.
 
@@ -22,3 +27,16 @@ def fit_probability_distribution(relative_frequencies_dictionary):
         fitted_probability_distribution[last_bound_attributed][0], 1.0
     )
     return fitted_probability_distribution
+
+
+def sample_geometric(probability):
+    """Return how many Bernoulli trials with the given success probability it takes to get a success.
+
+    This helper function allows a run of timesteps that would each roll for some occurrence to be
+    skipped over in one step, since the timestep whose roll would first succeed can be drawn directly.
+    """
+    if probability <= 0.0:
+        return sys.maxint
+    if probability >= 1.0:
+        return 1
+    return int(math.log(1.0 - random.random()) / math.log(1.0 - probability)) + 1
@@ -1,13 +1,19 @@
+from array import array
+from bisect import insort
+
+
 class Whereabouts(object):
-    """A collection of a character's true whereabouts on each timestep of his or her life."""
+    """A collection of a character's true whereabouts on each timestep of his or her life.
+
+    The whereabouts themselves are kept in the simulation's WhereaboutsLog; this object holds
+    only the numbers of the rows in that log that pertain to this character, in the order that
+    they were recorded. Whereabout objects are instantiated from these rows as needed.
+    """
 
     def __init__(self, person):
         """Initialize a Whereabouts object."""
         self.person = person
-        # This dictionary maps individual timesteps to a person's whereabouts then;
-        # keys will be tuples of the form (ordinal_date, day_or_night_bit), where
-        # day_or_night_bit == 0 if a day timestep else 1
-        self.date = {}
+        self.rows = array('i')
 
     def __str__(self):
         """Return string representation."""
@@ -16,19 +22,28 @@ class Whereabouts(object):
         )
 
     def record(self, occasion):
-        """Record this character's current whereabouts by instantiating a Whereabout object."""
-        sim = self.person.sim
-        ordinal_date = sim.ordinal_date
-        day_or_night_bit = 0 if sim.time_of_day == 'day' else 1
-        timestep_key = (ordinal_date, day_or_night_bit)
-        self.date[timestep_key] = Whereabout(person=self.person, occasion=occasion)
+        """Record this character's current whereabouts in the simulation's whereabouts log."""
+        self.person.sim.whereabouts_log.record(person=self.person, occasion=occasion)
+
+    def on(self, ordinal_date, day_or_night_bit):
+        """Return a Whereabout object for this character's whereabouts on the given timestep.
+
+        @param ordinal_date: The ordinal date of the timestep.
+        @param day_or_night_bit: 0 for a day timestep, else 1.
+        """
+        log = self.person.sim.whereabouts_log
+        timestep = WhereaboutsLog.encode_timestep(ordinal_date, day_or_night_bit)
+        rows = self.rows
+        i = log.index_of_first_row_on(rows=rows, timestep=timestep)
+        if i == len(rows) or log.timesteps[rows[i]] != timestep:
+            raise KeyError((ordinal_date, day_or_night_bit))
+        return log.whereabout(row=rows[i])
 
     def recount(self):
         """Pretty-print this person's entire whereabouts."""
-        timesteps = self.date.keys()
-        timesteps.sort(key=lambda step: (step[0], step[1]))
-        for timestep in timesteps:
-            whereabout = self.date[timestep]
+        log = self.person.sim.whereabouts_log
+        for row in self.rows:
+            whereabout = log.whereabout(row=row)
             print '{},\t{}:\t{}\t({})'.format(
                 whereabout.date[7:] if whereabout.time_of_day == 'day' else whereabout.date[9:],
                 whereabout.time_of_day, whereabout.location.name, whereabout.occasion
@@ -38,26 +53,141 @@ class Whereabouts(object):
     def current_occasion(self):
         """Return the occasion for this person's current whereabouts."""
         sim = self.person.sim
-        ordinal_date = sim.ordinal_date
         day_or_night_bit = 0 if sim.time_of_day == 'day' else 1
-        timestep_key = (ordinal_date, day_or_night_bit)
-        return self.date[timestep_key].occasion
+        return self.on(ordinal_date=sim.ordinal_date, day_or_night_bit=day_or_night_bit).occasion
+
+
+class WhereaboutsLog(object):
+    """A columnar log of everyone's whereabouts on every timestep of a simulation.
+
+    Each row records that a person was at a location on a timestep, for some occasion, as
+    entries in parallel typed arrays (person IDs, location IDs, occasion codes, and timesteps,
+    the last encoded as ordinal_date * 2 + day_or_night_bit). Rows are appended in chronological
+    order, so each timestep's rows are contiguous. If someone goes somewhere else later on the
+    same timestep, their row for that timestep is updated in place, so that there is a single row
+    for each person on each timestep, as there was a single Whereabout object before.
+
+    The log also keeps an inverse index mapping each location to (the numbers of) the rows
+    recording people at it, which answers who was at a location on a given timestep.
+    """
+
+    def __init__(self):
+        """Initialize a WhereaboutsLog object."""
+        self.timesteps = array('i')
+        self.person_ids = array('i')
+        self.location_ids = array('i')
+        self.occasion_codes = array('B')
+        # Maps location IDs to arrays of the numbers of the rows recording someone there, in ascending order
+        self.location_rows = {}
+        # Maps IDs to the people and locations that they identify, for instantiating Whereabout objects
+        self.people = {}
+        self.locations = {}
+        # The occasions that occasion codes encode (and vice versa)
+        self.occasions = [None]
+        self.codes = {None: 0}
+
+    @staticmethod
+    def encode_timestep(ordinal_date, day_or_night_bit):
+        """Return the integer that encodes the given timestep in this log."""
+        return ordinal_date * 2 + day_or_night_bit
+
+    def record(self, person, occasion):
+        """Record a person's current location, for the given occasion, on the current timestep."""
+        sim = person.sim
+        timestep = self.encode_timestep(sim.ordinal_date, 0 if sim.time_of_day == 'day' else 1)
+        location = person.location
+        self.people[person.id] = person
+        self.locations[location.id] = location
+        try:
+            occasion_code = self.codes[occasion]
+        except KeyError:
+            occasion_code = self.codes[occasion] = len(self.occasions)
+            self.occasions.append(occasion)
+        person_rows = person.whereabouts.rows
+        if person_rows and self.timesteps[person_rows[-1]] == timestep:
+            # This person has already gone somewhere on this timestep; update their row for it
+            row = person_rows[-1]
+            former_location_rows = self.location_rows[self.location_ids[row]]
+            # The row will be among the last in that location's rows, so search from the end
+            i = len(former_location_rows) - 1
+            while former_location_rows[i] != row:
+                i -= 1
+            del former_location_rows[i]
+            self.location_ids[row] = location.id
+            self.occasion_codes[row] = occasion_code
+            insort(self._rows_at(location), row)
+        else:
+            row = len(self.timesteps)
+            self.timesteps.append(timestep)
+            self.person_ids.append(person.id)
+            self.location_ids.append(location.id)
+            self.occasion_codes.append(occasion_code)
+            person_rows.append(row)
+            self._rows_at(location).append(row)
+
+    def _rows_at(self, location):
+        """Return the array of the numbers of the rows that record people at the given location."""
+        try:
+            return self.location_rows[location.id]
+        except KeyError:
+            rows = self.location_rows[location.id] = array('i')
+            return rows
+
+    def people_at(self, location, ordinal_date, day_or_night_bit):
+        """Return the set of people who were at the given location on the given timestep.
+
+        @param location: A residence or business.
+        @param ordinal_date: The ordinal date of the timestep.
+        @param day_or_night_bit: 0 for a day timestep, else 1.
+        """
+        timestep = self.encode_timestep(ordinal_date, day_or_night_bit)
+        rows = self.location_rows.get(location.id, ())
+        timesteps, person_ids, people = self.timesteps, self.person_ids, self.people
+        people_there = set()
+        for i in xrange(self.index_of_first_row_on(rows=rows, timestep=timestep), len(rows)):
+            row = rows[i]
+            if timesteps[row] != timestep:
+                break
+            people_there.add(people[person_ids[row]])
+        return people_there
+
+    def index_of_first_row_on(self, rows, timestep):
+        """Return the index, in a chronological sequence of row numbers, of the first row on or after a timestep."""
+        timesteps = self.timesteps
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if timesteps[rows[mid]] < timestep:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def whereabout(self, row):
+        """Return a Whereabout object for the given row of this log."""
+        ordinal_date, day_or_night_bit = divmod(self.timesteps[row], 2)
+        return Whereabout(
+            person=self.people[self.person_ids[row]], location=self.locations[self.location_ids[row]],
+            occasion=self.occasions[self.occasion_codes[row]], ordinal_date=ordinal_date,
+            time_of_day='day' if day_or_night_bit == 0 else 'night'
+        )
 
 
 class Whereabout(object):
     """A character's true location on a single timestep, with associated metadata."""
 
-    def __init__(self, person, occasion):
+    def __init__(self, person, location, occasion, ordinal_date, time_of_day):
         """Initialize a Whereabout object."""
         self.person = person
-        self.location = person.location
+        self.location = location
         # Attribute the occasion for this character being at the location on
         # this timestep; will either be 'work', 'school', 'home', 'errand', or 'leisure'
         self.occasion = occasion
         # Attribute metadata about the timestep of this whereabout
-        self.date = person.sim.date
-        self.ordinal_date = person.sim.ordinal_date
-        self.time_of_day = person.sim.time_of_day
+        self.ordinal_date = ordinal_date
+        self.time_of_day = time_of_day
+        date = person.sim.get_date(ordinal_date=ordinal_date)
+        self.date = "{}{}".format(time_of_day.title(), date[date.index(' of '):])
 
     def __str__(self):
         """Return string representation."""
@@ -86,6 +216,3 @@ class Whereabout(object):
                 self.location.name, self.location.address,
                 self.date[0].lower()+self.date[1:]
             )
-
-
-